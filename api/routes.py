@@ -1,37 +1,164 @@
 # === app/api/routes.py ===
-from fastapi import APIRouter, Query, Depends
-from models.user import UserQuery
+import logging
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Query, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from models.user import CVBatchQuery, UserQuery
+from models.ats import ATSBatchQuery
+from models.validation import validate_cv_batch_query, validate_template, validate_user_query
 # from services.cv_service import generate_cv_from_user
 from services.user_service import user_query_save, get_cv_by_user_email, update_latest_raw_input
+from services.template_registry import get_template_registry
 from auth.token_verifier_utility import verify_token
-from workflows.cv_automation.crew import CVAutomationWorkflow
+from util.cv_text import form_data_to_text
+from core.admission import AdmissionRejected, batch_admission, generation_admission
+from core.deadline import CLIENT_DISCONNECTED, Deadline, RequestCancelled, cancel_on_disconnect
+from core.idempotency import (
+    EXECUTED, IdempotencyKeyReused, idempotency_key, idempotency_store, request_fingerprint
+)
+from core.logging_config import log_payload
+from core.metrics import render_metrics
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # @router.post("/generate-cv/")
 # async def generate_cv(user_input: UserQuery,user: dict = Depends(verify_token)):
 #     email = user_input.formData.personalDetails["email"]
 #     return await generate_cv_from_user(user_input, email)
 
+# Non-standard status (nginx) logged for requests whose client closed the connection before the response
+CLIENT_CLOSED_REQUEST = 499
+
+
+def _admission_error(ex: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=ex.status_code, detail=str(ex), headers={"Retry-After": str(ex.retry_after)})
+
+
 @router.post("/generate-cv-typst/")
-async def generate_cv_types(user_input: UserQuery):
-    print("message received")
+async def generate_cv_types(user_input: UserQuery, request: Request, response: Response,
+                            idempotency_key_header: Optional[str] = Header(None, alias="Idempotency-Key"),
+                            request_timeout: Optional[str] = Header(None, alias="X-Request-Timeout")):
+    logger.info("CV generation request received")
+    # Reject bad requests with every error at once, before anything is saved or built
+    errors = validate_user_query(user_input) + validate_template(user_input.template, get_template_registry().ids())
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    email = user_input.formData.personalDetails["email"]
+    # Every stage checks this before it starts; the client can ask for less time than the default
+    deadline = Deadline.for_request(request_timeout)
+
+    async def generate() -> dict:
+        # Bounded per user and overall; waits in a fair queue or is turned away with Retry-After
+        async with generation_admission.admit(email, timeout=deadline.remaining()):
+            deadline.check("user_query_save")
+            await user_query_save(user_input, email)
+            # Imported on first use: crewai and litellm dominate worker start-up (see main.PRELOAD_MODULES)
+            from workflows.cv_automation.crew import CVAutomationWorkflow
+            workflow = CVAutomationWorkflow()
+            # The workflow blocks on the LLM, Typst and S3; run it off the event loop. The thread cannot be
+            # interrupted, so the slot is held until it returns, which is at the next stage after a cancel
+            return await run_in_threadpool(workflow.run, user_input, "my-cv-bucket", deadline, validated=True)
+
+    # Double-clicks and client retries share one run: in flight they wait for it, afterwards they get its result
+    body = user_input.model_dump(exclude_none=True)
+    key = idempotency_key("generate-cv-typst", email, idempotency_key_header, body)
     try:
-        email = user_input.formData.personalDetails["email"]
-        await user_query_save(user_input, email)
-        workflow = CVAutomationWorkflow()
-        final_result = workflow.run(user_input, "my-cv-bucket")
-        # print(f"Success! CV URL: {final_result['final_cv_url']}")
-        print(f"Success! final result: {final_result}")
+        # A disconnected client stops waiting; once no duplicate waits either, the run is cancelled
+        async with cancel_on_disconnect(request):
+            final_result, outcome = await idempotency_store.run(key, generate, on_abandoned=deadline.cancel,
+                                                                fingerprint=request_fingerprint(body))
+        if outcome != EXECUTED:
+            response.headers["Idempotent-Replayed"] = "true"
+        logger.info("CV generation succeeded", extra={"ats_score": final_result.get("ats_score"), "outcome": outcome})
+        log_payload(logger, "CV generation result", final_result)
         return {"message": "Success!", "final_result": final_result}
+    except AdmissionRejected as ex:
+        raise _admission_error(ex)
+    except IdempotencyKeyReused as ex:
+        raise HTTPException(status_code=422, detail=str(ex))
+    except RequestCancelled as ex:
+        logger.warning(f"CV generation cancelled: {ex}", extra={"reason": ex.reason, "stage": ex.stage})
+        if ex.reason == CLIENT_DISCONNECTED:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        raise HTTPException(status_code=504, detail=str(ex))
     except Exception as ex:
-        print(f"Error: {ex}")
+        logger.error(f"CV generation failed: {ex}")
         return {"error": f"Error: {ex}"}
 
 
+@router.post("/generate-cv-typst-batch/")
+async def generate_cv_typst_batch(batch_input: CVBatchQuery, user: dict = Depends(verify_token)):
+    """Generate one CV per job description; results stream back as NDJSON lines in completion order"""
+    logger.info("Batch CV generation request received", extra={"jobs": len(batch_input.jobs)})
+    # The form data is shared, so it is validated, saved and rendered once for the whole batch
+    errors = validate_cv_batch_query(batch_input) + validate_template(batch_input.template,
+                                                                     get_template_registry().ids())
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    # The fair share and the saved query belong to the caller, not to whatever email the body names
+    email = user.get("email") or user["sub"]
+    try:
+        permit = await batch_admission.acquire(email)
+    except AdmissionRejected as ex:
+        raise _admission_error(ex)
+
+    try:
+        await user_query_save(batch_input, email)
+        from workflows.cv_automation.batch import BatchCVWorkflow
+        try:
+            workflow = BatchCVWorkflow(batch_input)
+        except Exception as ex:
+            raise HTTPException(status_code=422, detail=f"Error: {ex}")
+    except BaseException:
+        permit.release()
+        raise
+
+    async def lines() -> AsyncIterator[bytes]:
+        try:
+            async for result in workflow.results():
+                yield orjson.dumps(result) + b"\n"
+        finally:
+            permit.release()
+
+    async def release_permit() -> None:
+        # async, so Starlette runs it on the event loop: the controller is not thread-safe
+        permit.release()
+
+    # The slot is held until the stream ends; the background task covers a stream that never started
+    return StreamingResponse(lines(), media_type="application/x-ndjson", background=BackgroundTask(release_permit))
+
+
+@router.post("/ats-score-batch/")
+async def ats_score_batch(payload: ATSBatchQuery, user: dict = Depends(verify_token)):
+    cvs = {}
+    for cv in payload.cvs:
+        if cv.text:
+            cvs[cv.id] = cv.text
+        elif cv.formData:
+            cvs[cv.id] = form_data_to_text(cv.overview or "", cv.formData)
+        else:
+            raise HTTPException(status_code=422, detail=f"CV {cv.id} needs either text or formData")
+    jobs = {job.id: job.jobDescription for job in payload.jobs}
+
+    from workflows.cv_automation.ats_batch import BatchATSScorer
+    try:
+        # Scoring is CPU-bound, keep it off the event loop
+        return await run_in_threadpool(BatchATSScorer().rank, cvs, jobs, payload.topK)
+    except ValueError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+    except Exception as ex:
+        logger.error(f"Batch ATS scoring failed: {str(ex)}")
+        raise HTTPException(status_code=500, detail="Batch ATS scoring failed")
+
+
 @router.post("/queries-save")
 async def create_query(payload: UserQuery,user: dict = Depends(verify_token)):
-    print("message received")
+    logger.info("Query save request received")
     email = payload.formData.personalDetails["email"]
     return await user_query_save(payload,email)
 
@@ -44,6 +171,18 @@ async def get_cv_by_email(email: str = Query(..., description="User email")
 async def update_query(payload: UserQuery,user: dict = Depends(verify_token)):
     return await update_latest_raw_input(payload)
 
+@router.get("/templates")
+def list_templates():
+    """Résumé templates a generation request can pick with its template field"""
+    registry = get_template_registry()
+    return {"default": registry.default, "templates": [registry.get(template_id).describe() for template_id in registry.ids()]}
+
 @router.get("/test")
 def api_test(user=Depends(verify_token)):
-    return {"message": "FastAPI server is running..."}
\ No newline at end of file
+    return {"message": "FastAPI server is running..."}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,10 +1,11 @@
 from fastapi import Depends, HTTPException, Header
 from jose import jwt
-import requests
 
 import core.config as configs
 
 def get_jwk():
+    import requests
+
     jwks_url = f"{configs.COGNITO_ISSUER}/.well-known/jwks.json"
     return requests.get(jwks_url).json()
 
@@ -0,0 +1,88 @@
+"""
+ATS Batch Scoring Benchmark
+Compares pair-by-pair ATSScorer calls with the vectorised BatchATSScorer
+
+Run from the project root:
+    python -m benchmarks.ats_batch_benchmark --cvs 500 --jobs 1
+    python -m benchmarks.ats_batch_benchmark --cvs 1 --jobs 200
+"""
+
+import argparse
+import json
+import random
+import time
+
+from util.cv_text import form_data_to_text
+from workflows.cv_automation.ats_batch import BatchATSScorer
+from workflows.cv_automation.ats_features import TECH_KEYWORDS
+
+FIXTURES = ["templates/payload_omalya.json", "templates/payload_ramindu.json"]
+
+
+def _load_corpus(cv_count: int, job_count: int, seed: int) -> tuple[dict[str, str], dict[str, str]]:
+    """Build CV texts and job descriptions by varying the payload fixtures"""
+    rng = random.Random(seed)
+    payloads = []
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            payloads.append(json.load(f))
+
+    cvs = {}
+    for i in range(cv_count):
+        payload = payloads[i % len(payloads)]
+        extra = " ".join(rng.sample(TECH_KEYWORDS, 5))
+        cvs[f"cv-{i}"] = form_data_to_text(f"Developed and improved systems with {extra}", payload["formData"])
+
+    jobs = {}
+    for i in range(job_count):
+        payload = payloads[i % len(payloads)]
+        extra = ", ".join(rng.sample(TECH_KEYWORDS, 6))
+        jobs[f"job-{i}"] = f"{payload['jobDescription']} Experience with {extra} is required."
+
+    return cvs, jobs
+
+
+def _pairwise(cvs: dict[str, str], jobs: dict[str, str]) -> float:
+    """Score every pair with the single-pair ATSScorer and return the elapsed seconds"""
+    from workflows.cv_automation.tools import ATSScorer
+
+    scorer = ATSScorer()
+    start = time.perf_counter()
+    for cv_text in cvs.values():
+        for job_description in jobs.values():
+            scorer.score_text(cv_text, job_description)
+    return time.perf_counter() - start
+
+
+def _batch(cvs: dict[str, str], jobs: dict[str, str], top_k: int, pool_threshold: int) -> float:
+    """Rank every pair with BatchATSScorer and return the elapsed seconds"""
+    scorer = BatchATSScorer(process_pool_threshold=pool_threshold)
+    start = time.perf_counter()
+    scorer.rank(cvs, jobs, top_k)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--pool-threshold", type=int, default=256)
+    parser.add_argument("--skip-pairwise", action="store_true", help="Only time the batch engine")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    cvs, jobs = _load_corpus(args.cvs, args.jobs, args.seed)
+    pairs = len(cvs) * len(jobs)
+
+    batch_seconds = _batch(cvs, jobs, args.top_k, args.pool_threshold)
+    print(f"batch     {pairs:>9} pairs  {batch_seconds:8.3f}s  {pairs / batch_seconds:>12,.0f} pairs/s")
+
+    if not args.skip_pairwise:
+        pairwise_seconds = _pairwise(cvs, jobs)
+        print(f"pairwise  {pairs:>9} pairs  {pairwise_seconds:8.3f}s  {pairs / pairwise_seconds:>12,.0f} pairs/s")
+        print(f"speed-up  {pairwise_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Batch Generation Benchmark
+Tailors one profile to N job descriptions twice: with N calls to /generate-cv-typst/ (sent with the
+given concurrency) and with one streaming call to /generate-cv-typst-batch/. Reports wall time, time
+to the first finished CV and per-CV latency. The in-process ASGI transport hands over a streamed body
+only once it is complete, so the batch's per-CV times all equal its wall time here
+
+Run from the project root:
+    python -m benchmarks.batch_benchmark --jobs 10 30 --llm-latency 0.8 --fake-compile
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import orjson
+
+from benchmarks.fakes import fake_backends
+from benchmarks.fixtures import load_payloads
+from benchmarks.reporting import print_summary, save_results, summarize
+from models.profile import CVProfile
+from services.typst_service import render_resume_document
+
+
+def _renderable_payload() -> tuple[str, dict]:
+    """First fixture whose profile renders; the others carry records Typst rejects"""
+    for name, payload in load_payloads().items():
+        try:
+            render_resume_document(CVProfile.from_form_data(payload["formData"]))
+            return name, payload
+        except ValueError:
+            continue
+    raise SystemExit("No fixture renders a résumé")
+
+
+def _job_descriptions(payload: dict, count: int) -> list[str]:
+    """Distinct postings so no overview request is coalesced with another"""
+    return [f"{payload['jobDescription']}\nPosting reference: {i}" for i in range(count)]
+
+
+async def _singles(client: httpx.AsyncClient, payload: dict, jobs: list[str], concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    finished: list[float] = []
+    failures = 0
+
+    async def one(job_description: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            response = await client.post("/generate-cv-typst/", json={**payload, "jobDescription": job_description})
+            finished.append(time.perf_counter() - start)
+            if response.status_code != 200 or "error" in response.json():
+                failures += 1
+
+    await asyncio.gather(*(one(job) for job in jobs))
+    return {"wall": time.perf_counter() - start, "finished": sorted(finished), "failures": failures}
+
+
+async def _batch(client: httpx.AsyncClient, payload: dict, jobs: list[str]) -> dict:
+    body = {"formData": payload["formData"], "jobs": [{"id": str(i), "jobDescription": job} for i, job in enumerate(jobs)]}
+    start = time.perf_counter()
+    finished: list[float] = []
+    failures = 0
+    async with client.stream("POST", "/generate-cv-typst-batch/", json=body) as response:
+        if response.status_code != 200:
+            raise SystemExit(f"Batch request failed: {response.status_code} {await response.aread()}")
+        async for line in response.aiter_lines():
+            if line:
+                finished.append(time.perf_counter() - start)
+                failures += not orjson.loads(line)["success"]
+    return {"wall": time.perf_counter() - start, "finished": finished, "failures": failures}
+
+
+async def _run(app, payload: dict, counts: list[int], concurrency: int, token: str) -> dict:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None,
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        for count in counts:
+            jobs = _job_descriptions(payload, count)
+            for mode, run in (("single", lambda: _singles(client, payload, jobs, concurrency)),
+                              ("batch", lambda: _batch(client, payload, jobs))):
+                outcome = await run()
+                summary = summarize(outcome["finished"])
+                print_summary(f"{mode} x{count}", summary,
+                              f"wall={outcome['wall']:.2f}s first={outcome['finished'][0] * 1000:.0f}ms "
+                              f"failed={outcome['failures']}")
+                results[f"{mode}_{count}"] = {**summary, "wall_s": round(outcome["wall"], 3),
+                                              "failures": outcome["failures"]}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 30], help="job descriptions per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent single requests")
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--fake-compile", action="store_true", help="stub Typst compilation (needed offline)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/batch_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    with fake_backends(llm_latency=args.llm_latency, fake_compile=args.fake_compile) as fakes:
+        from main import app
+
+        name, payload = _renderable_payload()
+        print(f"profile: {name}")
+        results = asyncio.run(_run(app, payload, args.jobs, args.concurrency, fakes.cognito.token()))
+
+    path = save_results("batch_benchmark", vars(args), results, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
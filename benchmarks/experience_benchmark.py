@@ -0,0 +1,94 @@
+"""
+Experience Calculation Benchmark
+Times the interval-merge experience engine on synthetic profiles with hundreds of entries
+
+Run from the project root:
+    python -m benchmarks.experience_benchmark --entries 500 --profiles 200
+"""
+
+import argparse
+import random
+import time
+
+from models.profile import ProjectItem, WorkItem
+from util.date_util import current_month, format_month
+from workflows.cv_automation.ats_features import TECH_KEYWORDS
+from workflows.cv_automation.experience import calculate_experience
+
+
+def _legacy_total_years(work_experience: list[WorkItem], this_month: int) -> float:
+    """The previous calculation: sum every job's months, 24 months for undated jobs"""
+    total_months = 0
+    for job in work_experience:
+        if not job.start_date or not (job.currently_working or job.end_date):
+            continue
+        end = this_month if job.currently_working else job.end
+        if job.start is not None and end is not None:
+            total_months += end - job.start
+        else:
+            total_months += 24
+    return round(total_months / 12, 1)
+
+
+def _build_profiles(profile_count: int, entry_count: int, seed: int) -> list[tuple[list[WorkItem], list[ProjectItem]]]:
+    """Build profiles of overlapping work and project entries spread over the last 30 years"""
+    rng = random.Random(seed)
+    this_month = current_month()
+    profiles = []
+    for _ in range(profile_count):
+        work, projects = [], []
+        for i in range(entry_count):
+            start = this_month - rng.randint(1, 360)
+            end = min(start + rng.randint(1, 48), this_month)
+            ongoing = rng.random() < 0.05
+            skills = tuple(rng.sample(TECH_KEYWORDS, 3))
+            if i % 2:
+                work.append(WorkItem(
+                    job_title="Engineer", company="Company", location="", start_date=format_month(start),
+                    end_date="" if ongoing else format_month(end), description=f"Built services with {' and '.join(skills)}",
+                    currently_working=ongoing, start=start, end=None if ongoing else end
+                ))
+            else:
+                projects.append(ProjectItem(
+                    name="Project", start_date=format_month(start), end_date=format_month(end), description="",
+                    skills=skills, link="", currently_working=False, start=start, end=end
+                ))
+        profiles.append((work, projects))
+    return profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=500, help="work and project entries per profile")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    profiles = _build_profiles(args.profiles, args.entries, args.seed)
+    this_month = current_month()
+
+    start = time.perf_counter()
+    legacy = [_legacy_total_years(work, this_month) for work, _ in profiles]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    totals = [calculate_experience(work, this_month=this_month) for work, _ in profiles]
+    total_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summaries = [
+        calculate_experience(work, projects, TECH_KEYWORDS, this_month=this_month)
+        for work, projects in profiles
+    ]
+    engine_seconds = time.perf_counter() - start
+
+    sample = summaries[0]
+    print(f"profiles: {args.profiles}, entries per profile: {args.entries}")
+    print(f"legacy sum:      {legacy_seconds * 1e6 / args.profiles:9.1f} us/profile  (first profile: {legacy[0]} years)")
+    print(f"merge, total:    {total_seconds * 1e6 / args.profiles:9.1f} us/profile  (first profile: {totals[0].total_years} years)")
+    print(f"merge, full:     {engine_seconds * 1e6 / args.profiles:9.1f} us/profile  (first profile: {sample.total_years} years, "
+          f"{sample.recent_years} in the last {sample.recent_window_years}, {len(sample.skill_months)} skills)")
+
+
+if __name__ == "__main__":
+    main()
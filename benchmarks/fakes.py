@@ -0,0 +1,262 @@
+"""
+Benchmark Fakes
+In-process stand-ins for Gemini, Cognito JWKS, DynamoDB and S3 so the service can be load tested offline
+"""
+
+import asyncio
+import base64
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any, Iterator, Optional
+from unittest import mock
+
+from crewai import BaseLLM
+
+FAKE_OVERVIEW = (
+    "Software engineer with hands-on experience building Python and Java services, REST APIs and "
+    "machine learning pipelines on AWS. Developed and improved data-driven applications in agile teams, "
+    "with a track record of shipping reliable features and collaborating across disciplines."
+)
+
+
+class FakeLLM(BaseLLM):
+    """Returns a fixed overview after an optional delay that stands in for model latency"""
+
+    def __init__(self, latency: float = 0.0, completion: str = FAKE_OVERVIEW):
+        super().__init__(model="fake/overview-writer", temperature=0.0)
+        self.latency = latency
+        self.completion = completion
+        self.calls = 0
+        self.prompts: list[str] = []
+        # Set per call from the request deadline, like crewai.LLM's request timeout
+        self.timeout = None
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None) -> str:
+        self.calls += 1
+        if isinstance(messages, str):
+            self.prompts.append(messages)
+        else:
+            self.prompts.append("\n".join(str(message.get("content", "")) for message in messages))
+        if self.latency:
+            time.sleep(self.latency)
+        return f"Thought: I now can give a great answer\nFinal Answer: {self.completion}"
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 8192
+
+
+class FakeProviderError(Exception):
+    """Provider error carrying an HTTP status, like litellm and google.api_core errors"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeLLMProvider:
+    """LLM gateway provider with a latency, a requests-per-second quota answered with 429s and random 503s"""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, quota_per_second: Optional[float] = None, error_rate: float = 0.0,
+                 completion: str = FAKE_OVERVIEW, seed: int = 7):
+        self.latency = latency
+        self.quota_per_second = quota_per_second
+        self.error_rate = error_rate
+        self.completion = completion
+        self.calls = 0
+        self.rejected = 0
+        self._window: list[float] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _admit(self) -> None:
+        with self._lock:
+            self.calls += 1
+            if self.quota_per_second is not None:
+                now = time.monotonic()
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= self.quota_per_second:
+                    self.rejected += 1
+                    raise FakeProviderError(429, "Resource has been exhausted (e.g. check quota).")
+                self._window.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.rejected += 1
+                raise FakeProviderError(503, "The model is overloaded. Please try again later.")
+
+    def _response(self, prompt: str):
+        from core.llm_gateway import LLMResponse
+        return LLMResponse(self.completion, prompt_tokens=len(prompt) // 4, completion_tokens=len(self.completion) // 4)
+
+    def complete(self, prompt: str, **config: Any):
+        self._admit()
+        if self.latency:
+            time.sleep(self.latency)
+        return self._response(prompt)
+
+    async def acomplete(self, prompt: str, **config: Any):
+        self._admit()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._response(prompt)
+
+    def _chunks(self) -> list[str]:
+        words = self.completion.split(" ")
+        return [" ".join(words[i:i + 8]) + " " for i in range(0, len(words), 8)]
+
+    def complete_stream(self, prompt: str, on_chunk, **config: Any):
+        """Spread the latency over the chunks, the first one arriving after a fifth of it"""
+        self._admit()
+        chunks = self._chunks()
+        for i, chunk in enumerate(chunks):
+            if self.latency:
+                time.sleep(self.latency / 5 if i == 0 else self.latency * 0.8 / max(len(chunks) - 1, 1))
+            on_chunk(chunk)
+        return self._response(prompt)
+
+    async def acomplete_stream(self, prompt: str, on_chunk, **config: Any):
+        self._admit()
+        chunks = self._chunks()
+        for i, chunk in enumerate(chunks):
+            if self.latency:
+                await asyncio.sleep(self.latency / 5 if i == 0 else self.latency * 0.8 / max(len(chunks) - 1, 1))
+            on_chunk(chunk)
+        return self._response(prompt)
+
+
+class FakeTable:
+    """Dict-backed DynamoDB table with the calls the service makes"""
+
+    table_status = "ACTIVE"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.items: dict[str, dict[str, Any]] = {}
+        self.puts = 0
+        self._lock = threading.Lock()
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def put_item(self, Item: dict[str, Any], **kwargs) -> dict:
+        self._wait()
+        with self._lock:
+            self.puts += 1
+            self.items[Item["email"]] = dict(Item)
+        return {}
+
+    def get_item(self, Key: dict[str, Any], **kwargs) -> dict:
+        self._wait()
+        with self._lock:
+            item = self.items.get(Key["email"])
+        return {"Item": dict(item)} if item is not None else {}
+
+    def update_item(self, Key: dict[str, Any], ExpressionAttributeValues: dict[str, Any], **kwargs) -> dict:
+        self._wait()
+        with self._lock:
+            item = self.items.setdefault(Key["email"], {"email": Key["email"]})
+            item["raw_input"] = ExpressionAttributeValues.get(":ri")
+            item["created_at"] = ExpressionAttributeValues.get(":ca")
+        return {"Attributes": {"raw_input": item["raw_input"], "created_at": item["created_at"]}}
+
+
+class FakeS3Client:
+    """Records uploads and hands out fake presigned URLs"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.uploads: list[tuple[str, str, str]] = []
+
+    def upload_file(self, filename: str, bucket: str, key: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.uploads.append((filename, bucket, key))
+
+    def generate_presigned_url(self, operation: str, Params: dict[str, Any], ExpiresIn: int = 3600) -> str:
+        return f"https://{Params['Bucket']}.s3.fake/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+
+class FakeCognito:
+    """Signs tokens with a throwaway RSA key and serves the matching JWKS"""
+
+    kid = "benchmark-key"
+
+    def __init__(self):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+        numbers = key.public_key().public_numbers()
+        self.jwks = {"keys": [{
+            "kty": "RSA", "alg": "RS256", "use": "sig", "kid": self.kid,
+            "n": self._b64(numbers.n), "e": self._b64(numbers.e)
+        }]}
+
+    @staticmethod
+    def _b64(value: int) -> str:
+        raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    def token(self, email: str = "benchmark@example.com", ttl: int = 3600) -> str:
+        from jose import jwt
+        import core.config as configs
+
+        now = int(time.time())
+        claims = {
+            "sub": email, "email": email, "iss": configs.COGNITO_ISSUER, "aud": configs.APP_CLIENT_ID,
+            "iat": now, "exp": now + ttl, "token_use": "id"
+        }
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+def _fake_compile(input: str, output: Optional[str] = None, **kwargs) -> Optional[bytes]:
+    """Stand-in for typst.compile when the Typst package registry is unreachable"""
+    pdf = b"%PDF-1.4\n1 0 obj<</Type/Catalog>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+    if output is None:
+        return pdf
+    with open(output, "wb") as f:
+        f.write(pdf)
+    return None
+
+
+@contextmanager
+def fake_backends(llm_latency: float = 0.0, dynamodb_latency: float = 0.0, s3_latency: float = 0.0,
+                  fake_compile: bool = False) -> Iterator[SimpleNamespace]:
+    """Patch every external dependency of the service for the duration of the block"""
+    # Keep CrewAI from shipping its own telemetry while benchmarking
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    llm = FakeLLM(latency=llm_latency)
+    provider = FakeLLMProvider(latency=llm_latency)
+    table = FakeTable(latency=dynamodb_latency)
+    s3 = FakeS3Client(latency=s3_latency)
+    cognito = FakeCognito()
+
+    with ExitStack() as stack:
+        for target in ("db.dynamodb.get_table", "db.repository.get_table", "services.user_service.get_table"):
+            stack.enter_context(mock.patch(target, lambda: table))
+        stack.enter_context(mock.patch("services.s3Uploader.get_s3_client", lambda region_name: s3))
+        stack.enter_context(mock.patch("auth.token_verifier_utility.get_jwk", lambda: cognito.jwks))
+        # Keep the gateway in the path so load tests include its limiter and coalescing
+        from workflows.cv_automation.llm import GatewayLLM
+        stack.enter_context(mock.patch(
+            "workflows.cv_automation.crew.CVAutomationWorkflow._setup_llm", staticmethod(lambda: GatewayLLM(llm))))
+        # The direct overview engine streams from the gateway's provider
+        from core.llm_gateway import get_gateway
+        stack.enter_context(mock.patch.object(get_gateway(), "provider", provider))
+        if fake_compile:
+            stack.enter_context(mock.patch("services.template_registry.typst.compile", _fake_compile))
+
+        yield SimpleNamespace(llm=llm, provider=provider, table=table, s3=s3, cognito=cognito)
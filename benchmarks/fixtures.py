@@ -0,0 +1,99 @@
+"""
+Benchmark Fixtures
+Loads the request payload fixtures, converting the cv_data profiles into /generate-cv-typst/ payloads
+"""
+
+import glob
+import json
+import os
+from typing import Any
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PAYLOAD_PATTERN = os.path.join(PROJECT_ROOT, "templates", "payload_*.json")
+CV_DATA_PATTERN = os.path.join(PROJECT_ROOT, "cv_data", "*.json")
+
+
+def _split_duration(duration: str) -> tuple[str, str, bool]:
+    """Split 'Dec 2024 - Present' into start, end and whether it is ongoing"""
+    start, _, end = (part.strip() for part in (duration or "").partition("-"))
+    ongoing = end.lower() in ("present", "current", "now")
+    return start, "" if ongoing else end, ongoing
+
+
+def cv_data_to_payload(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert a cv_data profile into a UserQuery payload"""
+    contact = data.get("contact", {})
+    email = contact.get("email", "candidate@example.com")
+
+    education = []
+    for item in data.get("education", []):
+        start, end, ongoing = _split_duration(item.get("duration", ""))
+        education.append({
+            "degree": item.get("degree") or item.get("qualification", ""),
+            "institution": item.get("institution") or item.get("school", ""),
+            "fieldOfStudy": item.get("specialization") or item.get("stream", ""),
+            "startDate": start, "endDate": end, "currentlyStudying": ongoing, "description": ""
+        })
+
+    work_experience = []
+    for item in data.get("experience", []):
+        start, end, ongoing = _split_duration(item.get("duration", ""))
+        work_experience.append({
+            "jobTitle": item.get("position", ""), "company": item.get("company", ""), "location": "",
+            "startDate": start, "endDate": end, "currentlyWorking": ongoing, "description": item.get("description", "")
+        })
+
+    projects = []
+    for item in data.get("projects", []):
+        start, end, ongoing = _split_duration(item.get("duration", ""))
+        projects.append({
+            "name": item.get("title", ""), "description": item.get("description", ""),
+            "skills": item.get("technologies", []), "startDate": start, "endDate": end,
+            "currentlyWorking": ongoing, "link": item.get("link", "")
+        })
+
+    skills = [
+        {"category": category.replace("_", " ").title(), "technologies": technologies}
+        for category, technologies in data.get("skills", {}).items()
+    ]
+    top_skills = [technology for entry in skills for technology in entry["technologies"]][:8]
+
+    return {
+        "jobDescription": (
+            f"We are hiring a {data.get('desired_role', 'Software Engineer')}. "
+            f"Requirements: 2+ years of experience with {', '.join(top_skills)}. "
+            "Experience with agile teams, REST APIs and cloud platforms is a plus."
+        ),
+        "formData": {
+            "personalDetails": {
+                "fullName": email.split("@")[0].replace(".", " ").title(),
+                "email": email,
+                "phone": contact.get("phone", ""),
+                "address": contact.get("location", ""),
+                "linkedIn": contact.get("linkedin", ""),
+                "gitHub": contact.get("github", ""),
+                "portfolio": ""
+            },
+            "workExperience": work_experience,
+            "education": education,
+            "projects": projects,
+            "skills": skills,
+            "achievements": [
+                {"title": achievement, "description": "", "date": ""} for achievement in data.get("achievements", [])
+            ],
+            "certifications": [],
+            "referees": []
+        }
+    }
+
+
+def load_payloads() -> dict[str, dict[str, Any]]:
+    """Return every fixture as a UserQuery payload, keyed by file name"""
+    payloads = {}
+    for path in sorted(glob.glob(PAYLOAD_PATTERN)):
+        with open(path, encoding="utf-8") as f:
+            payloads[os.path.basename(path)] = json.load(f)
+    for path in sorted(glob.glob(CV_DATA_PATTERN)):
+        with open(path, encoding="utf-8") as f:
+            payloads[os.path.basename(path)] = cv_data_to_payload(json.load(f))
+    return payloads
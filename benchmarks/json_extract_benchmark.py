@@ -0,0 +1,65 @@
+"""
+LLM JSON Extraction Benchmark
+Compares the old regex clean-up + json.loads with the single-scan extractor on typical model answers
+
+Run from the project root:
+    python -m benchmarks.json_extract_benchmark --iterations 20000
+"""
+
+import argparse
+import json
+import re
+import time
+
+from util.json_extract import extract_json
+
+_ANSWER = {
+    "summary": "Backend engineer with 6 years of experience building Python services on AWS.",
+    "workExperience": [
+        {"description": f"Led the migration of service {i} to Kubernetes, cutting deploy time by {10 + i}%."}
+        for i in range(12)
+    ],
+}
+
+SAMPLES = {
+    # What JSON mode returns
+    "json_mode": json.dumps(_ANSWER),
+    # Free-form answer wrapped in a fence, with an apostrophe the old clean-up corrupted
+    "fenced_apostrophe": "Here is the result:\n```json\n" + json.dumps({**_ANSWER, "summary": "Team's go-to engineer."}) + "\n```",
+    # Python-style quoting the model sometimes produces
+    "single_quoted": str(_ANSWER),
+}
+
+
+def _legacy_parse(model_output: str):
+    """The previous clean_json_string + json.loads path"""
+    cleaned = re.sub(r"```json\s*|```", "", model_output.strip(), flags=re.MULTILINE)
+    cleaned = cleaned.replace("'", '"')
+    cleaned = re.sub(r"^```(?:json)?\s*|\s*```$", "", cleaned.strip(), flags=re.IGNORECASE)
+    return json.loads(cleaned)
+
+
+def _time(parse, text: str, iterations: int) -> tuple[float, str]:
+    try:
+        parse(text)
+    except Exception as e:
+        return 0.0, f"fails ({type(e).__name__})"
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(text)
+    return (time.perf_counter() - start) * 1e6 / iterations, "ok"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, text in SAMPLES.items():
+        legacy_us, legacy_status = _time(_legacy_parse, text, args.iterations)
+        new_us, new_status = _time(extract_json, text, args.iterations)
+        print(f"{name:20} legacy: {legacy_us:8.2f} us ({legacy_status:18})  extractor: {new_us:8.2f} us ({new_status})")
+
+
+if __name__ == "__main__":
+    main()
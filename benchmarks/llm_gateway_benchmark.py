@@ -0,0 +1,92 @@
+"""
+LLM Gateway Benchmark
+Fires a burst of concurrent requests at a fake provider with a requests-per-second quota, once directly
+and once through the LLM gateway, and compares failures, retries, coalescing and latency
+
+Run from the project root:
+    python -m benchmarks.llm_gateway_benchmark --requests 200 --quota 50 --duplicates 0.25
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.fakes import FakeLLMProvider
+from benchmarks.reporting import print_summary, save_results, summarize
+from core.llm_gateway import LLMGateway
+from core.metrics import LLM_COALESCED, LLM_RETRIES
+
+
+def _prompts(count: int, duplicates: float, seed: int) -> list[str]:
+    """Unique prompts, with a share of them repeated the way identical requests repeat in a burst"""
+    rng = random.Random(seed)
+    prompts = []
+    for i in range(count):
+        if prompts and rng.random() < duplicates:
+            prompts.append(rng.choice(prompts))
+        else:
+            prompts.append(f"Write a professional overview for candidate {i}.")
+    return prompts
+
+
+async def _burst(call, prompts: list[str]) -> tuple[list[float], int]:
+    latencies, failures = [], 0
+
+    async def one(prompt: str) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            await call(prompt)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+
+    await asyncio.gather(*(one(prompt) for prompt in prompts))
+    return latencies, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--quota", type=float, default=50, help="provider requests per second before it answers 429")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of provider calls answered with 503")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per provider call")
+    parser.add_argument("--duplicates", type=float, default=0.25, help="share of repeated prompts in the burst")
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="result file (default: benchmarks/results/llm_gateway_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    prompts = _prompts(args.requests, args.duplicates, args.seed)
+
+    direct = FakeLLMProvider(args.latency, args.quota, args.error_rate, seed=args.seed)
+    direct_latencies, direct_failures = asyncio.run(_burst(direct.acomplete, prompts))
+
+    provider = FakeLLMProvider(args.latency, args.quota, args.error_rate, seed=args.seed)
+    # Size the bucket a little under the provider quota, as in production
+    gateway = LLMGateway(provider, requests_per_minute=args.quota * 0.9 * 60, burst=int(args.quota * 0.5),
+                         max_in_flight=args.max_in_flight, base_delay=0.1, max_delay=2.0)
+    retries_before, coalesced_before = LLM_RETRIES.total(), LLM_COALESCED.total()
+    gateway_latencies, gateway_failures = asyncio.run(_burst(gateway.agenerate, prompts))
+    retries = LLM_RETRIES.total() - retries_before
+    coalesced = LLM_COALESCED.total() - coalesced_before
+
+    print(f"burst of {args.requests} requests, provider quota {args.quota:.0f}/s, {args.error_rate:.0%} 503s")
+    print_summary("direct", summarize(direct_latencies),
+                  f"failed={direct_failures} provider_calls={direct.calls} rejected={direct.rejected}")
+    print_summary("gateway", summarize(gateway_latencies),
+                  f"failed={gateway_failures} provider_calls={provider.calls} rejected={provider.rejected} "
+                  f"retries={retries:.0f} coalesced={coalesced:.0f}")
+
+    path = save_results("llm_gateway_benchmark", vars(args), {
+        "direct": {**summarize(direct_latencies), "failed": direct_failures, "provider_calls": direct.calls,
+                   "rejected": direct.rejected},
+        "gateway": {**summarize(gateway_latencies), "failed": gateway_failures, "provider_calls": provider.calls,
+                    "rejected": provider.rejected, "retries": retries, "coalesced": coalesced},
+    }, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
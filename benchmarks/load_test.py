@@ -0,0 +1,152 @@
+"""
+Load Test
+Replays the payload fixtures against the FastAPI app in-process, with fake LLM, JWKS, DynamoDB and S3 backends
+
+Run from the project root:
+    python -m benchmarks.load_test --scenario generate --concurrency 8 --requests 200 --fake-compile
+    python -m benchmarks.load_test --scenario save --concurrency 32 --requests 2000 --dynamodb-latency 0.005
+    python -m benchmarks.load_test --scenario ats-batch --concurrency 4 --requests 100
+    python -m benchmarks.load_test --scenario generate --concurrency 64 --requests 400 --users 50 --llm-latency 0.5 --fake-compile
+    python -m benchmarks.load_test --scenario retry-storm --concurrency 16 --requests 200 --llm-latency 0.5 --fake-compile
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+import uuid
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from benchmarks.fakes import fake_backends
+from benchmarks.fixtures import load_payloads
+from benchmarks.reporting import print_summary, save_results, summarize
+
+SCENARIOS = ("generate", "save", "ats-batch", "retry-storm", "mixed")
+
+
+def _build_requests(scenario: str, payloads: dict[str, dict[str, Any]], token: str) -> list[tuple[str, str, dict, dict]]:
+    """Return the (name, path, json body, headers) requests a scenario cycles through"""
+    auth = {"Authorization": f"Bearer {token}"}
+    generate = [("generate", "/generate-cv-typst/", payload, {}) for payload in payloads.values()]
+    save = [("save", "/queries-save", payload, auth) for payload in payloads.values()]
+    batch = [("ats-batch", "/ats-score-batch/", {
+        "cvs": [{"id": name, "overview": "", "formData": payload["formData"]} for name, payload in payloads.items()],
+        "jobs": [{"id": name, "jobDescription": payload["jobDescription"]} for name, payload in payloads.items()],
+        "topK": 3
+    }, auth)]
+
+    if scenario == "generate":
+        return generate
+    if scenario == "save":
+        return save
+    if scenario == "ats-batch":
+        return batch
+    if scenario == "retry-storm":
+        # One user resubmitting the same CV over and over
+        return [("retry-storm", "/generate-cv-typst/", payloads["payload_omalya.json"], {})]
+    return generate + save * 4 + batch
+
+
+def _as_user(body: dict, user: int) -> dict:
+    """The same generate request sent by a different user"""
+    form_data = body["formData"]
+    personal_details = {**form_data["personalDetails"], "email": f"user{user}@example.com"}
+    return {**body, "formData": {**form_data, "personalDetails": personal_details}}
+
+
+async def _run(app, requests: list[tuple[str, str, dict, dict]], total: int, concurrency: int,
+               warmup: int, users: int = 0) -> tuple[dict[str, list[float]], Counter, float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: dict[str, list[float]] = {}
+    statuses: Counter = Counter()
+    schedule = itertools.cycle(requests)
+    user_ids = itertools.cycle(range(users or 1))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        async def send(record: bool) -> None:
+            name, path, body, headers = next(schedule)
+            if name == "generate":
+                # Each generate request stands for a new job, not a duplicate to be deduplicated
+                headers = {**headers, "Idempotency-Key": uuid.uuid4().hex}
+                if users:
+                    body = _as_user(body, next(user_ids))
+            start = time.perf_counter()
+            response = await client.post(path, json=body, headers=headers)
+            elapsed = time.perf_counter() - start
+            if record:
+                # /generate-cv-typst/ reports failures in a 200 body
+                failed = response.status_code >= 400 or "error" in response.json()
+                replayed = ":replayed" if response.headers.get("Idempotent-Replayed") else ""
+                statuses[f"{name}:{response.status_code}{':error' if failed else ''}{replayed}"] += 1
+                latencies.setdefault(name, []).append(elapsed)
+
+        for _ in range(warmup):
+            await send(record=False)
+
+        remaining = iter(range(total))
+
+        async def worker() -> None:
+            for _ in remaining:
+                await send(record=True)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        wall_time = time.perf_counter() - start
+
+    return latencies, statuses, wall_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="generate")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=4)
+    parser.add_argument("--users", type=int, default=0,
+                        help="spread generate requests over this many users (default: the fixtures' own emails)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per fake LLM call")
+    parser.add_argument("--dynamodb-latency", type=float, default=0.0, help="seconds per fake DynamoDB call")
+    parser.add_argument("--s3-latency", type=float, default=0.0, help="seconds per fake S3 upload")
+    parser.add_argument("--fake-compile", action="store_true", help="stub typst.compile (needed offline)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/load_test_<timestamp>.json)")
+    args = parser.parse_args()
+
+    with fake_backends(args.llm_latency, args.dynamodb_latency, args.s3_latency, args.fake_compile) as fakes:
+        from main import app
+
+        requests = _build_requests(args.scenario, load_payloads(), fakes.cognito.token())
+        latencies, statuses, wall_time = asyncio.run(
+            _run(app, requests, args.requests, args.concurrency, args.warmup, args.users)
+        )
+
+    completed = sum(len(values) for values in latencies.values())
+    overall = summarize([value for values in latencies.values() for value in values])
+    per_endpoint = {name: summarize(values) for name, values in latencies.items()}
+    rps = completed / wall_time if wall_time else 0.0
+
+    print(f"scenario={args.scenario} concurrency={args.concurrency} requests={completed} "
+          f"wall={wall_time:.2f}s rps={rps:.1f}")
+    print_summary("all", overall)
+    for name, summary in per_endpoint.items():
+        print_summary(name, summary)
+    print("responses:", dict(statuses))
+    llm_calls = fakes.llm.calls + fakes.provider.calls
+    print(f"llm calls: {llm_calls}  dynamodb puts: {fakes.table.puts}")
+
+    path = save_results("load_test", vars(args), {
+        "rps": round(rps, 2),
+        "wall_time_s": round(wall_time, 3),
+        "latency": overall,
+        "endpoints": per_endpoint,
+        "responses": dict(statuses),
+        "llm_calls": llm_calls,
+        "dynamodb_puts": fakes.table.puts,
+    }, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Overview Benchmark
+Compares the two overview engines on the payload fixtures: the single-agent CrewAI crew and the direct
+streaming call. Reports prompt tokens, latency, time to first chunk and whether both engines end up
+with the same overview text and ATS score. Model latency is simulated by the benchmark fakes.
+
+Run from the project root:
+    python -m benchmarks.overview_benchmark --iterations 5 --llm-latency 0.8
+"""
+
+import argparse
+import time
+
+from benchmarks.fakes import fake_backends
+from benchmarks.fixtures import load_payloads
+from benchmarks.reporting import print_summary, save_results, summarize
+from models.profile import CVProfile
+from models.user import UserQuery
+from workflows.cv_automation.crew import CVAutomationWorkflow
+from workflows.cv_automation.jd_analysis import get_job_analysis
+from workflows.cv_automation.overview import build_overview_prompt, write_overview
+from workflows.cv_automation.prompt_builder import build_overview_context, estimate_tokens
+from workflows.cv_automation.tools import ATSScorer
+
+
+def _context(payload: dict) -> dict:
+    """The part of the workflow context the overview engines read"""
+    query = UserQuery(**payload)
+    analysis = get_job_analysis(query.jobDescription)
+    candidate_context = build_overview_context(CVProfile.from_form_data(query.formData), analysis)
+    return {
+        "job_description": query.jobDescription,
+        "job_requirements": analysis.summary(),
+        "candidate_context": candidate_context.text,
+        "form_data": dict(query.formData),
+        "iteration": 1,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5, help="overviews per engine and fixture")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="simulated model latency in seconds")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/overview_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    scorer = ATSScorer()
+    latencies: dict[str, list[float]] = {"crew": [], "direct": []}
+    first_chunk: list[float] = []
+    prompt_tokens: dict[str, list[int]] = {"crew": [], "direct": []}
+    mismatches: list[str] = []
+
+    with fake_backends(llm_latency=args.llm_latency) as fakes:
+        workflow = CVAutomationWorkflow(overview_engine="crew")
+        for name, payload in load_payloads().items():
+            context = _context(payload)
+            crew_text = direct_text = ""
+
+            for _ in range(args.iterations):
+                seen = len(fakes.llm.prompts)
+                start = time.perf_counter()
+                crew_text = workflow._write_overview(dict(context))
+                latencies["crew"].append(time.perf_counter() - start)
+                prompt_tokens["crew"].append(sum(estimate_tokens(p) for p in fakes.llm.prompts[seen:]))
+
+                result = write_overview(context["job_description"], context["job_requirements"],
+                                        context["candidate_context"])
+                direct_text = result.text
+                latencies["direct"].append(result.seconds)
+                first_chunk.append(result.first_chunk_seconds)
+                prompt_tokens["direct"].append(estimate_tokens(build_overview_prompt(
+                    context["job_description"], context["job_requirements"], context["candidate_context"])))
+
+            crew_score = scorer.score_structured(crew_text, payload["formData"], context["job_description"])
+            direct_score = scorer.score_structured(direct_text, payload["formData"], context["job_description"])
+            if crew_text != direct_text or crew_score["overall_score"] != direct_score["overall_score"]:
+                mismatches.append(f"{name}: crew {crew_score['overall_score']} vs direct "
+                                  f"{direct_score['overall_score']}")
+
+    summaries = {engine: summarize(values) for engine, values in latencies.items()}
+    summaries["direct_first_chunk"] = summarize(first_chunk)
+    tokens = {engine: round(sum(values) / len(values)) for engine, values in prompt_tokens.items() if values}
+    for label, summary in summaries.items():
+        print_summary(label, summary, f"prompt ~{tokens[label]} tokens" if label in tokens else "")
+    print(f"output parity: {'ok' if not mismatches else 'MISMATCH'}")
+    for mismatch in mismatches:
+        print(f"  {mismatch}")
+
+    path = save_results("overview_benchmark", vars(args),
+                        {"engines": summaries, "prompt_tokens": tokens, "mismatches": mismatches}, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Overview Prompt Benchmark
+Compares the estimated tokens of the old overview context (the repr of the whole FormData) with the
+compact, budgeted context from the prompt builder, on the fixtures and on synthetic profiles of growing size
+
+Run from the project root:
+    python -m benchmarks.prompt_benchmark --sizes 5 20 80
+"""
+
+import argparse
+import copy
+import time
+
+from benchmarks.fixtures import load_payloads
+from models.profile import CVProfile
+from models.user import UserQuery
+from workflows.cv_automation.jd_analysis import get_job_analysis
+from workflows.cv_automation.prompt_builder import build_overview_context, estimate_tokens
+
+
+def _grow(payload: dict, size: int) -> dict:
+    """Repeat every list section of a payload until it has size entries"""
+    grown = copy.deepcopy(payload)
+    for key, items in grown["formData"].items():
+        if isinstance(items, list) and items:
+            grown["formData"][key] = [copy.deepcopy(items[i % len(items)]) for i in range(size)]
+    return grown
+
+
+def _measure(label: str, payload: dict, iterations: int = 200) -> None:
+    query = UserQuery(**payload)
+    legacy_tokens = estimate_tokens(str(dict(query.formData)))
+    profile = CVProfile.from_form_data(query.formData)
+    analysis = get_job_analysis(query.jobDescription)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        context = build_overview_context(profile, analysis)
+    build_us = (time.perf_counter() - start) * 1e6 / iterations
+
+    print(f"{label:28} legacy: {legacy_tokens:6} tokens   compact: {context.tokens:4} tokens "
+          f"(budget {context.budget}, dropped {sum(context.dropped.values())}, truncated {context.truncated})  "
+          f"build: {build_us:7.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 80], help="entries per section")
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    for name, payload in payloads.items():
+        _measure(name, payload)
+
+    base = payloads["payload_ramindu.json"]
+    for size in args.sizes:
+        _measure(f"synthetic x{size}", _grow(base, size))
+
+
+if __name__ == "__main__":
+    main()
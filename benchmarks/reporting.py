@@ -0,0 +1,77 @@
+"""
+Benchmark Reporting
+Latency summaries and JSON result files that can be compared across runs
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from benchmarks.fixtures import PROJECT_ROOT
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """Return count, mean and p50/p95/p99/max latency in milliseconds"""
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def save_results(name: str, config: dict[str, Any], results: dict[str, Any], output: Optional[str] = None) -> str:
+    """Write results with enough context (commit, interpreter, settings) to compare runs later"""
+    timestamp = datetime.now(timezone.utc)
+    path = output or os.path.join(RESULTS_DIR, f"{name}_{timestamp.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    document = {
+        "benchmark": name,
+        "timestamp": timestamp.isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": config,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def print_summary(label: str, summary: dict[str, float], extra: str = "") -> None:
+    if not summary.get("count"):
+        print(f"{label:28} no samples")
+        return
+    print(f"{label:28} n={summary['count']:<6} mean={summary['mean_ms']:9.2f}ms  p50={summary['p50_ms']:9.2f}ms  "
+          f"p95={summary['p95_ms']:9.2f}ms  p99={summary['p99_ms']:9.2f}ms  {extra}")
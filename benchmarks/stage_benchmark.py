@@ -0,0 +1,88 @@
+"""
+Stage Benchmark
+Times each CPU-bound pipeline stage in isolation over the payload fixtures: profile parsing, content
+reordering, date sorting, structured ATS scoring, Typst source generation and Typst compilation
+
+Run from the project root:
+    python -m benchmarks.stage_benchmark --iterations 50
+    python -m benchmarks.stage_benchmark --iterations 50 --fake-compile   # offline: stub typst.compile
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+from benchmarks.fakes import FAKE_OVERVIEW, fake_backends
+from benchmarks.fixtures import load_payloads
+from benchmarks.reporting import print_summary, save_results, summarize
+from models.profile import CVProfile
+from services.typst_service import compile_typst_to_pdf, generate_resume_typst
+from workflows.cv_automation.jd_analysis import get_job_analysis
+from workflows.cv_automation.tools import ATSScorer, ContentReorderer, DateSorter
+
+
+def _time(func: Callable[[], Any], iterations: int) -> tuple[list[float], str]:
+    """Run func repeatedly; stop at the first failure and report it instead of the timings"""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            return latencies, str(e).splitlines()[0]
+        latencies.append(time.perf_counter() - start)
+    return latencies, ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="runs per stage and fixture")
+    parser.add_argument("--fake-compile", action="store_true", help="stub typst.compile (needed offline)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/stage_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    reorderer, sorter, scorer = ContentReorderer(), DateSorter(), ATSScorer()
+    latencies: dict[str, list[float]] = {}
+    failures: dict[str, dict[str, str]] = {}
+
+    with fake_backends(fake_compile=args.fake_compile), tempfile.TemporaryDirectory() as workdir:
+        for name, payload in load_payloads().items():
+            form_data, job_description = payload["formData"], payload["jobDescription"]
+            requirements = get_job_analysis(job_description).as_requirements()
+            profile = CVProfile.from_form_data(form_data)
+            data_path = os.path.join(workdir, "cv.json")
+            pdf_path = os.path.join(workdir, "cv.pdf")
+
+            stages = {
+                "profile_parse": lambda: CVProfile.from_form_data(form_data),
+                "content_reorder": lambda: reorderer.reorder(payload, requirements, profile),
+                "date_sort": lambda: sorter.sort(payload, profile),
+                "ats_score_structured": lambda: scorer.score_structured(FAKE_OVERVIEW, form_data, job_description),
+                "typst_source": lambda: generate_resume_typst(FAKE_OVERVIEW, profile, data_path),
+                "typst_compile": lambda: compile_typst_to_pdf(data_path, pdf_path),
+            }
+            for stage, func in stages.items():
+                samples, error = _time(func, args.iterations)
+                latencies.setdefault(stage, []).extend(samples)
+                if error:
+                    failures.setdefault(stage, {})[name] = error
+                    if stage == "typst_source":
+                        # Nothing to compile for this fixture
+                        break
+
+    summaries = {stage: summarize(values) for stage, values in latencies.items()}
+    for stage, summary in summaries.items():
+        failed = failures.get(stage, {})
+        print_summary(stage, summary, f"({len(failed)} fixtures failed)" if failed else "")
+    for stage, errors in failures.items():
+        for name, error in errors.items():
+            print(f"  {stage} failed on {name}: {error}")
+
+    path = save_results("stage_benchmark", vars(args), {"stages": summaries, "failures": failures}, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Startup Benchmark
+Times `import main` in fresh interpreters, lists the slowest imports from `-X importtime` and fails
+when start-up goes over budget or a module that should load lazily is imported eagerly
+
+Run from the project root (exits non-zero on a budget or lazy-import violation, so CI can gate on it):
+    python -m benchmarks.startup_benchmark --runs 5 --budget-ms 1000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.fixtures import PROJECT_ROOT
+from benchmarks.reporting import save_results
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = (
+    "crewai", "litellm", "langchain", "langgraph", "google.generativeai",
+    "boto3", "PyPDF2", "numpy", "requests", "jinja2",
+)
+
+_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(json.dumps({'ms': elapsed * 1000, 'modules': sorted(sys.modules)}))\n"
+)
+
+
+def run_probe(importtime: bool = False) -> subprocess.CompletedProcess:
+    """Import main in a fresh interpreter; stdout ends with its import time and loaded modules as JSON"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", _PROBE]
+    # Keep the probe quiet and independent of local tracing settings
+    env = dict(os.environ, LOG_LEVEL="WARNING", TRACING_EXPORTER="none")
+    return subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def _slowest_imports(stderr: str, count: int) -> list[tuple[str, float]]:
+    """Parse `-X importtime` output into the top-level imports with the largest cumulative time"""
+    totals = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Indentation marks nesting; only count imports made directly by the probe or main
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            totals.append((name.strip(), int(cumulative) / 1000))
+    return sorted(totals, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="maximum median import time of main")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/startup_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    # The first interpreter also warms the bytecode cache, so it is not timed
+    run_probe()
+    samples, modules = [], set()
+    for _ in range(args.runs):
+        probe = json.loads(run_probe().stdout.strip().splitlines()[-1])
+        samples.append(probe["ms"])
+        modules = set(probe["modules"])
+
+    eager = [name for name in LAZY_MODULES if name in modules]
+    slowest = _slowest_imports(run_probe(importtime=True).stderr, args.top)
+    median = statistics.median(samples)
+
+    print(f"import main: median {median:.1f} ms, min {min(samples):.1f} ms, max {max(samples):.1f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    print("slowest imports:")
+    for name, ms in slowest:
+        print(f"  {name:40} {ms:9.1f} ms")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"median import time {median:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(eager)}")
+
+    path = save_results("startup_benchmark", vars(args), {
+        "median_ms": round(median, 1),
+        "samples_ms": [round(sample, 1) for sample in samples],
+        "slowest_imports_ms": dict(slowest),
+        "eager_modules": eager,
+        "failures": failures,
+    }, args.output)
+    print(f"results saved to {path}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
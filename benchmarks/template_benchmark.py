@@ -0,0 +1,66 @@
+"""
+Template Benchmark
+Compiles the bundled sample résumé with every registered template: each template on its own, then
+all of them interleaved, so the cost of switching templates between requests shows up as a gap
+between the two. Each compile gets a distinct overview, as real requests do
+
+Run from the project root:
+    python -m benchmarks.template_benchmark --iterations 100
+"""
+
+import argparse
+import itertools
+import time
+
+import orjson
+
+from benchmarks.reporting import print_summary, save_results, summarize
+from services.template_registry import RESUME_SAMPLE_DATA, get_template_registry
+
+
+def _documents(sample: dict, style: dict[str, str]):
+    """Sample data with a new overview each time"""
+    for i in itertools.count():
+        sections = [
+            {"kind": "overview", "text": f"Variant {i} of the sample overview."} if section["kind"] == "overview"
+            else section for section in sample["sections"]
+        ]
+        yield orjson.dumps({**sample, "style": style, "sections": sections}).decode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100, help="compiles per template and run")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/template_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    registry = get_template_registry()
+    start = time.perf_counter()
+    rejected = registry.validate()
+    print(f"validated {registry.ids()} in {(time.perf_counter() - start) * 1000:.0f}ms, rejected: {rejected or 'none'}")
+
+    with open(RESUME_SAMPLE_DATA, "rb") as f:
+        sample = orjson.loads(f.read())
+    templates = [registry.get(template_id) for template_id in registry.ids()]
+    documents = {template.id: _documents(sample, template.style) for template in templates}
+
+    runs = {template.id: [template] * args.iterations for template in templates}
+    runs["interleaved"] = templates * args.iterations
+
+    results = {}
+    for label, sequence in runs.items():
+        latencies = []
+        for template in sequence:
+            data = next(documents[template.id])
+            begin = time.perf_counter()
+            template.compile(data)
+            latencies.append(time.perf_counter() - begin)
+        results[label] = summarize(latencies)
+        print_summary(label, results[label])
+
+    path = save_results("template_benchmark", vars(args), results, args.output)
+    print(f"results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
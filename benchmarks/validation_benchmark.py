@@ -0,0 +1,260 @@
+"""
+Payload Validation Benchmark
+Compares the compiled request schema with the previous reflective PayloadValidator
+
+Run from the project root:
+    python -m benchmarks.validation_benchmark --iterations 5000
+"""
+
+import argparse
+import copy
+import json
+import re
+import time
+from typing import Any, Dict, List
+
+from models.user import FormData, UserQuery
+from models.validation import validate_user_query
+
+FIXTURES = ["templates/payload_omalya.json", "templates/payload_ramindu.json"]
+
+
+# The validator as it was before the compiled schema, kept here as the baseline
+class _LegacyPayloadValidator:
+    """Validates payload structure and content"""
+
+    def validate(self, payload: UserQuery) -> bool:
+        """Validate payload structure and content"""
+        try:
+            # Check top-level structure
+            if not isinstance(payload, UserQuery):
+                raise ValueError("Payload must be a UserQuery object")
+
+            # Check required fields
+            required_fields = ['jobDescription', 'formData']
+            for field in required_fields:
+                if not hasattr(payload, field):
+                    raise ValueError(f"Missing required field: {field}")
+
+            # Validate job description
+            if not isinstance(payload.jobDescription, str) or not payload.jobDescription.strip():
+                raise ValueError("jobDescription must be a non-empty string")
+
+            # Validate form data structure
+            self._validate_form_data(payload.formData)
+
+            return True
+
+        except Exception as e:
+            raise ValueError(f"Payload validation failed: {str(e)}")
+
+    def _validate_form_data(self, form_data: FormData) -> bool:
+        """Validate form data structure"""
+        if not isinstance(form_data, FormData):
+            raise ValueError("formData must be a FormData object")
+
+        # Validate personal details
+        if hasattr(form_data, 'personalDetails'):
+            self._validate_personal_details(form_data.personalDetails)
+
+        # Validate arrays
+        array_fields = ['workExperience', 'education', 'projects', 'skills', 'achievements', 'certifications',
+                        'referees']
+        for field in array_fields:
+            if hasattr(form_data, field):
+                if not isinstance(getattr(form_data, field), list):
+                    raise ValueError(f"{field} must be a list")
+
+                # Validate array items based on type
+                if field == 'workExperience':
+                    self._validate_work_experience(form_data.workExperience)
+                elif field == 'education':
+                    self._validate_education(form_data.education)
+                elif field == 'projects':
+                    self._validate_projects(form_data.projects)
+                elif field == 'skills':
+                    self._validate_skills(form_data.skills)
+                elif field == 'achievements':
+                    self._validate_achievements(form_data.achievements)
+                elif field == 'certifications':
+                    self._validate_certifications(form_data.certifications)
+                elif field == 'referees':
+                    self._validate_referees(form_data.referees)
+
+        return True
+
+    @staticmethod
+    def _validate_personal_details(personal_details: Dict[str, Any]) -> bool:
+        """Validate personal details structure"""
+        if not isinstance(personal_details, dict):
+            raise ValueError("personalDetails must be a dictionary")
+
+        # Check for essential fields
+        essential_fields = ['fullName', 'email']
+        for field in essential_fields:
+            if field not in personal_details or not personal_details[field]:
+                raise ValueError(f"Missing essential personal detail: {field}")
+
+        # Validate email format
+        email = personal_details.get('email', '')
+        if email and not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+            raise ValueError("Invalid email format")
+
+        return True
+
+    @staticmethod
+    def _validate_work_experience(work_exp: List[Dict]) -> bool:
+        """Validate work experience entries"""
+        for job in work_exp:
+            if not isinstance(job, dict):
+                raise ValueError("Work experience entry must be a dictionary")
+
+            required_fields = ['jobTitle', 'company']
+            for field in required_fields:
+                if field not in job or not job[field]:
+                    raise ValueError(f"Missing required work experience field: {field}")
+
+        return True
+
+    @staticmethod
+    def _validate_education(education: List[Dict]) -> bool:
+        """Validate education entries"""
+        for edu in education:
+            if not isinstance(edu, dict):
+                raise ValueError("Education entry must be a dictionary")
+
+            required_fields = ['degree', 'institution']
+            for field in required_fields:
+                if field not in edu or not edu[field]:
+                    raise ValueError(f"Missing required education field: {field}")
+
+        return True
+
+    @staticmethod
+    def _validate_projects(projects: List[Dict]) -> bool:
+        """Validate project entries"""
+        for project in projects:
+            if not isinstance(project, dict):
+                raise ValueError("Project entry must be a dictionary")
+
+            if 'name' not in project or not project['name']:
+                raise ValueError("Project must have a name")
+
+            if 'skills' in project and not isinstance(project['skills'], list):
+                raise ValueError("Project skills must be a list")
+
+        return True
+
+    @staticmethod
+    def _validate_skills(skills: List[Dict]) -> bool:
+        """Validate skills entries"""
+        for skill in skills:
+            if not isinstance(skill, dict):
+                raise ValueError("Skill entry must be a dictionary")
+
+            if 'category' not in skill or not skill['category']:
+                raise ValueError("Skill must have a category")
+
+            if 'technologies' in skill and not isinstance(skill['technologies'], list):
+                raise ValueError("Skill technologies must be a list")
+
+        return True
+
+    @staticmethod
+    def _validate_achievements(achievements: List[Dict]) -> bool:
+        """Validate achievement entries"""
+        for achievement in achievements:
+            if not isinstance(achievement, dict):
+                raise ValueError("Achievement entry must be a dictionary")
+
+            if 'title' not in achievement or not achievement['title']:
+                raise ValueError("Achievement must have a title")
+
+        return True
+
+    @staticmethod
+    def _validate_certifications(certifications: List[Dict]) -> bool:
+        """Validate certification entries"""
+        for cert in certifications:
+            if not isinstance(cert, dict):
+                raise ValueError("Certification entry must be a dictionary")
+
+            required_fields = ['title', 'issuer']
+            for field in required_fields:
+                if field not in cert or not cert[field]:
+                    raise ValueError(f"Missing required certification field: {field}")
+
+        return True
+
+    @staticmethod
+    def _validate_referees(referees: List[Dict]) -> bool:
+        """Validate referee entries"""
+        for referee in referees:
+            if not isinstance(referee, dict):
+                raise ValueError("Referee entry must be a dictionary")
+
+            required_fields = ['name', 'position']
+            for field in required_fields:
+                if field not in referee or not referee[field]:
+                    raise ValueError(f"Missing required referee field: {field}")
+
+        return True
+
+
+
+def _legacy_errors(payload: UserQuery) -> list[str]:
+    try:
+        _LegacyPayloadValidator().validate(payload)
+        return []
+    except ValueError as e:
+        return [str(e)]
+
+
+def _invalid_variant(payload: dict[str, Any]) -> dict[str, Any]:
+    """Break several fields at once: the legacy validator stops at the first, the schema reports all"""
+    broken = copy.deepcopy(payload)
+    broken["formData"]["personalDetails"]["email"] = "not-an-email"
+    for job in broken["formData"]["workExperience"]:
+        job["company"] = ""
+    for edu in broken["formData"]["education"]:
+        edu["degree"] = ""
+    return broken
+
+
+def _time(func, payloads: list[UserQuery], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for payload in payloads:
+            func(payload)
+    return (time.perf_counter() - start) / (iterations * len(payloads))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    raw = []
+    for path in FIXTURES:
+        with open(path, encoding="utf-8") as f:
+            raw.append(json.load(f))
+
+    valid = [UserQuery.model_validate(payload) for payload in raw]
+    invalid = [UserQuery.model_validate(_invalid_variant(payload)) for payload in raw]
+
+    for payload in valid:
+        assert not _legacy_errors(payload) and not validate_user_query(payload), "fixtures should be valid"
+    for payload in invalid:
+        legacy, schema = _legacy_errors(payload), validate_user_query(payload)
+        assert legacy and schema, "broken payloads should be rejected by both validators"
+        print(f"invalid payload: legacy reports {len(legacy)} error, schema reports {len(schema)}")
+
+    for label, payloads in (("valid", valid), ("invalid", invalid)):
+        legacy_seconds = _time(_legacy_errors, payloads, args.iterations)
+        schema_seconds = _time(validate_user_query, payloads, args.iterations)
+        print(f"{label:8} legacy: {legacy_seconds * 1e6:7.1f} us  schema: {schema_seconds * 1e6:7.1f} us  "
+              f"({legacy_seconds / schema_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Admission Control
+Bounds how many CV generations run at once. Each route has a global concurrency budget and a per-user
+share of it. Requests over the budget wait in a bounded queue that is served round-robin across users,
+and are turned away with a Retry-After hint when the queue is full or their wait deadline passes.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from core.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_RUNNING, ADMISSION_WAIT
+
+logger = logging.getLogger(__name__)
+
+# Smoothing of the run-time estimate behind Retry-After
+_SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted; status_code is 429 (user over their share) or 503 (service overloaded)"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(f"Request not admitted ({reason}), retry after {retry_after}s")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionPermit:
+    """A granted slot; release() is safe to call more than once"""
+
+    def __init__(self, controller: "AdmissionController", user: str):
+        self._controller = controller
+        self.user = user
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """Global and per-user concurrency limits with a bounded, fair, deadline-bound wait queue"""
+
+    def __init__(self, name: str, max_concurrent: int, max_per_user: int, max_queued: int,
+                 max_queued_per_user: int, queue_timeout: float, initial_service_time: float = 10.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queued = max_queued
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout = queue_timeout
+        self.service_time = initial_service_time
+        self.running = 0
+        self._running_by_user: dict[str, int] = {}
+        # user -> waiting futures; users are served round-robin in this order
+        self._waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.queued = 0
+
+    def _can_run(self, user: str) -> bool:
+        return self.running < self.max_concurrent and self._running_by_user.get(user, 0) < self.max_per_user
+
+    def _grant(self, user: str, future: asyncio.Future) -> None:
+        self.running += 1
+        self._running_by_user[user] = self._running_by_user.get(user, 0) + 1
+        future.set_result(AdmissionPermit(self, user))
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting users in turn, skipping users already at their share"""
+        progressed = True
+        while progressed and self.running < self.max_concurrent and self._waiting:
+            progressed = False
+            for user in list(self._waiting):
+                if not self._can_run(user):
+                    continue
+                waiters = self._waiting[user]
+                future = waiters.popleft()
+                self.queued -= 1
+                if waiters:
+                    # Served once this round: go to the back of the line
+                    self._waiting.move_to_end(user)
+                else:
+                    del self._waiting[user]
+                self._grant(user, future)
+                progressed = True
+                break
+        self._export()
+
+    def _remove_waiter(self, user: str, future: asyncio.Future) -> None:
+        waiters = self._waiting.get(user)
+        if waiters is not None and future in waiters:
+            waiters.remove(future)
+            self.queued -= 1
+            if not waiters:
+                del self._waiting[user]
+        self._export()
+
+    def _release(self, permit: AdmissionPermit) -> None:
+        elapsed = time.monotonic() - permit.started
+        self.service_time += _SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+        self.running -= 1
+        remaining = self._running_by_user.get(permit.user, 1) - 1
+        if remaining:
+            self._running_by_user[permit.user] = remaining
+        else:
+            self._running_by_user.pop(permit.user, None)
+        self._dispatch()
+
+    def _export(self) -> None:
+        ADMISSION_QUEUE_DEPTH.set(self.queued, route=self.name)
+        ADMISSION_RUNNING.set(self.running, route=self.name)
+
+    def retry_after(self) -> int:
+        """Seconds until the queue ahead has likely drained, from the smoothed run time"""
+        rounds = (self.queued + self.running) / self.max_concurrent
+        return max(1, math.ceil(rounds * self.service_time))
+
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.inc(route=self.name, reason=reason)
+        logger.warning(f"Admission rejected on {self.name}: {reason}",
+                       extra={"running": self.running, "queued": self.queued})
+        return AdmissionRejected(status_code, reason, self.retry_after())
+
+    async def acquire(self, user: str, timeout: Optional[float] = None) -> AdmissionPermit:
+        """Wait for a slot for user, at most timeout (or the queue timeout if shorter), or raise AdmissionRejected"""
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # Free slots are always handed to eligible waiters first, so any waiter left is over its share
+        if self._can_run(user) and user not in self._waiting:
+            self._grant(user, future)
+            self._export()
+            ADMISSION_WAIT.observe(0.0, route=self.name, outcome="admitted")
+            return future.result()
+
+        # The user's own backlog is checked first so one client cannot fill the shared queue
+        if len(self._waiting.get(user, ())) >= self.max_queued_per_user:
+            raise self._reject(429, "user_queue_full")
+        if self.queued >= self.max_queued:
+            raise self._reject(503, "queue_full")
+
+        self._waiting.setdefault(user, deque()).append(future)
+        self.queued += 1
+        self._dispatch()
+
+        try:
+            wait = self.queue_timeout if timeout is None else min(self.queue_timeout, timeout)
+            permit = await asyncio.wait_for(asyncio.shield(future), wait)
+        except asyncio.TimeoutError:
+            self._abandon(user, future)
+            ADMISSION_WAIT.observe(time.monotonic() - start, route=self.name, outcome="timeout")
+            raise self._reject(503, "queue_timeout")
+        except BaseException:
+            # The client went away while queued
+            self._abandon(user, future)
+            raise
+
+        task = asyncio.current_task()
+        if task is not None and task.cancelling():
+            # Cancelled in the same step the slot was granted; wait_for returned the permit anyway
+            permit.release()
+            raise asyncio.CancelledError()
+
+        ADMISSION_WAIT.observe(time.monotonic() - start, route=self.name, outcome="admitted")
+        return permit
+
+    def _abandon(self, user: str, future: asyncio.Future) -> None:
+        """Leave the queue; a slot granted in the meantime is handed straight back"""
+        if future.done() and not future.cancelled():
+            future.result().release()
+        else:
+            future.cancel()
+            self._remove_waiter(user, future)
+
+    @asynccontextmanager
+    async def admit(self, user: str, timeout: Optional[float] = None) -> AsyncIterator[AdmissionPermit]:
+        """Hold a slot for the duration of the block"""
+        permit = await self.acquire(user, timeout)
+        try:
+            yield permit
+        finally:
+            permit.release()
+
+
+generation_admission = AdmissionController(
+    "generate-cv-typst",
+    max_concurrent=int(os.getenv("CV_MAX_CONCURRENT_GENERATIONS", "8")),
+    max_per_user=int(os.getenv("CV_MAX_CONCURRENT_PER_USER", "2")),
+    max_queued=int(os.getenv("CV_MAX_QUEUED_GENERATIONS", "32")),
+    max_queued_per_user=int(os.getenv("CV_MAX_QUEUED_PER_USER", "4")),
+    queue_timeout=float(os.getenv("CV_QUEUE_TIMEOUT_SECONDS", "30")),
+)
+
+# A batch holds its slot for up to CV_BATCH_MAX_JOBS CVs, so far fewer of them run at once
+batch_admission = AdmissionController(
+    "generate-cv-typst-batch",
+    max_concurrent=int(os.getenv("CV_MAX_CONCURRENT_BATCHES", "2")),
+    max_per_user=int(os.getenv("CV_MAX_CONCURRENT_BATCHES_PER_USER", "1")),
+    max_queued=int(os.getenv("CV_MAX_QUEUED_BATCHES", "8")),
+    max_queued_per_user=int(os.getenv("CV_MAX_QUEUED_BATCHES_PER_USER", "1")),
+    queue_timeout=float(os.getenv("CV_QUEUE_TIMEOUT_SECONDS", "30")),
+    initial_service_time=60.0,
+)
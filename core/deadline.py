@@ -0,0 +1,141 @@
+"""
+Request Deadlines
+A deadline travels with a request through the workflow. Stages check it before they start, so the work
+of a request that ran out of time, or whose client went away, stops at the next stage boundary.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from core.metrics import STAGE_CANCELLATIONS
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on a CV generation request; a client can ask for less with X-Request-Timeout
+CV_REQUEST_TIMEOUT_SECONDS = float(os.getenv("CV_REQUEST_TIMEOUT_SECONDS", "180"))
+
+DEADLINE_EXCEEDED = "deadline_exceeded"
+CLIENT_DISCONNECTED = "client_disconnected"
+
+
+class RequestCancelled(Exception):
+    """The request's work was stopped; reason is DEADLINE_EXCEEDED or CLIENT_DISCONNECTED"""
+
+    def __init__(self, reason: str, stage: Optional[str] = None):
+        super().__init__(f"Request cancelled ({reason})" + (f" before {stage}" if stage else ""))
+        self.reason = reason
+        self.stage = stage
+
+
+class Deadline:
+    """Point in time by which a request must finish, which can also be cancelled early from any thread"""
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def for_request(cls, requested_timeout: Any = None) -> "Deadline":
+        """Deadline for a request: the client's timeout in seconds, capped at CV_REQUEST_TIMEOUT_SECONDS"""
+        timeout = CV_REQUEST_TIMEOUT_SECONDS
+        try:
+            if requested_timeout is not None and float(requested_timeout) > 0:
+                timeout = min(timeout, float(requested_timeout))
+        except ValueError:
+            logger.warning(f"Ignoring invalid request timeout: {requested_timeout}")
+        return cls(timeout)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def bound(self, timeout: Optional[float]) -> Optional[float]:
+        """The shorter of timeout and the time left"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def cancel(self, reason: str = CLIENT_DISCONNECTED) -> None:
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self._cancelled.set()
+            logger.info("Request work cancelled", extra={"reason": reason})
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set() or self.remaining() == 0.0
+
+    def check(self, stage: str) -> None:
+        """Raise RequestCancelled, counting the stage that was skipped, once the deadline is gone"""
+        if self._cancelled.is_set():
+            reason = self.reason
+        elif self.remaining() == 0.0:
+            reason = DEADLINE_EXCEEDED
+        else:
+            return
+        STAGE_CANCELLATIONS.inc(stage=stage, reason=reason)
+        raise RequestCancelled(reason, stage)
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline of the request being served, for layers it is not passed to explicitly (LLM calls)"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def use_deadline(deadline: Optional[Deadline]) -> Iterator[None]:
+    """Make deadline the current one inside the block"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_deadline(stage: str) -> None:
+    """Check the current deadline, if there is one"""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Any) -> AsyncIterator[None]:
+    """Cancel the block when the client disconnects, surfacing it as RequestCancelled.
+
+    The request body must already have been read. request.is_disconnected() cannot be polled instead:
+    behind a BaseHTTPMiddleware its zero-timeout receive never sees the disconnect.
+    """
+    task = asyncio.current_task()
+    disconnected = False
+
+    async def watch() -> None:
+        nonlocal disconnected
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        disconnected = True
+        task.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield
+    except asyncio.CancelledError:
+        if not disconnected:
+            raise
+        task.uncancel()
+        raise RequestCancelled(CLIENT_DISCONNECTED)
+    finally:
+        watcher.cancel()
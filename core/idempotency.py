@@ -0,0 +1,163 @@
+"""
+Request Idempotency
+Duplicate requests (double-clicks, client retries) share one execution: a duplicate that arrives while
+the original is running waits for its result, and one that arrives shortly after gets the stored result
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+
+from core.metrics import IDEMPOTENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "4096"))
+
+# How a request was served
+EXECUTED, JOINED, REPLAYED = "executed", "joined", "replayed"
+
+
+class IdempotencyKeyReused(Exception):
+    """A client Idempotency-Key was sent again with a different request body"""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """Hash of a request body, independent of key order"""
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+
+
+def idempotency_key(scope: str, user: str, client_key: Optional[str] = None, payload: Any = None) -> str:
+    """Key for a request: the client's Idempotency-Key, or a hash of the payload, scoped to the user"""
+    if client_key:
+        material = orjson.dumps([scope, user, "key", client_key])
+    else:
+        material = orjson.dumps([scope, user, "payload", request_fingerprint(payload)])
+    return hashlib.sha256(material).hexdigest()
+
+
+class _Execution:
+    """A running execution and the requests waiting for it"""
+
+    def __init__(self, fingerprint: Optional[str], on_abandoned: Optional[Callable[[], None]]):
+        self.fingerprint = fingerprint
+        # A thread future, so callers on any thread or event loop can wait on it
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.task: Optional[asyncio.Task] = None
+        self.waiting = 0
+        self.on_abandoned = on_abandoned
+
+
+class IdempotencyStore:
+    """In-flight executions and a short-lived store of their successful results, keyed by idempotency key"""
+
+    def __init__(self, ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._in_flight: dict[str, _Execution] = {}
+        # key -> (expiry, request fingerprint, result); entries share one TTL, so insertion order is expiry order
+        self._completed: OrderedDict[str, tuple[float, Optional[str], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._completed)
+
+    def _purge(self, now: float) -> None:
+        while self._completed:
+            expires_at = next(iter(self._completed.values()))[0]
+            if expires_at > now and len(self._completed) <= self.max_entries:
+                break
+            self._completed.popitem(last=False)
+
+    @staticmethod
+    def _check_fingerprint(stored: Optional[str], fingerprint: Optional[str]) -> None:
+        if stored is not None and fingerprint is not None and stored != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key was already used with a different request body")
+
+    def _claim(self, key: str, fingerprint: Optional[str],
+               on_abandoned: Optional[Callable[[], None]]) -> tuple[str, Any]:
+        """Return (EXECUTED, new execution), (JOINED, running execution) or (REPLAYED, stored result)"""
+        with self._lock:
+            now = time.monotonic()
+            self._purge(now)
+            stored = self._completed.get(key)
+            if stored is not None:
+                self._check_fingerprint(stored[1], fingerprint)
+                return REPLAYED, stored[2]
+            execution = self._in_flight.get(key)
+            if execution is not None:
+                self._check_fingerprint(execution.fingerprint, fingerprint)
+                execution.waiting += 1
+                return JOINED, execution
+            execution = _Execution(fingerprint, on_abandoned)
+            execution.waiting = 1
+            self._in_flight[key] = execution
+            return EXECUTED, execution
+
+    def _settle(self, key: str, execution: _Execution, task: asyncio.Task) -> None:
+        error = RuntimeError("Execution was cancelled") if task.cancelled() else task.exception()
+        with self._lock:
+            self._in_flight.pop(key, None)
+            # Failures are not stored: a retry after a failure runs again
+            if error is None:
+                self._completed[key] = (time.monotonic() + self.ttl_seconds, execution.fingerprint, task.result())
+                self._purge(time.monotonic())
+        if error is not None:
+            execution.future.set_exception(error)
+        else:
+            execution.future.set_result(task.result())
+
+    def _leave(self, execution: _Execution) -> None:
+        """A waiting request went away; once nobody waits, the execution is told it was abandoned"""
+        with self._lock:
+            execution.waiting -= 1
+            abandoned = execution.waiting == 0 and not execution.future.done()
+        if abandoned and execution.on_abandoned is not None:
+            logger.info("Every request waiting for an execution went away")
+            execution.on_abandoned()
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]],
+                  on_abandoned: Optional[Callable[[], None]] = None,
+                  fingerprint: Optional[str] = None) -> tuple[Any, str]:
+        """Run func once per key and return its result and how this call was served.
+
+        func runs in its own task, so the request that started it can go away without failing the
+        duplicates waiting on it; on_abandoned is called when every waiting request has gone.
+        fingerprint identifies the request body: a call whose key matches but whose fingerprint does
+        not raises IdempotencyKeyReused instead of being handed another request's result.
+        """
+        outcome, value = self._claim(key, fingerprint, on_abandoned)
+        IDEMPOTENT_REQUESTS.inc(outcome=outcome)
+        if outcome == REPLAYED:
+            logger.info("Replaying stored result for duplicate request")
+            return value, outcome
+
+        execution = value
+        if outcome == EXECUTED:
+            execution.task = asyncio.ensure_future(func())
+            execution.task.add_done_callback(lambda task: self._settle(key, execution, task))
+        else:
+            logger.info("Joining in-flight request with the same idempotency key")
+
+        try:
+            # shield: a request that goes away must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(execution.future)), outcome
+        except asyncio.CancelledError:
+            self._leave(execution)
+            raise
+
+    def clear(self) -> None:
+        with self._lock:
+            self._completed.clear()
+
+
+idempotency_store = IdempotencyStore()
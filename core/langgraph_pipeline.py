@@ -1,24 +1,67 @@
-import boto3
-
+import asyncio
+import hashlib
+import logging
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import StateGraph, START, END
+
+from core.llm_gateway import get_gateway
+from core.tracing import traced
 from models.cv import CVState
-from langgraph.graph import StateGraph, END
-from core.config import model, latex_template
-from datetime import datetime
-import os, json, re, subprocess
-from pydantic import BaseModel
-from typing import Dict, Any
+from models.profile import CVProfile
+from util.json_extract import extract_json
+
+logger = logging.getLogger(__name__)
+
+# Sections whose item descriptions the ATS branch may rewrite
+OPTIMIZED_SECTIONS = ("workExperience", "projects", "education", "achievements")
+
+# Checkpoints of failed runs are kept this long (seconds) for a retry to resume, and for at most this many threads
+PIPELINE_CHECKPOINT_TTL = float(os.getenv("PIPELINE_CHECKPOINT_TTL", "3600"))
+PIPELINE_MAX_FAILED_THREADS = int(os.getenv("PIPELINE_MAX_FAILED_THREADS", "256"))
+
+# JSON mode makes Gemini answer with bare JSON, so most answers take the strict-parse path
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
 
 # === Utility ===
-def clean_json_string(model_output: str) -> str:
-    cleaned_output = re.sub(
-        r"```json\s*|```", "", model_output.strip(), flags=re.MULTILINE
-    )
-    cleaned_output = cleaned_output.replace("'", '"')
-    return cleaned_output
+async def _generate_json(prompt: str, label: str) -> dict:
+    """Run one Gemini call through the LLM gateway and decode its JSON answer"""
+    response = await get_gateway().agenerate(prompt, generation_config=JSON_GENERATION_CONFIG)
+    try:
+        data = extract_json(response.text)
+    except ValueError as e:
+        raise ValueError(f"Failed to decode JSON from {label} response: {str(e)}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object in the {label} response, got {type(data).__name__}")
+    return data
+
+
+def _apply_optimized_descriptions(form_data: dict, optimized: dict) -> dict:
+    """Overlay the rewritten descriptions on the original form data, item by item"""
+    merged = dict(form_data)
+    for section in OPTIMIZED_SECTIONS:
+        original, rewritten = form_data.get(section), optimized.get(section)
+        # Only trust the model's answer when it kept the section's shape
+        if not isinstance(original, list) or not isinstance(rewritten, list) or len(original) != len(rewritten):
+            continue
+        merged[section] = [
+            {**item, "description": new["description"]}
+            if isinstance(new, dict) and isinstance(new.get("description"), str) else item
+            for item, new in zip(original, rewritten)
+        ]
+    return merged
 
 
 # === LangGraph Agent: ExtractStructuredData ===
-def extract_structured_agent(state: Dict[str, Any]) -> Dict[str, Any]:
+@traced("langgraph.extract")
+async def extract_structured_agent(state: CVState) -> Dict[str, Any]:
     input_json = json.dumps(state.raw_input, indent=2)
     prompt = f"""
     Extract the following fields from this user input:
@@ -28,165 +71,153 @@ def extract_structured_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     - skills (list)
     - certifications (list)
     - projects (list with name, link, description)
+    The summary is a three to four sentence professional overview tailored to the job description.
     Input:
     ```json
     {input_json}
     ```
     Output JSON only.
     """
-    response = model.generate_content(prompt)
-    cleaned = clean_json_string(response.text)
-
-    # Remove triple backticks and optional "json"
-    cleaned = re.sub(
-        r"^```(?:json)?\s*|\s*```$", "", cleaned.strip(), flags=re.IGNORECASE
-    )
-
-    if not cleaned.strip():
-        raise ValueError("Cleaned response is empty after stripping markdown.")
-
-    try:
-        structured_data = json.loads(cleaned)
-        return {"extracted_data": structured_data}
-    except json.JSONDecodeError as e:
-        raise ValueError(
-            f"Failed to decode JSON from cleaned response:\n{cleaned}"
-        ) from e
+    return {"extracted_data": await _generate_json(prompt, "extraction")}
 
 
 # === LangGraph Agent: ATS Optimization ===
-def ats_optimization_agent(state: Dict[str, Any]) -> Dict[str, Any]:
-    data = state.extracted_data
+# Works from the raw input rather than the extraction so both LLM branches run side by side
+@traced("langgraph.ats_optimize")
+async def ats_optimization_agent(state: CVState) -> Dict[str, Any]:
+    form_data = state.raw_input.get("formData") or {}
+    sections = {section: form_data.get(section) or [] for section in OPTIMIZED_SECTIONS}
     prompt = f"""
-    Optimize this resume data for ATS compliance.
+    Optimize this resume data for ATS compliance against the job description.
     - Convert summaries into strong, keyword-rich statements
     - Convert job experience into action-verb bullet points
     - Avoid images/graphics and follow standard formatting
     - Keep it quantifiable and industry-specific
+    Rewrite only the "description" of each item; keep every section, item and field in the same order.
+    Job description:
+    {state.raw_input.get("jobDescription", "")}
     Input:
     ```json
-    {json.dumps(data, indent=2)}
+    {json.dumps(sections, indent=2)}
     ```
     Output structured JSON only.
     """
-    response = model.generate_content(prompt)
-    optimized = clean_json_string(response.text)
+    return {"ats_optimized_data": await _generate_json(prompt, "ATS optimization")}
 
-    optimized = re.sub(
-        r"^```(?:json)?\s*|\s*```$", "", optimized.strip(), flags=re.IGNORECASE
-    )
 
-    if not optimized.strip():
-        raise ValueError("Optimized response is empty.")
+# === LangGraph Agent: Render Typst ===
+@traced("langgraph.render")
+async def render_cv_agent(state: CVState) -> Dict[str, Any]:
+    from services.typst_service import generate_resume
 
-    try:
-        return {"ats_optimized_data": json.loads(optimized)}
-    except json.JSONDecodeError as e:
-        raise ValueError(
-            f"Failed to decode JSON from optimized response:\n{optimized}"
-        ) from e
-
-
-# === LangGraph Agent: Render LaTeX ===
-# def render_cv_agent(state: Dict[str, Any]) -> Dict[str, Any]:
-#     rendered_cv = latex_template.render(**state.ats_optimized_data)
-#     with open("output/cv.tex", "w", encoding="utf-8") as f:
-#         f.write(rendered_cv)
-#     subprocess.run(["pdflatex", "cv.tex"], cwd="output", check=True)
-#     return {"message": "CV rendered and compiled", "latex": rendered_cv}
-
-
-def render_cv_agent(state: Dict[str, Any]) -> Dict[str, Any]:
-    # Extract email if present
-    email = state.ats_optimized_data.get("email", "anonymous")
-
-    # Hash email and timestamp
-    #safe_email_hash = hashlib.sha256(email.encode()).hexdigest()[:10]
-    safe_email_hash = "demo"
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    output_dir = f"output/cv_{safe_email_hash}_{timestamp}"
-    os.makedirs(output_dir, exist_ok=True)
-
-    # Render LaTeX
-    rendered_cv = latex_template.render(**state.ats_optimized_data)
-
-    # Write .tex file
-    tex_path = os.path.join(output_dir, "cv.tex")
-    with open(tex_path, "w", encoding="utf-8") as f:
-        f.write(rendered_cv)
-
-    # Simulate `yes | pdflatex cv.tex`
-    # process = subprocess.run(
-    #     ["pdflatex", "cv.tex"],
-    #     cwd=output_dir,
-    #     input=b"y\n" * 10,  # simulate multiple 'y' inputs
-    #     stdout=subprocess.PIPE,
-    #     stderr=subprocess.PIPE,
-    #     check=True
-    # )
-    subprocess.run(
-        "yes | pdflatex cv.tex",
-        cwd=output_dir,
-        shell=True,
-        check=True
-    )
-
-    pdf_path = os.path.join(output_dir, "cv.pdf")
+    form_data = _apply_optimized_descriptions(state.raw_input.get("formData") or {}, state.ats_optimized_data or {})
+    overview = (state.extracted_data or {}).get("summary") or ""
+    if not isinstance(overview, str):
+        overview = " ".join(map(str, overview))
+
+    profile = CVProfile.from_form_data(form_data)
+    context: Dict[str, Any] = {}
+    # Typst compiles in-process; run it off the event loop
+    pdf_path = await asyncio.to_thread(generate_resume, context, overview, profile)
 
     return {
         "message": "CV rendered and compiled",
-        "latex": rendered_cv,
+        "typst_path": context["typst_path"],
         "pdf_path": pdf_path,
-        "directory": output_dir
     }
 
-# === LangGraph Agent: Upload to S3 ===
-class NoCredentialsError:
-    pass
-
 
 # === LangGraph Agent: Upload to S3 ===
-def upload_to_s3_agent(state: Dict[str, Any]) -> Dict[str, Any]:
-    pdf_path = state["pdf_path"]
-    email = state["ats_optimized_data"].get("email", "anonymous")
-    safe_email_hash = "demo"
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    s3_key = f"cvs/{safe_email_hash}_{timestamp}.pdf"
-    bucket_name = "cv-bucket-protfolio-app"  # Replace with your actual bucket name
-    region_name = "ap-southeast-1"  # Replace with your AWS region (e.g., "us-east-1")
-
-    s3_client = boto3.client("s3", region_name=region_name)
-
-    try:
-        s3_client.upload_file(pdf_path, bucket_name, s3_key)
-        print(f"File uploaded to s3://{bucket_name}/{s3_key} in region {region_name}")
-
-        # Generate pre-signed URL
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': bucket_name, 'Key': s3_key},
-            ExpiresIn=3600
-        )
-        return {"s3_url": presigned_url}
-    except FileNotFoundError:
-        return {"error": f"Error: PDF file not found at {pdf_path}"}
-    except NoCredentialsError:
-        return {"error": "Error: AWS credentials not found. Make sure IAM role is attached."}
-    except Exception as e:
-        return {"error": f"Error uploading to S3: {str(e)}"}
+@traced("langgraph.upload")
+async def upload_to_s3_agent(state: CVState) -> Dict[str, Any]:
+    from services.s3Uploader import upload_to_s3_agent as upload_pdf
 
+    result = await asyncio.to_thread(upload_pdf, state.pdf_path)
+    if "error" in result:
+        # Raise so the run stops at this node and can resume from the render checkpoint
+        raise RuntimeError(result["error"])
+    return {"s3_url": result["s3_url"]}
 
 
 workflow = StateGraph(state_schema=CVState)
 workflow.add_node("extract", extract_structured_agent)
 workflow.add_node("ats_optimize", ats_optimization_agent)
 workflow.add_node("render", render_cv_agent)
-workflow.add_node("upload",upload_to_s3_agent)
-workflow.set_entry_point("extract")
-workflow.add_edge("extract", "ats_optimize")
-workflow.add_edge("ats_optimize", "render")
+workflow.add_node("upload", upload_to_s3_agent)
+# Both LLM branches start from the raw input and run concurrently; render waits for both
+workflow.add_edge(START, "extract")
+workflow.add_edge(START, "ats_optimize")
+workflow.add_edge(["extract", "ats_optimize"], "render")
 workflow.add_edge("render", "upload")
-workflow.add_edge("upload",END)
+workflow.add_edge("upload", END)
 
+# Node outputs are checkpointed per thread, so a failed render or upload is retried
+# without repeating the LLM calls that already succeeded
+checkpointer = MemorySaver()
+graph_executor = workflow.compile(checkpointer=checkpointer)
 
-graph_executor = workflow.compile()
+
+def pipeline_thread_id(raw_input: dict) -> str:
+    """Stable checkpoint thread for an input, so retrying the same request resumes it"""
+    return hashlib.sha256(json.dumps(raw_input, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# thread_id -> when its last run failed, oldest first; these are the only checkpoints MemorySaver holds
+# between runs
+_failed_threads: OrderedDict[str, float] = OrderedDict()
+# thread_id -> (lock, runs holding or waiting for it)
+_thread_locks: Dict[str, tuple[asyncio.Lock, int]] = {}
+
+
+@asynccontextmanager
+async def _serialized(thread_id: str) -> AsyncIterator[None]:
+    """Run one pipeline per thread at a time; concurrent retries would race on the same checkpoints"""
+    lock, users = _thread_locks.get(thread_id, (asyncio.Lock(), 0))
+    _thread_locks[thread_id] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _thread_locks[thread_id]
+        if users == 1:
+            del _thread_locks[thread_id]
+        else:
+            _thread_locks[thread_id] = (lock, users - 1)
+
+
+async def _evict_failed_threads() -> None:
+    """Drop the checkpoints of failed runs that expired or overflow the cap"""
+    expired_before = time.monotonic() - PIPELINE_CHECKPOINT_TTL
+    while _failed_threads:
+        thread_id, failed_at = next(iter(_failed_threads.items()))
+        if failed_at > expired_before and len(_failed_threads) <= PIPELINE_MAX_FAILED_THREADS:
+            break
+        del _failed_threads[thread_id]
+        await checkpointer.adelete_thread(thread_id)
+
+
+async def run_cv_pipeline(raw_input: dict, thread_id: str = None) -> Dict[str, Any]:
+    """Run the graph, resuming from the last checkpoint when an earlier run of the thread failed"""
+    thread_id = thread_id or pipeline_thread_id(raw_input)
+    config = {"configurable": {"thread_id": thread_id}}
+
+    async with _serialized(thread_id):
+        # Running again, so not a candidate for eviction
+        _failed_threads.pop(thread_id, None)
+        try:
+            snapshot = await graph_executor.aget_state(config)
+            if snapshot.next:
+                logger.info("Resuming CV pipeline", extra={"thread_id": thread_id, "next": list(snapshot.next)})
+                result = await graph_executor.ainvoke(None, config)
+            else:
+                result = await graph_executor.ainvoke({"raw_input": raw_input}, config)
+        except BaseException:
+            # Keep the checkpoints for a retry, but not forever
+            _failed_threads[thread_id] = time.monotonic()
+            await _evict_failed_threads()
+            raise
+
+        # Finished threads are not resumed again; drop their checkpoints
+        await checkpointer.adelete_thread(thread_id)
+    await _evict_failed_threads()
+    return result
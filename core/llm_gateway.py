@@ -0,0 +1,502 @@
+"""
+LLM Gateway
+Every LLM call goes through one gateway: a token bucket sized to the provider quota, a bounded number of
+calls in flight, jittered retries on 429/5xx and coalescing of identical in-flight requests
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from core.deadline import DEADLINE_EXCEEDED, Deadline, RequestCancelled, current_deadline
+from core.metrics import (
+    LLM_CALL_DURATION, LLM_COALESCED, LLM_RETRIES, LLM_THROTTLE_WAIT, LLM_TIME_TO_FIRST_CHUNK, record_llm_usage,
+    track_stage
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Sized to the Gemini project quota; every attempt, retries included, spends one token
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "1000"))
+LLM_BURST = int(os.getenv("LLM_BURST", "20"))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Waiters are woken when a slot frees up or the call they follow settles; this only bounds how late
+# one notices that its deadline was cancelled from another thread
+_CANCEL_RECHECK_INTERVAL = 0.5
+
+
+class StreamInterrupted(Exception):
+    """A streamed answer failed after chunks were delivered, so it cannot be retried transparently"""
+
+
+class _LeaderCancelled(Exception):
+    """Handed to coalesced followers when the leading caller's own request was cancelled"""
+
+
+@dataclass
+class LLMResponse:
+    """Text and token usage of one completed LLM call"""
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """HTTP status of a provider error: litellm sets status_code, google.api_core sets code"""
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    return status_code_of(error) in RETRYABLE_STATUS_CODES or isinstance(error, (TimeoutError, ConnectionError))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; reserve() hands out a wait so sync and async callers can share it"""
+
+    def __init__(self, rate_per_second: float, capacity: int):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token, returning how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is a queue: each waiter is owed one token's refill time
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class GeminiProvider:
+    """google.generativeai model behind the gateway"""
+
+    name = "gemini"
+
+    def __init__(self, model_factory: Optional[Callable[[], Any]] = None):
+        if model_factory is None:
+            from core.config import get_model
+            model_factory = get_model
+        self._model_factory = model_factory
+
+    @staticmethod
+    def _with_timeout(config: dict[str, Any]) -> dict[str, Any]:
+        """Stop waiting for the provider once the request's deadline has passed"""
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and "request_options" not in config:
+            config = {**config, "request_options": {"timeout": max(remaining, 1.0)}}
+        return config
+
+    @staticmethod
+    def _response(response: Any) -> LLMResponse:
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            completion_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+        )
+
+    def complete(self, prompt: str, **config: Any) -> LLMResponse:
+        return self._response(self._model_factory().generate_content(prompt, **self._with_timeout(config)))
+
+    async def acomplete(self, prompt: str, **config: Any) -> LLMResponse:
+        return self._response(await self._model_factory().generate_content_async(prompt, **self._with_timeout(config)))
+
+    def complete_stream(self, prompt: str, on_chunk: Callable[[str], None], **config: Any) -> LLMResponse:
+        """Stream the answer, handing each text chunk to on_chunk; usage arrives with the last chunk"""
+        response = self._model_factory().generate_content(prompt, stream=True, **self._with_timeout(config))
+        for chunk in response:
+            if chunk.text:
+                on_chunk(chunk.text)
+        return self._response(response)
+
+    async def acomplete_stream(self, prompt: str, on_chunk: Callable[[str], None], **config: Any) -> LLMResponse:
+        response = await self._model_factory().generate_content_async(prompt, stream=True,
+                                                                      **self._with_timeout(config))
+        async for chunk in response:
+            if chunk.text:
+                on_chunk(chunk.text)
+        return self._response(response)
+
+
+class LLMGateway:
+    """Rate-limited, concurrency-bounded, retrying and coalescing front for LLM calls"""
+
+    def __init__(self, provider: Any = None, requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 burst: int = LLM_BURST, max_in_flight: int = LLM_MAX_IN_FLIGHT, max_retries: int = LLM_MAX_RETRIES,
+                 base_delay: float = LLM_RETRY_BASE_DELAY, max_delay: float = LLM_RETRY_MAX_DELAY):
+        self.provider = provider
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        # Async callers waiting for a slot, woken one at a time as slots are released
+        self._slot_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = deque()
+        # Shared by sync and async callers, so these are thread futures rather than asyncio ones
+        self._in_flight: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_key(*parts: Any) -> str:
+        """Coalescing key for a request: identical prompts and settings share one call"""
+        payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _join(self, key: Optional[str]) -> tuple[concurrent.futures.Future, bool]:
+        """Return the future for a key and whether this caller leads (makes the call)"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if key is None:
+            return future, True
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                LLM_COALESCED.inc()
+                return existing, False
+            self._in_flight[key] = future
+        return future, True
+
+    def _settle(self, key: Optional[str], future: concurrent.futures.Future, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        if key is not None:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Backoff before retrying error, or None when it should not be retried"""
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+        delay = self._backoff(attempt)
+        deadline = current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and remaining <= delay:
+            # No time left for another attempt: fail now rather than after the wait
+            return None
+        reason = str(status_code_of(error) or type(error).__name__)
+        LLM_RETRIES.inc(reason=reason)
+        logger.warning(f"LLM call failed ({reason}), retrying (attempt {attempt + 1}/{self.max_retries})")
+        return delay
+
+    @staticmethod
+    def _observe(start: float, outcome: str) -> None:
+        LLM_CALL_DURATION.observe(time.perf_counter() - start, outcome=outcome)
+
+    def _release_slot(self) -> None:
+        """Free a slot; blocked sync callers wake on the semaphore, the first async waiter is signalled"""
+        self._slots.release()
+        self._wake_slot_waiter()
+
+    def _wake_slot_waiter(self) -> None:
+        while True:
+            with self._lock:
+                if not self._slot_waiters:
+                    return
+                loop, event = self._slot_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(event.set)
+                return
+            except RuntimeError:
+                # That waiter's loop is closed; wake the next one instead
+                continue
+
+    # --- sync callers (CrewAI runs agents in worker threads) ---
+
+    def _acquire(self) -> None:
+        start = time.perf_counter()
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check("llm")
+        wait = self.bucket.reserve()
+        if wait:
+            time.sleep(deadline.bound(wait) if deadline is not None else wait)
+        if deadline is None:
+            self._slots.acquire()
+        elif not self._slots.acquire(timeout=deadline.bound(None)):
+            # Timed out waiting for a slot, so the deadline has passed
+            deadline.check("llm")
+            raise RequestCancelled(DEADLINE_EXCEEDED, "llm")
+        LLM_THROTTLE_WAIT.observe(time.perf_counter() - start)
+        if deadline is not None and deadline.cancelled:
+            self._release_slot()
+            deadline.check("llm")
+
+    def _abandon(self, key: Optional[str], future: concurrent.futures.Future) -> None:
+        """Drop a call whose leader was cancelled; its followers retry, one of them as the new leader"""
+        self._settle(key, future, error=_LeaderCancelled())
+
+    def call(self, func: Callable[[], T], key: Optional[str] = None) -> T:
+        """Run a blocking LLM call through the limiter, retrying transient failures"""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                return self._lead(func, key, future)
+            try:
+                return self._follow(future)
+            except _LeaderCancelled:
+                continue
+
+    @staticmethod
+    def _follow(future: concurrent.futures.Future) -> Any:
+        """Wait for a coalesced call, giving up when this caller's own deadline does"""
+        deadline = current_deadline()
+        if deadline is None:
+            return future.result()
+        while True:
+            deadline.check("llm")
+            try:
+                return future.result(timeout=deadline.bound(_CANCEL_RECHECK_INTERVAL))
+            except concurrent.futures.TimeoutError:
+                continue
+
+    def _lead(self, func: Callable[[], T], key: Optional[str], future: concurrent.futures.Future) -> T:
+        try:
+            with track_stage("llm"):
+                attempt = 0
+                while True:
+                    self._acquire()
+                    start = time.perf_counter()
+                    try:
+                        result = func()
+                        self._observe(start, "ok")
+                        break
+                    except Exception as e:
+                        self._observe(start, "error")
+                        delay = self._retry_delay(e, attempt)
+                        if delay is None:
+                            raise
+                    finally:
+                        self._release_slot()
+                    time.sleep(delay)
+                    attempt += 1
+        except RequestCancelled:
+            # The leader's deadline or disconnect is not the followers'
+            self._abandon(key, future)
+            raise
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    # --- async callers ---
+
+    async def _aacquire(self) -> None:
+        start = time.perf_counter()
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check("llm")
+        wait = self.bucket.reserve()
+        if wait:
+            await asyncio.sleep(deadline.bound(wait) if deadline is not None else wait)
+        await self._await_slot(deadline)
+        LLM_THROTTLE_WAIT.observe(time.perf_counter() - start)
+        if deadline is not None and deadline.cancelled:
+            self._release_slot()
+            deadline.check("llm")
+
+    async def _await_slot(self, deadline: Optional[Deadline]) -> None:
+        """Take a slot, sleeping until a release signals one rather than polling the semaphore"""
+        loop = asyncio.get_running_loop()
+        while True:
+            event = asyncio.Event()
+            waiter = (loop, event)
+            # Registered before trying, so a release between the try and the wait is not missed
+            with self._lock:
+                self._slot_waiters.append(waiter)
+            # Leaving the loop, with a slot or an error, unless the wait below ends normally
+            leaving = True
+            try:
+                if self._slots.acquire(blocking=False):
+                    return
+                if deadline is not None:
+                    deadline.check("llm")
+                timeout = deadline.bound(_CANCEL_RECHECK_INTERVAL) if deadline is not None else None
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except TimeoutError:
+                    pass
+                leaving = False
+            finally:
+                with self._lock:
+                    woken = waiter not in self._slot_waiters
+                    if not woken:
+                        self._slot_waiters.remove(waiter)
+                # A wake-up this caller will not use (it got a slot anyway, or is leaving) goes to the next waiter
+                if woken and leaving:
+                    self._wake_slot_waiter()
+
+    async def acall(self, func: Callable[[], Awaitable[T]], key: Optional[str] = None) -> T:
+        """Async counterpart of call(); func is invoked once per attempt"""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                return await self._alead(func, key, future)
+            try:
+                return await self._afollow(future)
+            except _LeaderCancelled:
+                continue
+
+    @staticmethod
+    async def _afollow(future: concurrent.futures.Future) -> Any:
+        """Async counterpart of _follow"""
+        # Shielded: a follower giving up must not cancel the shared future under the leader
+        waiter = asyncio.wrap_future(future)
+        deadline = current_deadline()
+        if deadline is None:
+            return await asyncio.shield(waiter)
+        while True:
+            deadline.check("llm")
+            try:
+                return await asyncio.wait_for(asyncio.shield(waiter), deadline.bound(_CANCEL_RECHECK_INTERVAL))
+            except TimeoutError:
+                continue
+
+    async def _alead(self, func: Callable[[], Awaitable[T]], key: Optional[str],
+                     future: concurrent.futures.Future) -> T:
+        try:
+            with track_stage("llm"):
+                attempt = 0
+                while True:
+                    await self._aacquire()
+                    start = time.perf_counter()
+                    try:
+                        result = await func()
+                        self._observe(start, "ok")
+                        break
+                    except Exception as e:
+                        self._observe(start, "error")
+                        delay = self._retry_delay(e, attempt)
+                        if delay is None:
+                            raise
+                    finally:
+                        self._release_slot()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+        except (RequestCancelled, asyncio.CancelledError):
+            self._abandon(key, future)
+            raise
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    # --- provider shortcuts ---
+
+    def generate(self, prompt: str, coalesce: bool = True, **config: Any) -> LLMResponse:
+        def complete() -> LLMResponse:
+            response = self.provider.complete(prompt, **config)
+            record_llm_usage(response.prompt_tokens, response.completion_tokens)
+            return response
+
+        key = self.request_key(self.provider.name, prompt, config) if coalesce else None
+        return self.call(complete, key)
+
+    async def agenerate(self, prompt: str, coalesce: bool = True, **config: Any) -> LLMResponse:
+        async def complete() -> LLMResponse:
+            response = await self.provider.acomplete(prompt, **config)
+            record_llm_usage(response.prompt_tokens, response.completion_tokens)
+            return response
+
+        key = self.request_key(self.provider.name, prompt, config) if coalesce else None
+        return await self.acall(complete, key)
+
+    # Streams are not coalesced (a follower would miss the chunks) and are retried only
+    # until the first chunk has been handed to the caller
+
+    def generate_stream(self, prompt: str, on_chunk: Callable[[str], None], **config: Any) -> LLMResponse:
+        deadline = current_deadline()
+
+        def complete() -> LLMResponse:
+            start = time.perf_counter()
+            delivered = []
+
+            def forward(text: str) -> None:
+                if not delivered:
+                    LLM_TIME_TO_FIRST_CHUNK.observe(time.perf_counter() - start)
+                if deadline is not None:
+                    # Stop reading (and paying for) an answer nobody is waiting for
+                    deadline.check("llm_stream")
+                delivered.append(text)
+                on_chunk(text)
+
+            try:
+                response = self.provider.complete_stream(prompt, forward, **config)
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                if delivered:
+                    raise StreamInterrupted(f"LLM stream failed after {len(delivered)} chunks: {str(e)}") from e
+                raise
+            record_llm_usage(response.prompt_tokens, response.completion_tokens)
+            return response
+
+        return self.call(complete)
+
+    async def agenerate_stream(self, prompt: str, on_chunk: Callable[[str], None], **config: Any) -> LLMResponse:
+        deadline = current_deadline()
+
+        async def complete() -> LLMResponse:
+            start = time.perf_counter()
+            delivered = []
+
+            def forward(text: str) -> None:
+                if not delivered:
+                    LLM_TIME_TO_FIRST_CHUNK.observe(time.perf_counter() - start)
+                if deadline is not None:
+                    deadline.check("llm_stream")
+                delivered.append(text)
+                on_chunk(text)
+
+            try:
+                response = await self.provider.acomplete_stream(prompt, forward, **config)
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                if delivered:
+                    raise StreamInterrupted(f"LLM stream failed after {len(delivered)} chunks: {str(e)}") from e
+                raise
+            record_llm_usage(response.prompt_tokens, response.completion_tokens)
+            return response
+
+        return await self.acall(complete)
+
+
+@lru_cache(maxsize=None)
+def get_gateway() -> LLMGateway:
+    """The process-wide gateway in front of Gemini"""
+    return LLMGateway(GeminiProvider())
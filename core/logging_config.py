@@ -0,0 +1,206 @@
+"""
+Logging
+Structured JSON logs written by a background thread, tagged with the current request/workflow/trace id
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from core.tracing import current_trace_id
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" for one JSON object per line, "text" for human-readable lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Records waiting for the writer thread; further records are dropped, not blocked on
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Recent records kept in memory for inspection
+LOG_RING_BUFFER_SIZE = int(os.getenv("LOG_RING_BUFFER_SIZE", "1000"))
+# Share of INFO-level payload logs that are written; DEBUG level always writes them
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+# Logged payloads are truncated to this many characters
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+# CrewAI prints every agent step to stdout when verbose
+CREW_VERBOSE = os.getenv("CREW_VERBOSE", "false").lower() == "true"
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+workflow_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("workflow_id", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RESERVED_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+@contextmanager
+def log_context(request_id: Optional[str] = None, workflow_id: Optional[str] = None) -> Iterator[None]:
+    """Tag every record logged inside the block with the given request/workflow id"""
+    tokens = []
+    if request_id is not None:
+        tokens.append((request_id_var, request_id_var.set(request_id)))
+    if workflow_id is not None:
+        tokens.append((workflow_id_var, workflow_id_var.set(workflow_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the request/workflow/trace ids onto records in the logging thread, before they are queued;
+    ids passed explicitly in `extra` win"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        if getattr(record, "workflow_id", None) is None:
+            record.workflow_id = workflow_id_var.get()
+        record.trace_id = current_trace_id()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "workflow_id": getattr(record, "workflow_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking or raising when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make the record safe to queue; unlike the stock prepare, the traceback stays separate
+        (as exc_text) instead of being folded into the message, so the writer can still format it"""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent formatted records in a bounded buffer"""
+
+    def __init__(self, capacity: int = LOG_RING_BUFFER_SIZE):
+        super().__init__()
+        self.buffer: deque[dict[str, Any]] = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.buffer.append({
+            "timestamp": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "workflow_id": getattr(record, "workflow_id", None),
+        })
+
+    def records(self, request_id: Optional[str] = None, workflow_id: Optional[str] = None) -> list[dict[str, Any]]:
+        """Return buffered records, optionally only those of one request or workflow"""
+        return [
+            entry for entry in list(self.buffer)
+            if (request_id is None or entry["request_id"] == request_id)
+            and (workflow_id is None or entry["workflow_id"] == workflow_id)
+        ]
+
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+ring_buffer = RingBufferHandler()
+
+
+def configure_logging(level: str = LOG_LEVEL, stream=None) -> None:
+    """Route all logging through a bounded queue to a background writer thread; safe to call repeatedly"""
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is not None:
+            return
+
+        writer = logging.StreamHandler(stream or sys.stdout)
+        if LOG_FORMAT == "json":
+            writer.setFormatter(JsonFormatter())
+        else:
+            writer.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        root.handlers = [_queue_handler]
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, writer, ring_buffer, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    """Return how many records were dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def log_payload(logger: logging.Logger, message: str, payload: Any, level: int = logging.INFO) -> None:
+    """Log a large payload: always when DEBUG is enabled, otherwise only for a sample of calls"""
+    if logger.isEnabledFor(logging.DEBUG):
+        level = logging.DEBUG
+    elif not logger.isEnabledFor(level) or random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+
+    text = payload if isinstance(payload, str) else repr(payload)
+    if len(text) > LOG_PAYLOAD_MAX_CHARS:
+        text = f"{text[:LOG_PAYLOAD_MAX_CHARS]}... ({len(text)} chars)"
+    logger.log(level, message, extra={"payload": text})
@@ -0,0 +1,304 @@
+"""
+Metrics
+In-process counters, gauges and histograms rendered in the Prometheus text exposition format
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+
+# Latency buckets in seconds, from cache hits up to full LLM + compile runs
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def total(self) -> float:
+        """Sum over every label combination"""
+        with self._lock:
+            return sum(self._values.values())
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], dict[tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> list[str]:
+        if self._callback is not None:
+            try:
+                items = sorted(self._callback().items())
+            except Exception:
+                items = []
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them for /metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.register(Histogram(
+    "cv_stage_duration_seconds", "Duration of each pipeline stage", ["stage"]))
+STAGE_ERRORS = registry.register(Counter(
+    "cv_stage_errors_total", "Pipeline stage failures", ["stage"]))
+STAGE_CANCELLATIONS = registry.register(Counter(
+    "cv_stage_cancellations_total", "Pipeline stages skipped because the request was cancelled", ["stage", "reason"]))
+STAGE_IN_FLIGHT = registry.register(Gauge(
+    "cv_stage_in_flight", "Pipeline stages currently running", ["stage"]))
+
+LLM_TOKENS = registry.register(Counter(
+    "cv_llm_tokens_total", "LLM tokens used", ["kind"]))
+LLM_REQUESTS = registry.register(Counter(
+    "cv_llm_requests_total", "Successful LLM requests"))
+LLM_CALL_DURATION = registry.register(Histogram(
+    "cv_llm_call_duration_seconds", "Latency of each LLM provider attempt", ["outcome"]))
+LLM_RETRIES = registry.register(Counter(
+    "cv_llm_retries_total", "LLM attempts retried, by status code or error type", ["reason"]))
+LLM_COALESCED = registry.register(Counter(
+    "cv_llm_coalesced_total", "LLM requests served by an identical call already in flight"))
+LLM_TIME_TO_FIRST_CHUNK = registry.register(Histogram(
+    "cv_llm_time_to_first_chunk_seconds", "Time from sending a streamed LLM request to its first chunk"))
+LLM_THROTTLE_WAIT = registry.register(Histogram(
+    "cv_llm_throttle_wait_seconds", "Time LLM attempts waited for the rate limiter and a free slot"))
+PROMPT_TOKENS = registry.register(Histogram(
+    "cv_llm_prompt_tokens", "Estimated tokens of built prompt sections", ["prompt"],
+    buckets=(100, 200, 400, 600, 800, 1200, 2000, 4000, 8000)))
+LLM_JSON_PARSES = registry.register(Counter(
+    "cv_llm_json_parses_total", "JSON answers parsed from LLM output, by path taken", ["outcome"]))
+
+ATS_SCORE = registry.register(Histogram(
+    "cv_ats_score", "Final ATS score of generated CVs", buckets=(50, 60, 70, 80, 85, 90, 95, 100)))
+WORKFLOW_ITERATIONS = registry.register(Histogram(
+    "cv_workflow_iterations", "Optimisation iterations per workflow run", buckets=(1, 2, 3, 5, 10)))
+CV_BATCH_SIZE = registry.register(Histogram(
+    "cv_batch_jobs", "Job descriptions per batch CV generation request", buckets=(1, 2, 5, 10, 20, 30, 50)))
+
+ADMISSION_RUNNING = registry.register(Gauge(
+    "cv_admission_running", "Admitted requests currently running", ["route"]))
+ADMISSION_QUEUE_DEPTH = registry.register(Gauge(
+    "cv_admission_queue_depth", "Requests waiting for admission", ["route"]))
+ADMISSION_WAIT = registry.register(Histogram(
+    "cv_admission_wait_seconds", "Time requests waited for admission", ["route", "outcome"]))
+ADMISSION_REJECTED = registry.register(Counter(
+    "cv_admission_rejected_total", "Requests turned away by admission control", ["route", "reason"]))
+IDEMPOTENT_REQUESTS = registry.register(Counter(
+    "cv_idempotent_requests_total", "Idempotent requests by how they were served", ["outcome"]))
+
+HTTP_REQUESTS = registry.register(Counter(
+    "cv_http_requests_total", "HTTP requests handled", ["method", "route", "status"]))
+HTTP_DURATION = registry.register(Histogram(
+    "cv_http_request_duration_seconds", "HTTP request latency", ["method", "route"]))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "cv_http_requests_in_flight", "HTTP requests currently being handled"))
+
+# Cache name -> stats callable returning {"hits", "misses"}, read at scrape time
+_cache_sources: dict[str, Callable[[], dict[str, float]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], dict[str, float]]) -> None:
+    """Expose a cache's hit/miss counters and hit ratio on /metrics"""
+    _cache_sources[name] = stats
+
+
+def _cache_values(field: str) -> dict[tuple[str, ...], float]:
+    values = {}
+    for name, stats in list(_cache_sources.items()):
+        current = stats()
+        lookups = current["hits"] + current["misses"]
+        values[(name,)] = current[field] if field != "ratio" else (current["hits"] / lookups if lookups else 0.0)
+    return values
+
+
+registry.register(Gauge("cv_cache_hits", "Cache hits", ["cache"], callback=lambda: _cache_values("hits")))
+registry.register(Gauge("cv_cache_misses", "Cache misses", ["cache"], callback=lambda: _cache_values("misses")))
+registry.register(Gauge("cv_cache_hit_ratio", "Cache hit ratio", ["cache"], callback=lambda: _cache_values("ratio")))
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Time a pipeline stage, count its failures and track how many are running"""
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=stage)
+        STAGE_IN_FLIGHT.dec(stage=stage)
+
+
+def timed_stage(stage: str) -> Callable:
+    """Decorator form of track_stage"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_llm_usage(prompt_tokens: int = 0, completion_tokens: int = 0, cached_prompt_tokens: int = 0,
+                     requests: int = 1) -> None:
+    """Count the tokens and requests of one LLM call"""
+    LLM_TOKENS.inc(prompt_tokens, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, kind="completion")
+    if cached_prompt_tokens:
+        LLM_TOKENS.inc(cached_prompt_tokens, kind="cached_prompt")
+    LLM_REQUESTS.inc(requests)
+
+
+def render_metrics() -> str:
+    """Return every metric in the Prometheus text exposition format"""
+    return registry.render()
@@ -0,0 +1,131 @@
+"""
+Tracing
+OpenTelemetry setup: one root span per request, child spans per pipeline stage, exported over OTLP or to a file
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+# "otlp" (OTEL_EXPORTER_OTLP_ENDPOINT), "file" (TRACING_FILE) or "none"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "cv-automation")
+
+# Our own provider rather than the global one: CrewAI installs its telemetry provider
+# globally, and our spans must not depend on (or leak into) it
+_provider: Optional[TracerProvider] = None
+_configured = False
+_lock = threading.Lock()
+
+
+class _LazyTracer:
+    """Tracer handle that modules can import before tracing is configured; a no-op until then"""
+
+    _noop = trace.NoOpTracer()
+
+    def start_as_current_span(self, name: str, **kwargs):
+        active = _provider.get_tracer("cv-automation") if _provider is not None else self._noop
+        return active.start_as_current_span(name, **kwargs)
+
+
+tracer = _LazyTracer()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends finished spans to a local file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        try:
+            lines = "".join(json.dumps(json.loads(span.to_json())) + "\n" for span in spans)
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            return SpanExportResult.SUCCESS
+        except Exception as e:
+            logger.warning(f"Failed to export spans to {self.path}: {str(e)}")
+            return SpanExportResult.FAILURE
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _create_exporter(name: str) -> Optional[SpanExporter]:
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if name == "file":
+        return FileSpanExporter(TRACING_FILE)
+    return None
+
+
+def configure_tracing(app=None, exporter: Optional[str] = None) -> None:
+    """Install the tracer provider and instrument FastAPI and botocore; a no-op when tracing is disabled"""
+    global _configured, _provider
+
+    with _lock:
+        if _configured:
+            return
+        _configured = True
+
+        span_exporter = _create_exporter(exporter or TRACING_EXPORTER)
+        if span_exporter is None:
+            return
+
+        provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        _provider = provider
+
+        if app is not None:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="metrics")
+
+        try:
+            from opentelemetry.instrumentation.botocore import BotocoreInstrumentor
+            BotocoreInstrumentor().instrument(tracer_provider=provider)
+        except ImportError:
+            logger.info("opentelemetry-instrumentation-botocore is not installed; DynamoDB and S3 calls are not traced")
+
+
+def traced(name: str) -> Callable:
+    """Run the decorated function, sync or async, inside a child span"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_as_current_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the hex id of the active trace, if any"""
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans to the exporter"""
+    if _provider is not None:
+        _provider.shutdown()
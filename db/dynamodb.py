@@ -1,7 +1,15 @@
-import boto3
 import os
+from functools import lru_cache
 
 REGION = os.getenv("AWS_REGION","ap-southeast-1")
-session = boto3session=boto3.session.Session()
-dynamodb = session.resource("dynamodb",region_name=REGION)
-table = dynamodb.Table("CVUserData")
\ No newline at end of file
+TABLE_NAME = os.getenv("DYNAMODB_TABLE", "CVUserData")
+
+
+@lru_cache(maxsize=None)
+def get_table():
+    """Build the boto3 session and table resource on first use, then reuse them"""
+    import boto3
+
+    session = boto3.session.Session()
+    dynamodb = session.resource("dynamodb",region_name=REGION)
+    return dynamodb.Table(TABLE_NAME)
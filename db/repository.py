@@ -1,15 +1,19 @@
-from db.dynamodb import table
+from db.dynamodb import get_table
+from core.metrics import timed_stage
 
+@timed_stage("dynamodb_put")
 def save_user_data(email: str,data:dict):
-    table.put_item(Item={"email":email, **data})
+    get_table().put_item(Item={"email":email, **data})
 
+@timed_stage("dynamodb_get")
 def get_user_data(email:str):
-    response = table.get_item(Key={"email":email.strip()})
+    response = get_table().get_item(Key={"email":email.strip()})
     return response.get("Item")
 
+@timed_stage("dynamodb_update")
 def update_latest_raw_input(email: str, new_raw_input: str,update_time:str) -> dict:
 
-    resp = table.update_item(
+    resp = get_table().update_item(
         Key={"email": email},
         UpdateExpression="SET raw_input = :ri, created_at = :ca",
         ExpressionAttributeValues={
@@ -1,10 +1,60 @@
 
 # === app/main.py ===
-from fastapi import FastAPI
+import importlib
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from core.logging_config import configure_logging, log_context
+from core.metrics import HTTP_DURATION, HTTP_IN_FLIGHT, HTTP_REQUESTS
+from core.tracing import configure_tracing
 from api.routes import router
 
-app = FastAPI()
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Modules the routes import on first use. Warming them in a background thread lets the
+# worker accept traffic straight away without the first CV request paying for crewai/litellm
+PRELOAD_MODULES = ("workflows.cv_automation.crew", "workflows.cv_automation.ats_batch")
+PRELOAD_ON_STARTUP = os.getenv("PRELOAD_ON_STARTUP", "true").lower() == "true"
+# Compile every résumé template once before serving: broken templates are dropped (a broken
+# default fails start-up) and the compile pool has their imports resolved for the first requests
+VALIDATE_TEMPLATES_ON_STARTUP = os.getenv("VALIDATE_TEMPLATES_ON_STARTUP", "true").lower() == "true"
+
+
+def _preload_modules() -> None:
+    start = time.perf_counter()
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Failed to preload {module}: {str(e)}")
+    logger.info("Preloaded workflow modules", extra={"seconds": round(time.perf_counter() - start, 3)})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PRELOAD_ON_STARTUP:
+        threading.Thread(target=_preload_modules, name="module-preload", daemon=True).start()
+    if VALIDATE_TEMPLATES_ON_STARTUP:
+        from services.typst_service import prepare_resume_templates
+        try:
+            rejected = await prepare_resume_templates()
+            if rejected:
+                logger.warning("Résumé templates failed validation", extra={"templates": rejected})
+        except Exception as e:
+            # Serve anyway; templates are compiled on demand and a failure here may be transient
+            logger.error(f"Résumé template validation failed: {str(e)}")
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+configure_tracing(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,4 +64,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(router)
\ No newline at end of file
+app.include_router(router)
+
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag every log record of a request with its id, record HTTP metrics and echo the id back"""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    start = time.perf_counter()
+    status = "500"
+    HTTP_IN_FLIGHT.inc()
+    try:
+        with log_context(request_id=request_id):
+            response = await call_next(request)
+        status = str(response.status_code)
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template, not the raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=status)
+        HTTP_DURATION.observe(time.perf_counter() - start, method=request.method, route=route_path)
+    response.headers["X-Request-ID"] = request_id
+    return response
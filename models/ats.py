@@ -0,0 +1,37 @@
+import os
+
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from typing import Annotated, Optional, List
+from models.user import FormData
+
+# Upper bounds on one batch scoring request; the work grows with their product
+ATS_BATCH_MAX_CVS = int(os.getenv("ATS_BATCH_MAX_CVS", "1000"))
+ATS_BATCH_MAX_JOBS = int(os.getenv("ATS_BATCH_MAX_JOBS", "200"))
+ATS_BATCH_MAX_TOP_K = int(os.getenv("ATS_BATCH_MAX_TOP_K", "100"))
+
+
+class ATSBatchCV(BaseModel):
+    id: str
+    text: Optional[str] = None
+    overview: Optional[str] = None
+    formData: Optional[FormData] = None
+
+
+class ATSBatchJob(BaseModel):
+    id: str
+    jobDescription: str
+
+
+class ATSBatchQuery(BaseModel):
+    cvs: Annotated[List[ATSBatchCV], Field(min_length=1, max_length=ATS_BATCH_MAX_CVS)]
+    jobs: Annotated[List[ATSBatchJob], Field(min_length=1, max_length=ATS_BATCH_MAX_JOBS)]
+    topK: Annotated[int, Field(ge=1, le=ATS_BATCH_MAX_TOP_K)] = 10
+
+    @field_validator("cvs", "jobs")
+    @classmethod
+    def _unique_ids(cls, items: list, info: ValidationInfo) -> list:
+        """Results are keyed by id, so a repeated id would silently replace an earlier entry"""
+        ids = [item.id for item in items]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"{'CV' if info.field_name == 'cvs' else 'Job'} ids must be unique")
+        return items
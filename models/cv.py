@@ -1,9 +1,13 @@
+from typing import Optional
+
 from pydantic import BaseModel
+
+
 class CVState(BaseModel):
     raw_input: dict
-    extracted_data: dict = None
-    ats_optimized_data: dict = None
-    latex_code: str = None
-    pdf_path: str = None
-    directory: str = None
-    s3_url:str = None
\ No newline at end of file
+    extracted_data: Optional[dict] = None
+    ats_optimized_data: Optional[dict] = None
+    typst_path: Optional[str] = None
+    pdf_path: Optional[str] = None
+    s3_url: Optional[str] = None
+    message: Optional[str] = None
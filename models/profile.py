@@ -0,0 +1,256 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from util.date_util import is_year_only, parse_month
+
+
+def _text(item: dict[str, Any], key: str) -> str:
+    """Read a string field, treating missing and null values as empty"""
+    value = item.get(key)
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _text_list(item: dict[str, Any], key: str) -> tuple[str, ...]:
+    """Read a list of strings, dropping empty entries"""
+    values = item.get(key) or []
+    if not isinstance(values, list):
+        raise ValueError(f"{key} must be a list")
+    return tuple(value for value in values if isinstance(value, str) and value.strip())
+
+
+@dataclass(slots=True)
+class PersonalDetails:
+    full_name: str = ""
+    email: str = ""
+    phone: str = ""
+    address: str = ""
+    linkedin: str = ""
+    github: str = ""
+    portfolio: str = ""
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "PersonalDetails":
+        return cls(
+            full_name=_text(item, "fullName"),
+            email=_text(item, "email"),
+            phone=_text(item, "phone"),
+            address=_text(item, "address"),
+            linkedin=_text(item, "linkedIn"),
+            github=_text(item, "gitHub"),
+            portfolio=_text(item, "portfolio")
+        )
+
+
+@dataclass(slots=True)
+class WorkItem:
+    job_title: str
+    company: str
+    location: str
+    start_date: str
+    end_date: str
+    description: str
+    currently_working: bool
+    start: Optional[int]
+    end: Optional[int]
+    # Dates given as a bare year: start/end hold January of it, which is not to be displayed
+    start_year_only: bool = False
+    end_year_only: bool = False
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "WorkItem":
+        start_date, end_date = _text(item, "startDate"), _text(item, "endDate")
+        return cls(
+            job_title=_text(item, "jobTitle"),
+            company=_text(item, "company"),
+            location=_text(item, "location"),
+            start_date=start_date,
+            end_date=end_date,
+            description=_text(item, "description"),
+            currently_working=bool(item.get("currentlyWorking", False)),
+            start=parse_month(start_date),
+            end=parse_month(end_date),
+            start_year_only=is_year_only(start_date),
+            end_year_only=is_year_only(end_date)
+        )
+
+
+@dataclass(slots=True)
+class EducationItem:
+    degree: str
+    institution: str
+    field_of_study: str
+    start_date: str
+    end_date: str
+    description: str
+    currently_studying: bool
+    start: Optional[int]
+    end: Optional[int]
+    # Dates given as a bare year: start/end hold January of it, which is not to be displayed
+    start_year_only: bool = False
+    end_year_only: bool = False
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "EducationItem":
+        start_date, end_date = _text(item, "startDate"), _text(item, "endDate")
+        return cls(
+            degree=_text(item, "degree"),
+            institution=_text(item, "institution"),
+            field_of_study=_text(item, "fieldOfStudy"),
+            start_date=start_date,
+            end_date=end_date,
+            description=_text(item, "description"),
+            currently_studying=bool(item.get("currentlyStudying", False)),
+            start=parse_month(start_date),
+            end=parse_month(end_date),
+            start_year_only=is_year_only(start_date),
+            end_year_only=is_year_only(end_date)
+        )
+
+
+@dataclass(slots=True)
+class ProjectItem:
+    name: str
+    start_date: str
+    end_date: str
+    description: str
+    skills: tuple[str, ...]
+    link: str
+    currently_working: bool
+    start: Optional[int]
+    end: Optional[int]
+    # Dates given as a bare year: start/end hold January of it, which is not to be displayed
+    start_year_only: bool = False
+    end_year_only: bool = False
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "ProjectItem":
+        start_date, end_date = _text(item, "startDate").strip(), _text(item, "endDate").strip()
+        return cls(
+            name=_text(item, "name"),
+            start_date=start_date,
+            end_date=end_date,
+            description=_text(item, "description"),
+            skills=_text_list(item, "skills"),
+            link=_text(item, "link"),
+            currently_working=bool(item.get("currentlyWorking", False)),
+            start=parse_month(start_date),
+            end=parse_month(end_date),
+            start_year_only=is_year_only(start_date),
+            end_year_only=is_year_only(end_date)
+        )
+
+
+@dataclass(slots=True)
+class SkillItem:
+    category: str
+    technologies: tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "SkillItem":
+        return cls(category=_text(item, "category"), technologies=_text_list(item, "technologies"))
+
+
+@dataclass(slots=True)
+class CertificationItem:
+    title: str
+    issuer: str
+    date: str
+    link: str
+    issued: Optional[int]
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "CertificationItem":
+        cert_date = _text(item, "date")
+        return cls(
+            title=_text(item, "title"),
+            issuer=_text(item, "issuer"),
+            date=cert_date,
+            link=_text(item, "link"),
+            issued=parse_month(cert_date)
+        )
+
+
+@dataclass(slots=True)
+class AchievementItem:
+    title: str
+    description: str
+    date: str
+    achieved: Optional[int]
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "AchievementItem":
+        achievement_date = _text(item, "date")
+        return cls(
+            title=_text(item, "title"),
+            description=_text(item, "description"),
+            date=achievement_date,
+            achieved=parse_month(achievement_date)
+        )
+
+
+@dataclass(slots=True)
+class RefereeItem:
+    name: str
+    position: str
+    company: str
+    email: str
+    phone: str
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> "RefereeItem":
+        return cls(
+            name=_text(item, "name"),
+            position=_text(item, "position"),
+            company=_text(item, "company"),
+            email=_text(item, "email"),
+            phone=_text(item, "phone")
+        )
+
+
+# formData key -> (profile attribute, record type)
+_SECTIONS = {
+    "education": ("education", EducationItem),
+    "workExperience": ("work_experience", WorkItem),
+    "projects": ("projects", ProjectItem),
+    "skills": ("skills", SkillItem),
+    "certifications": ("certifications", CertificationItem),
+    "achievements": ("achievements", AchievementItem),
+    "referees": ("referees", RefereeItem),
+}
+
+
+@dataclass(slots=True)
+class CVProfile:
+    """Parse-once, typed view of FormData shared by the whole CV pipeline"""
+
+    personal: PersonalDetails = field(default_factory=PersonalDetails)
+    education: list[EducationItem] = field(default_factory=list)
+    work_experience: list[WorkItem] = field(default_factory=list)
+    projects: list[ProjectItem] = field(default_factory=list)
+    skills: list[SkillItem] = field(default_factory=list)
+    certifications: list[CertificationItem] = field(default_factory=list)
+    achievements: list[AchievementItem] = field(default_factory=list)
+    referees: list[RefereeItem] = field(default_factory=list)
+
+    @classmethod
+    def from_form_data(cls, form_data: Any) -> "CVProfile":
+        """Build the profile from a FormData model or a plain formData dict in a single pass"""
+        if isinstance(form_data, dict):
+            read = form_data.get
+        else:
+            read = lambda key: getattr(form_data, key, None)
+
+        profile = cls(personal=PersonalDetails.from_dict(read("personalDetails") or {}))
+
+        for key, (attribute, record_type) in _SECTIONS.items():
+            items = read(key) or []
+            if not isinstance(items, list):
+                raise ValueError(f"{key} must be a list")
+
+            records = getattr(profile, attribute)
+            for i, item in enumerate(items):
+                if not isinstance(item, dict):
+                    raise ValueError(f"{key} item {i + 1} must be a dictionary")
+                records.append(record_type.from_dict(item))
+
+        return profile
@@ -14,4 +14,16 @@ class FormData(BaseModel):
 
 class UserQuery(BaseModel):
     jobDescription: Optional[str] = None
-    formData: Optional[FormData] = None
\ No newline at end of file
+    formData: Optional[FormData] = None
+    # Résumé template id; the default template when not given
+    template: Optional[str] = None
+
+class BatchJob(BaseModel):
+    id: str
+    jobDescription: str
+
+
+class CVBatchQuery(BaseModel):
+    formData: Optional[FormData] = None
+    jobs: List[BatchJob] = []
+    template: Optional[str] = None
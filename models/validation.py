@@ -0,0 +1,145 @@
+import os
+from typing import Annotated, Any, Collection, List, Optional
+
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+from core.metrics import timed_stage
+from core.tracing import traced
+
+# Request schema for CV generation, compiled once into a pydantic-core validator.
+# TypedDicts validate without building model instances; keys that are not declared
+# here are not checked and pass through untouched.
+
+# A required field must be present and non-empty
+RequiredText = Annotated[str, Field(min_length=1)]
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+
+class PersonalDetailsSchema(TypedDict):
+    fullName: RequiredText
+    email: Annotated[str, Field(min_length=1, pattern=EMAIL_PATTERN)]
+
+
+class WorkExperienceSchema(TypedDict):
+    jobTitle: RequiredText
+    company: RequiredText
+
+
+class EducationSchema(TypedDict):
+    degree: RequiredText
+    institution: RequiredText
+
+
+class ProjectSchema(TypedDict):
+    name: RequiredText
+    skills: NotRequired[List[Any]]
+
+
+class SkillSchema(TypedDict):
+    category: RequiredText
+    technologies: NotRequired[List[Any]]
+
+
+class AchievementSchema(TypedDict):
+    title: RequiredText
+
+
+class CertificationSchema(TypedDict):
+    title: RequiredText
+    issuer: RequiredText
+
+
+class RefereeSchema(TypedDict):
+    name: RequiredText
+    position: RequiredText
+
+
+class FormDataSchema(TypedDict):
+    personalDetails: PersonalDetailsSchema
+    workExperience: List[WorkExperienceSchema]
+    education: List[EducationSchema]
+    projects: List[ProjectSchema]
+    skills: List[SkillSchema]
+    achievements: List[AchievementSchema]
+    certifications: List[CertificationSchema]
+    referees: List[RefereeSchema]
+
+
+class UserQuerySchema(TypedDict):
+    jobDescription: Annotated[str, Field(pattern=r'\S')]
+    formData: FormDataSchema
+
+
+_user_query_validator = TypeAdapter(UserQuerySchema)
+
+# Upper bound on the job descriptions of one batch generation request
+CV_BATCH_MAX_JOBS = int(os.getenv("CV_BATCH_MAX_JOBS", "30"))
+
+
+class BatchJobSchema(TypedDict):
+    id: RequiredText
+    jobDescription: Annotated[str, Field(pattern=r'\S')]
+
+
+class CVBatchQuerySchema(TypedDict):
+    formData: FormDataSchema
+    jobs: Annotated[List[BatchJobSchema], Field(min_length=1, max_length=CV_BATCH_MAX_JOBS)]
+
+
+_cv_batch_query_validator = TypeAdapter(CVBatchQuerySchema)
+
+
+def _error_list(e: ValidationError) -> list[dict[str, Any]]:
+    return [
+        {"loc": ".".join(str(part) for part in error["loc"]), "msg": error["msg"]}
+        for error in e.errors(include_url=False, include_context=False, include_input=False)
+    ]
+
+
+@traced("payload.validate")
+@timed_stage("validation")
+def validate_user_query(payload: Any) -> list[dict[str, Any]]:
+    """Validate a UserQuery (or the raw request dict) in one pass and return every error found"""
+    if not isinstance(payload, dict):
+        # Shallow views of the parsed models; the section dicts are validated in place
+        form_data = payload.formData
+        payload = {
+            "jobDescription": payload.jobDescription,
+            "formData": form_data.__dict__ if form_data is not None else None
+        }
+
+    try:
+        _user_query_validator.validate_python(payload)
+        return []
+    except ValidationError as e:
+        return _error_list(e)
+
+
+@traced("payload.validate_batch")
+@timed_stage("validation")
+def validate_cv_batch_query(payload: Any) -> list[dict[str, Any]]:
+    """Validate a CVBatchQuery: the shared form data once, then every job description"""
+    form_data = payload.formData
+    payload = {
+        "formData": form_data.__dict__ if form_data is not None else None,
+        "jobs": [job.__dict__ for job in payload.jobs]
+    }
+
+    try:
+        _cv_batch_query_validator.validate_python(payload)
+    except ValidationError as e:
+        return _error_list(e)
+
+    ids = [job["id"] for job in payload["jobs"]]
+    if len(set(ids)) != len(ids):
+        return [{"loc": "jobs", "msg": "Job ids must be unique"}]
+    return []
+
+
+def validate_template(template: Optional[str], available: Collection[str]) -> list[dict[str, Any]]:
+    """Check a requested résumé template id against the available ones; not giving one picks the default"""
+    if template is None or template in available:
+        return []
+    return [{"loc": "template", "msg": f"Unknown template, expected one of: {', '.join(sorted(available))}"}]
@@ -1,26 +1,29 @@
 # === app/services/cv_service.py ===
-from core.langgraph_pipeline import graph_executor
+import logging
 from models.user import UserQuery
 from db.repository import save_user_data
-from db.dynamodb import table
+from db.dynamodb import get_table
 
 #from app.db.repository import save_user_data
 
+logger = logging.getLogger(__name__)
+
 async def generate_cv_from_user(user_input: UserQuery, email):
     input_data = {"raw_input": user_input.dict(exclude_none=True)}
     try:
-        response = table.table_status  # Lazy call to check connectivity
-        print(f"DynamoDB table status: {response}")
+        response = get_table().table_status  # Lazy call to check connectivity
+        logger.debug("DynamoDB table status: %s", response)
     except Exception as db_check_error:
         return {"error": f"DynamoDB not reachable: {str(db_check_error)}"}
+    # LangGraph is only needed once a CV is actually generated
+    from core.langgraph_pipeline import run_cv_pipeline
     try:
-        # result = graph_executor.invoke(input_data)
-        result = {"message":"demo message","latex":"demo latex", "pdf path": "demo path","s3_url":"s3 url demo" }
+        result = await run_cv_pipeline(input_data["raw_input"])
         # email = user_input.other_bio_data.get("email", "anonymous")
         save_user_data(email, input_data)
         return {
             "message": result.get("message", "Success"),
-            "latex": result.get("latex"),
+            "typst_path": result.get("typst_path"),
             "pdf_path":result.get("pdf_path"),
             "s3_url": result.get("s3_url")
         }
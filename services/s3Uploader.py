@@ -1,9 +1,25 @@
+import logging
 from datetime import datetime
-from typing import Dict, Any
-import boto3
+from functools import lru_cache
+from typing import Dict, Any, Optional
 from botocore.exceptions import NoCredentialsError
 
-def upload_to_s3_agent(pdf_path : str) ->dict:
+from core.deadline import Deadline
+from core.metrics import track_stage
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_s3_client(region_name: str):
+    """Create the S3 client for a region once; boto3 clients are thread-safe and costly to build"""
+    import boto3
+
+    return boto3.client("s3", region_name=region_name)
+
+@traced("upload_to_s3_agent")
+def upload_to_s3_agent(pdf_path : str, deadline: Optional[Deadline] = None) ->dict:
     # pdf_path = state["pdf_path"]
     # email = state["ats_optimized_data"].get("email", "anonymous")
     # safe_email_hash = "demo"
@@ -12,24 +28,30 @@ def upload_to_s3_agent(pdf_path : str) ->dict:
     bucket_name = "cv-bucket-protfolio-app"
     region_name = "ap-southeast-1"
 
-    s3_client = boto3.client("s3", region_name=region_name)
+    s3_client = get_s3_client(region_name)
+
+    # Raised rather than returned: a skipped upload is not an upload error
+    if deadline is not None:
+        deadline.check("s3_upload")
 
     try:
         # Upload the file
-        s3_client.upload_file(pdf_path, bucket_name, s3_key)
-        print(f"File uploaded to s3://{bucket_name}/{s3_key} in region {region_name}")
+        with track_stage("s3_upload"):
+            s3_client.upload_file(pdf_path, bucket_name, s3_key)
+        logger.info("File uploaded to S3", extra={"s3_uri": f"s3://{bucket_name}/{s3_key}", "region": region_name})
 
         # Generate pre-signed URL with content headers
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': s3_key,
-                'ResponseContentType': 'application/pdf',
-                'ResponseContentDisposition': 'inline'
-            },
-            ExpiresIn=3600
-        )
+        with track_stage("s3_presign"):
+            presigned_url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': bucket_name,
+                    'Key': s3_key,
+                    'ResponseContentType': 'application/pdf',
+                    'ResponseContentDisposition': 'inline'
+                },
+                ExpiresIn=3600
+            )
         return {"s3_url": presigned_url}
     except FileNotFoundError:
         return {"error": f"Error: PDF file not found at {pdf_path}"}
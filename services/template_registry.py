@@ -0,0 +1,161 @@
+"""
+Résumé Template Registry
+Discovers the résumé templates under templates/resume (one directory per template id, each with a
+template.json manifest and a main.typ entry point), validates them by compiling the bundled sample
+data and resolves what each one compiles with, so picking a template per request is a dict lookup
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+import typst
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Templates import shared modules and the vendored basic-resume package by absolute path (/lib/...,
+# /vendor/...), so this is their Typst root and compiles never fetch from the package registry
+RESUME_TEMPLATES_ROOT = os.path.join(PROJECT_ROOT, "templates", "resume")
+RESUME_SAMPLE_DATA = os.path.join(RESUME_TEMPLATES_ROOT, "sample.json")
+DEFAULT_RESUME_TEMPLATE = os.getenv("DEFAULT_RESUME_TEMPLATE", "classic")
+
+MANIFEST_FILENAME = "template.json"
+ENTRY_FILENAME = "main.typ"
+
+
+class TemplateNotFound(KeyError):
+    """No valid template has the requested id"""
+
+
+@dataclass(frozen=True)
+class ResumeTemplate:
+    """A résumé template and everything resolved to compile it"""
+
+    id: str
+    name: str
+    version: int
+    description: str
+    entry: str
+    # TypstDocument style defaults: accent_color, font, paper
+    style: dict[str, str] = field(default_factory=dict)
+    font_paths: tuple[str, ...] = ()
+    # Embedded fonts plus the template's own are enough unless it opts in; scanning system fonts costs every compile
+    system_fonts: bool = False
+
+    def compile(self, data: str, output: Optional[str] = None) -> Optional[bytes]:
+        """Compile résumé data (TypstDocument JSON) with this template"""
+        return typst.compile(
+            input=self.entry,
+            output=output,
+            root=RESUME_TEMPLATES_ROOT,
+            font_paths=list(self.font_paths),
+            ignore_system_fonts=not self.system_fonts,
+            sys_inputs={"resume": data}
+        )
+
+    def describe(self) -> dict[str, Any]:
+        return {"id": self.id, "name": self.name, "version": self.version, "description": self.description}
+
+
+def load_template(directory: str) -> ResumeTemplate:
+    """Read a template's manifest and resolve its paths; raises ValueError on a malformed template"""
+    template_id = os.path.basename(directory)
+    entry = os.path.join(directory, ENTRY_FILENAME)
+    if not os.path.isfile(entry):
+        raise ValueError(f"Template {template_id} has no {ENTRY_FILENAME}")
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME), "rb") as f:
+            manifest = orjson.loads(f.read())
+        font_paths = tuple(os.path.join(directory, path) for path in manifest.get("fonts", []))
+        missing = [path for path in font_paths if not os.path.isdir(path)]
+        if missing:
+            raise ValueError(f"font directories not found: {', '.join(missing)}")
+        return ResumeTemplate(
+            id=template_id,
+            name=manifest["name"],
+            version=int(manifest["version"]),
+            description=manifest.get("description", ""),
+            entry=entry,
+            style=dict(manifest.get("style", {})),
+            font_paths=font_paths,
+            system_fonts=bool(manifest.get("system_fonts", False))
+        )
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid template {template_id}: {str(e)}")
+
+
+class TemplateRegistry:
+    """The résumé templates by id"""
+
+    def __init__(self, root: str = RESUME_TEMPLATES_ROOT, default: str = DEFAULT_RESUME_TEMPLATE):
+        self.root = root
+        self.default = default
+        self.templates: dict[str, ResumeTemplate] = {}
+        # id -> why the template was rejected
+        self.errors: dict[str, str] = {}
+        self.validated = False
+        self._discover()
+
+    def _discover(self) -> None:
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if not os.path.isfile(os.path.join(directory, MANIFEST_FILENAME)):
+                continue
+            try:
+                self.templates[name] = load_template(directory)
+            except ValueError as e:
+                self.errors[name] = str(e)
+                logger.error(str(e))
+        logger.info("Résumé templates discovered", extra={"templates": sorted(self.templates)})
+
+    def __contains__(self, template_id: str) -> bool:
+        return template_id in self.templates
+
+    def ids(self) -> list[str]:
+        return sorted(self.templates)
+
+    def get(self, template_id: Optional[str] = None) -> ResumeTemplate:
+        """The template with template_id, or the default one"""
+        try:
+            return self.templates[template_id or self.default]
+        except KeyError:
+            raise TemplateNotFound(f"Unknown résumé template: {template_id or self.default}")
+
+    def validate(self, sample_path: str = RESUME_SAMPLE_DATA) -> dict[str, str]:
+        """Compile the sample data with every template, dropping the ones that fail.
+
+        The compiles also leave each template's parsed modules in Typst's in-process cache, so the
+        first request for a template does not pay for them. A failing default template is logged but
+        kept: dropping it would fail every request, and the failure may be transient.
+        """
+        with open(sample_path, "rb") as f:
+            sample = orjson.loads(f.read())
+
+        for template_id, template in list(self.templates.items()):
+            data = orjson.dumps({**sample, "style": {**sample.get("style", {}), **template.style}}).decode()
+            try:
+                template.compile(data)
+            except Exception as e:
+                self.errors[template_id] = str(e)
+                if template_id == self.default:
+                    logger.error(f"Default résumé template {template_id} failed validation, keeping it: {str(e)}")
+                    continue
+                del self.templates[template_id]
+                logger.error(f"Résumé template {template_id} failed validation: {str(e)}")
+
+        self.validated = True
+        if self.default not in self.templates:
+            logger.error(f"Default résumé template {self.default} is unusable: "
+                         f"{self.errors.get(self.default, 'not found')}")
+        logger.info("Résumé templates validated", extra={"templates": self.ids(), "rejected": sorted(self.errors)})
+        return dict(self.errors)
+
+
+@lru_cache(maxsize=None)
+def get_template_registry() -> TemplateRegistry:
+    return TemplateRegistry()
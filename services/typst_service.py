@@ -1,74 +1,142 @@
+import asyncio
+import contextvars
+import copy
+import logging
 import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import typst
+from functools import lru_cache
+from typing import Optional
 from util.typst_util import TypstDocument
-from models.user import FormData
+from models.profile import CVProfile
+from core.deadline import Deadline
+from core.metrics import timed_stage
+from core.tracing import traced
+from services.template_registry import PROJECT_ROOT, get_template_registry
 
+logger = logging.getLogger(__name__)
+
+# Concurrent Typst compiles; each one is CPU-bound, so more workers than cores only adds queueing
+TYPST_COMPILE_WORKERS = int(os.getenv("TYPST_COMPILE_WORKERS", str(os.cpu_count() or 1)))
 
-# Generate the provided résumé
-def generate_resume_typst(overview: str, form_data: FormData, output_filename: str):
-    personal_details: dict = form_data.personalDetails
+
+# Render every section that does not depend on the job: all of them except the overview
+def render_resume_document(profile: CVProfile, template: Optional[str] = None) -> TypstDocument:
+    personal_details = profile.personal
+    resume_template = get_template_registry().get(template)
 
     # Initialize the document with personal information
     doc = TypstDocument(
-        full_name=personal_details.get("fullName"),
-        address=personal_details.get("address"),
-        email=personal_details.get("email"),
-        github=personal_details.get("gitHub"),
-        linkedin=personal_details.get("linkedIn"),
-        phone=personal_details.get("phone"),
-        portfolio=personal_details.get("portfolio")
+        full_name=personal_details.full_name,
+        address=personal_details.address,
+        email=personal_details.email,
+        github=personal_details.github,
+        linkedin=personal_details.linkedin,
+        phone=personal_details.phone,
+        portfolio=personal_details.portfolio,
+        **resume_template.style
     )
 
     # Add sections
     doc.add_header_section()
-    doc.add_overview_section(overview_content=overview)
-    doc.add_education_section(education_list=form_data.education)
-    doc.add_work_experience_section(work_experience_list=form_data.workExperience)
-    doc.add_project_section(projects_list=form_data.projects)
-    doc.add_skills_section(skills_list=form_data.skills)
-    doc.add_achievements_section(achievements_list=form_data.achievements)
-    doc.add_certifications_section(certifications_list=form_data.certifications)
-    doc.add_references_section(references_list=form_data.referees)
-
-    # Save Typst source to the file
-    doc.save_to_file(output_filename)
-    print(f"Typst resume generated successfully! Saved to {output_filename}")
-
-
-
-# Compile a .typ file into a .pdf
-def compile_typst_to_pdf(typst_filename: str, pdf_filename: str):
-    typst.compile(
-        input=typst_filename,
-        output=pdf_filename
-    )
-    print(f"PDF resume generated successfully! Saved to {pdf_filename}")
-    #return pdf_filename
+    doc.add_education_section(education_list=profile.education)
+    doc.add_work_experience_section(work_experience_list=profile.work_experience)
+    doc.add_project_section(projects_list=profile.projects)
+    doc.add_skills_section(skills_list=profile.skills)
+    doc.add_achievements_section(achievements_list=profile.achievements)
+    doc.add_certifications_section(certifications_list=profile.certifications)
+    doc.add_references_section(references_list=profile.referees)
+    return doc
 
 
-# Entry point for generating and compiling from a JSON payload
-def generate_resume(workflow_context:dict ,overview: str, form_data: FormData):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+# Save a rendered document with the overview in its place after the header
+def save_resume_typst(document: TypstDocument, overview: str, output_filename: str):
+    resume = copy.copy(document)
+    resume.sections = document.sections[:1]
+    resume.add_overview_section(overview_content=overview)
+    resume.sections.extend(document.sections[1:])
 
-    # Get the absolute path to the project root
-    project_root = os.path.dirname(os.path.abspath(__file__))  # services/
-    project_root = os.path.abspath(os.path.join(project_root, ".."))  # move to project_root/
+    # Save the template data to the file
+    resume.save_to_file(output_filename)
+    logger.info("Typst resume data generated", extra={"path": output_filename})
 
-    # Absolute filepaths
-    typst_output_filename = os.path.join(project_root, "cv", "typ", f"cv_{timestamp}.typ")
-    pdf_output_filename = os.path.join(project_root, "cv", "pdf", f"cv_{timestamp}.pdf")
-    workflow_context["cv_path"] =pdf_output_filename
+
+# Generate the provided résumé
+@traced("generate_resume_typst")
+@timed_stage("typst_source")
+def generate_resume_typst(overview: str, profile: CVProfile, output_filename: str, template: Optional[str] = None):
+    save_resume_typst(render_resume_document(profile, template), overview, output_filename)
+
+
+
+# Compile a résumé's data file into a .pdf with a résumé template (the default one if not given)
+@traced("compile_typst_to_pdf")
+@timed_stage("typst_compile")
+def compile_typst_to_pdf(data_filename: str, pdf_filename: str, template: Optional[str] = None):
+    resume_template = get_template_registry().get(template)
+    with open(data_filename, encoding="utf-8") as f:
+        data = f.read()
+    resume_template.compile(data, pdf_filename)
+    logger.info("PDF resume generated", extra={
+        "path": pdf_filename, "template": resume_template.id, "template_version": resume_template.version
+    })
+
+
+@lru_cache(maxsize=None)
+def get_compile_pool() -> ThreadPoolExecutor:
+    """Shared pool for Typst compiles; typst releases the GIL, so threads compile in parallel"""
+    return ThreadPoolExecutor(max_workers=TYPST_COMPILE_WORKERS, thread_name_prefix="typst-compile")
+
+
+async def compile_typst_to_pdf_async(data_filename: str, pdf_filename: str, template: Optional[str] = None):
+    """Compile in the shared pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    # Carry the request's log and trace context into the pool thread
+    context = contextvars.copy_context()
+    await loop.run_in_executor(get_compile_pool(), context.run, compile_typst_to_pdf,
+                               data_filename, pdf_filename, template)
+
+
+async def prepare_resume_templates() -> dict[str, str]:
+    """Validate the résumé templates in the compile pool, which also warms it for their first requests"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_compile_pool(), get_template_registry().validate)
+
+
+def resume_output_paths(name: str) -> tuple[str, str]:
+    """Absolute template data (.json) and .pdf paths for a résumé, creating their directories"""
+    data_output_filename = os.path.join(PROJECT_ROOT, "cv", "data", f"{name}.json")
+    pdf_output_filename = os.path.join(PROJECT_ROOT, "cv", "pdf", f"{name}.pdf")
     # Ensure directories exist
-    os.makedirs(os.path.dirname(typst_output_filename), exist_ok=True)
+    os.makedirs(os.path.dirname(data_output_filename), exist_ok=True)
     os.makedirs(os.path.dirname(pdf_output_filename), exist_ok=True)
+    return data_output_filename, pdf_output_filename
+
+
+# Entry point for generating and compiling from a JSON payload
+def generate_resume(workflow_context:dict ,overview: str, profile: CVProfile, deadline: Optional[Deadline] = None,
+                    template: Optional[str] = None):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Absolute filepaths; workflows run concurrently, so the timestamp alone is not unique. The PDF
+    # path is also the S3 key, and a clash would hand one user another user's CV
+    data_output_filename, pdf_output_filename = resume_output_paths(f"cv_{timestamp}_{uuid.uuid4().hex}")
+    workflow_context["cv_path"] =pdf_output_filename
+    # The Typst input of this CV: its data for the résumé template
+    workflow_context["typst_path"] = data_output_filename
 
-    # Generate and compile
+    # Generate and compile; a compile cannot be interrupted, so the deadline is checked before each step
+    if deadline is not None:
+        deadline.check("typst_source")
     generate_resume_typst(
         overview=overview,
-        form_data=form_data,
-        output_filename=typst_output_filename
+        profile=profile,
+        output_filename=data_output_filename,
+        template=template
     )
-    compile_typst_to_pdf(typst_output_filename, pdf_output_filename)
+    if deadline is not None:
+        deadline.check("typst_compile")
+    compile_typst_to_pdf(data_output_filename, pdf_output_filename, template)
 
     return pdf_output_filename
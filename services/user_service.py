@@ -1,13 +1,16 @@
+import asyncio
 from datetime import datetime
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
 from fastapi import status
-from boto3.dynamodb.conditions import Key
-from db.dynamodb import table
+from db.dynamodb import get_table
 from db.repository import get_user_data
 from models.user import UserQuery
+from core.metrics import track_stage
+from core.tracing import traced
 
 
+@traced("user_query_save")
 async def user_query_save(payload,email):
     now = datetime.utcnow().isoformat()
     raw_input = payload.dict(exclude_none=True)
@@ -17,9 +20,10 @@ async def user_query_save(payload,email):
         "created_at": now,             # sort key
         "raw_input": raw_input,
     }
-    # Checked up to this point
+    # Checked up to this point; boto3 blocks, so the put runs off the event loop
     try:
-        table.put_item(Item=item)
+        with track_stage("dynamodb_put"):
+            await asyncio.to_thread(get_table().put_item, Item=item)
     except ClientError as e:
         raise HTTPException(
             status_code=500,
@@ -53,13 +57,14 @@ async def update_latest_raw_input(payload: UserQuery) -> dict:
     email = payload.formData.personalDetails['email']
     raw_input = payload.dict(exclude_none=True)
     now = datetime.utcnow().isoformat()
-    resp = table.update_item(
-        Key={"email": email},
-        UpdateExpression="SET raw_input = :ri, created_at = :ca",
-        ExpressionAttributeValues={
-            ":ri": raw_input,
-            ":ca": now
-        },
-        ReturnValues="UPDATED_NEW"
-    )
+    with track_stage("dynamodb_update"):
+        resp = get_table().update_item(
+            Key={"email": email},
+            UpdateExpression="SET raw_input = :ri, created_at = :ca",
+            ExpressionAttributeValues={
+                ":ri": raw_input,
+                ":ca": now
+            },
+            ReturnValues="UPDATED_NEW"
+        )
     return resp.get("Attributes", {})
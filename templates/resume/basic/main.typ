@@ -0,0 +1,27 @@
+// Basic: the basic-resume package's own left-aligned header with a single line of contact details
+// The résumé data arrives as JSON in sys.inputs.resume
+#import "/vendor/basic-resume/0.2.8/lib.typ": *
+#import "/lib/sections.typ": render-sections
+
+#let data = json(bytes(sys.inputs.resume))
+#let person = data.personal
+
+// The package adds the scheme to these itself
+#let bare(url) = url.replace(regex("^https?://"), "")
+
+#show: resume.with(
+  author: person.full_name,
+  location: person.address,
+  email: person.email,
+  github: bare(person.github),
+  linkedin: bare(person.linkedin),
+  phone: person.phone,
+  personal-site: bare(person.portfolio),
+  accent-color: data.style.accent_color,
+  font: data.style.font,
+  paper: data.style.paper,
+  author-position: left,
+  personal-info-position: left,
+)
+
+#render-sections(data)
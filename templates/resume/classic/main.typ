@@ -0,0 +1,31 @@
+// Classic: centred name over a three-column contact grid
+// The résumé data arrives as JSON in sys.inputs.resume
+#import "/vendor/basic-resume/0.2.8/lib.typ": *
+#import "/lib/sections.typ": markup, render-sections
+
+#let data = json(bytes(sys.inputs.resume))
+#let person = data.personal
+
+#show: resume.with(
+  author: person.full_name,
+  author-position: center,
+  accent-color: data.style.accent_color,
+  font: data.style.font,
+  paper: data.style.paper,
+)
+
+#render-sections(data, header: grid(
+  columns: (1fr, 1fr, 1fr),
+  align(center)[
+    phone: #link("tel:" + person.phone) \
+    address: #markup(person.address)
+  ],
+  align(center)[
+    #link("mailto:" + person.email) \
+    #link(person.portfolio)
+  ],
+  align(center)[
+    #link(person.github)[GitHub] \
+    #link(person.linkedin)[LinkedIn]
+  ],
+))
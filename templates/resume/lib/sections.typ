@@ -0,0 +1,138 @@
+// Résumé sections shared by the templates
+// Renders the data built by util.typst_util.TypstDocument; each template supplies the page setup and header.
+
+#import "/vendor/basic-resume/0.2.8/lib.typ": *
+
+// Profile text may use Typst markup (bold, lists), so it is evaluated rather than shown verbatim
+#let markup(text) = eval(text, mode: "markup")
+
+#let period(dates) = dates-helper(start-date: dates.start, end-date: dates.end)
+
+#let described(description) = if description != "" [
+- #markup(description)
+]
+
+#let overview(data, section) = [
+== Overview
+
+#markup(section.text)
+]
+
+#let education(data, section) = [
+== Education
+
+#for item in section.items [
+#edu(
+  institution: item.institution,
+  location: "",
+  dates: period(item.dates),
+  degree: item.degree,
+)
+#described(item.description)
+]
+]
+
+#let work-experience(data, section) = [
+== Work Experience
+
+#for item in section.items [
+#work(
+  title: item.title,
+  location: item.location,
+  company: item.company,
+  dates: period(item.dates),
+)
+#described(item.description)
+]
+]
+
+#let projects(data, section) = [
+== Projects
+
+#for item in section.items [
+#link(item.link)[🔗]
+#project(
+  name: item.name,
+  dates: period(item.dates),
+)
+#if item.description != "" and item.skills != "" [
+- #markup(item.description)
+  - *Skills*: #markup(item.skills)
+] else if item.description != "" [
+- #markup(item.description)
+] else if item.skills != "" [
+- *Skills*: #markup(item.skills)
+]
+]
+]
+
+#let skills(data, section) = [
+== Skills
+
+#for item in section.items [
+- *#markup(item.category)*: #markup(item.technologies)
+]
+]
+
+#let achievements(data, section) = [
+== Achievements
+
+#for item in section.items [
+#certificates(
+  name: item.title,
+  date: item.date,
+)
+#described(item.description)
+]
+]
+
+#let certifications(data, section) = [
+== Certifications
+
+#for item in section.items [
+#link(item.link)[🔗]
+#certificates(
+  name: item.title,
+  issuer: item.issuer,
+  date: item.date,
+)
+]
+]
+
+#let references(data, section) = [
+== References
+
+#grid(
+  columns: section.items.map(_ => 1fr),
+  ..section.items.map(item => align(left)[
+    *#markup(item.name)* \
+    _#markup(item.position)_, \
+    _#markup(item.company)_ \
+    email: #link("mailto:" + item.email) \
+    phone: #link("tel:" + item.phone) \
+  ])
+)
+]
+
+#let renderers = (
+  overview: overview,
+  education: education,
+  work_experience: work-experience,
+  projects: projects,
+  skills: skills,
+  achievements: achievements,
+  certifications: certifications,
+  references: references,
+)
+
+// The document body in section order; the header section is the template's own header, none to omit it
+#let render-sections(data, header: none) = {
+  data.sections
+    .map(section => if section.kind == "header" { header } else { (renderers.at(section.kind))(data, section) })
+    .filter(body => body != none)
+    .join[
+
+    #linebreak()
+
+    ]
+}
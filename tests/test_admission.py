@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(max_concurrent=1, max_per_user=1, max_queued=10, max_queued_per_user=5, queue_timeout=5.0)
+    options.update(overrides)
+    return AdmissionController("test", **options)
+
+
+def test_queued_users_are_served_round_robin():
+    async def scenario():
+        controller = _controller()
+        holder = await controller.acquire("holder")
+        order = []
+
+        async def request(user):
+            permit = await controller.acquire(user)
+            order.append(user)
+            permit.release()
+
+        # alice queues three requests before bob and carol queue one each
+        tasks = [asyncio.create_task(request(user)) for user in ("alice", "alice", "alice", "bob", "carol")]
+        await asyncio.sleep(0)
+        holder.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["alice", "bob", "carol", "alice", "alice"]
+
+
+def test_user_over_their_queue_share_gets_429():
+    async def scenario():
+        controller = _controller(max_queued_per_user=1)
+        holder = await controller.acquire("alice")
+        waiter = asyncio.create_task(controller.acquire("alice"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("alice")
+        holder.release()
+        (await waiter).release()
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.reason == "user_queue_full"
+    assert rejected.retry_after >= 1
+
+
+def test_full_queue_gets_503():
+    async def scenario():
+        controller = _controller(max_queued=1)
+        holder = await controller.acquire("alice")
+        waiter = asyncio.create_task(controller.acquire("bob"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("carol")
+        holder.release()
+        (await waiter).release()
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.reason == "queue_full"
+
+
+def test_queue_timeout_leaves_the_queue():
+    async def scenario():
+        controller = _controller(queue_timeout=0.01)
+        holder = await controller.acquire("alice")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("bob")
+        assert controller.queued == 0
+        holder.release()
+        assert controller.running == 0
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert rejected.reason == "queue_timeout"
+
+
+def test_abandoned_waiter_hands_its_slot_back():
+    async def scenario():
+        controller = _controller()
+        holder = await controller.acquire("alice")
+        abandoned = asyncio.create_task(controller.acquire("bob"))
+        waiting = asyncio.create_task(controller.acquire("carol"))
+        await asyncio.sleep(0)
+        # The slot goes to bob, whose client disconnects before bob's task runs again
+        holder.release()
+        abandoned.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await abandoned
+        permit = await asyncio.wait_for(waiting, 1)
+        assert (permit.user, controller.running, controller.queued) == ("carol", 1, 0)
+        permit.release()
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.running == 0
+    assert controller.queued == 0
+
+
+def test_release_is_idempotent():
+    async def scenario():
+        controller = _controller()
+        permit = await controller.acquire("alice")
+        permit.release()
+        permit.release()
+        return controller
+
+    assert asyncio.run(scenario()).running == 0
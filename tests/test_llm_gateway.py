@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from unittest import mock
+
+import pytest
+
+from benchmarks.fakes import FAKE_OVERVIEW, FakeLLMProvider, FakeProviderError
+from core.deadline import Deadline, RequestCancelled, use_deadline
+from core.llm_gateway import LLMGateway, TokenBucket
+
+
+def _gateway(provider: FakeLLMProvider, **overrides) -> LLMGateway:
+    options = dict(requests_per_minute=60_000, burst=100, max_in_flight=8, max_retries=3, base_delay=0.1,
+                   max_delay=0.3)
+    options.update(overrides)
+    return LLMGateway(provider, **options)
+
+
+def test_token_bucket_queues_callers_past_the_burst():
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_gateway_spaces_calls_to_the_quota():
+    provider = FakeLLMProvider()
+    gateway = _gateway(provider, requests_per_minute=1200, burst=2)
+    start = time.perf_counter()
+    for i in range(6):
+        gateway.generate(f"prompt {i}")
+    # Two calls ride the burst, the other four wait 1/20s each
+    assert time.perf_counter() - start >= 0.18
+    assert provider.calls == 6
+
+
+def test_retries_a_503_with_full_jitter():
+    provider = FakeLLMProvider(error_rate=1.0)
+    gateway = _gateway(provider)
+    delays = []
+
+    def sleep(seconds):
+        delays.append(seconds)
+        provider.error_rate = 0.0
+
+    with mock.patch("core.llm_gateway.random.uniform", side_effect=lambda low, high: high) as uniform, \
+            mock.patch("core.llm_gateway.time.sleep", side_effect=sleep):
+        response = gateway.generate("prompt")
+
+    assert response.text == FAKE_OVERVIEW
+    assert provider.calls == 2
+    uniform.assert_called_once_with(0, 0.1)
+    assert delays == [0.1]
+
+
+def test_gives_up_on_429_after_max_retries():
+    # No quota at all: every attempt is answered with 429
+    provider = FakeLLMProvider(quota_per_second=0)
+    gateway = _gateway(provider)
+
+    with mock.patch("core.llm_gateway.random.uniform", side_effect=lambda low, high: high) as uniform, \
+            mock.patch("core.llm_gateway.time.sleep"):
+        with pytest.raises(FakeProviderError) as error:
+            gateway.generate("prompt")
+
+    assert error.value.status_code == 429
+    assert provider.calls == 4
+    # Exponential backoff bounds, capped at max_delay
+    assert [call.args for call in uniform.call_args_list] == [(0, 0.1), (0, 0.2), (0, 0.3)]
+
+
+def test_does_not_retry_client_errors():
+    gateway = _gateway(FakeLLMProvider())
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise FakeProviderError(400, "Invalid argument")
+
+    with pytest.raises(FakeProviderError):
+        gateway.call(bad_request)
+    assert len(attempts) == 1
+
+
+def test_identical_requests_share_one_call():
+    provider = FakeLLMProvider(latency=0.05)
+    gateway = _gateway(provider)
+
+    async def scenario():
+        return await asyncio.gather(*[gateway.agenerate("same prompt") for _ in range(5)],
+                                    gateway.agenerate("other prompt"))
+
+    responses = asyncio.run(scenario())
+    assert provider.calls == 2
+    assert all(response is responses[0] for response in responses[:5])
+    assert gateway._in_flight == {}
+
+
+def test_follower_takes_over_when_the_leader_is_cancelled():
+    provider = FakeLLMProvider(latency=0.05)
+    gateway = _gateway(provider)
+
+    async def scenario():
+        leader = asyncio.create_task(gateway.agenerate("prompt"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(gateway.agenerate("prompt"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(follower, 1)
+
+    response = asyncio.run(scenario())
+    assert response.text == FAKE_OVERVIEW
+    assert provider.calls == 2
+    assert gateway._in_flight == {}
+
+
+def test_follower_stops_waiting_at_its_deadline():
+    provider = FakeLLMProvider(latency=0.5)
+    gateway = _gateway(provider)
+    leader = threading.Thread(target=gateway.generate, args=("prompt",))
+    leader.start()
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    with use_deadline(Deadline(0.1)), pytest.raises(RequestCancelled) as cancelled:
+        gateway.generate("prompt")
+    waited = time.perf_counter() - start
+    leader.join()
+
+    assert cancelled.value.reason == "deadline_exceeded"
+    assert waited < 0.3
+    assert provider.calls == 1
+
+
+def test_async_callers_wait_for_a_free_slot():
+    provider = FakeLLMProvider(latency=0.02)
+    gateway = _gateway(provider, max_in_flight=2)
+
+    async def scenario():
+        calls = [asyncio.create_task(gateway.agenerate(f"prompt {i}")) for i in range(10)]
+        await asyncio.sleep(0.01)
+        # A caller that gives up while queued does not take a slot with it
+        calls[5].cancel()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    start = time.perf_counter()
+    results = asyncio.run(scenario())
+    assert sum(isinstance(result, asyncio.CancelledError) for result in results) == 1
+    assert provider.calls == 9
+    # Nine calls, two at a time
+    assert time.perf_counter() - start >= 0.09
+    assert gateway._slot_waiters == deque()
+    assert gateway._slots.acquire(blocking=False) and gateway._slots.acquire(blocking=False)
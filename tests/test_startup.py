@@ -0,0 +1,24 @@
+import json
+
+from benchmarks.startup_benchmark import run_probe
+
+# Generous next to the ~1s budget the startup benchmark gates on, so a loaded CI machine does not flake
+STARTUP_BUDGET_MS = 5000
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ("crewai", "litellm", "google.generativeai", "boto3", "PyPDF2")
+
+
+def _probe() -> dict:
+    return json.loads(run_probe().stdout.strip().splitlines()[-1])
+
+
+def test_import_main_leaves_heavy_dependencies_unloaded():
+    modules = set(_probe()["modules"])
+    assert [name for name in LAZY_MODULES if name in modules] == []
+
+
+def test_import_main_is_within_budget():
+    # The first interpreter warms the bytecode cache
+    run_probe()
+    assert _probe()["ms"] < STARTUP_BUDGET_MS
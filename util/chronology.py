@@ -0,0 +1,22 @@
+from typing import Optional
+
+# Chronology keys pack (active flag, end month, start month) into one int so sorting
+# compares plain ints instead of tuples. Month ordinals are shifted by one so that a
+# missing month (slot 0) sorts below every real month.
+_MONTH_BITS = 20
+_MONTH_MASK = (1 << _MONTH_BITS) - 1
+
+
+def chronology_key(active: bool, end: Optional[int], start: Optional[int]) -> int:
+    """Sort key: active entries first, then by end month (or start month if there is none), then by start month"""
+    if end is None:
+        end = start
+    end_slot = 0 if end is None else end + 1
+    start_slot = 0 if start is None else start + 1
+    return (int(active) << (2 * _MONTH_BITS)) | (end_slot << _MONTH_BITS) | (start_slot & _MONTH_MASK)
+
+
+def reverse_chronological_order(keys: list[int]) -> list[int]:
+    """Return the index permutation that puts the most recent entries first, keeping ties in input order"""
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
+
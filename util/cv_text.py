@@ -0,0 +1,66 @@
+from typing import Any
+
+
+# Section headings in the order TypstDocument emits them, so the structured
+# text sees the same section names as the text extracted from the compiled PDF
+SECTION_HEADINGS = [
+    ("education", "Education"),
+    ("workExperience", "Work Experience"),
+    ("projects", "Projects"),
+    ("skills", "Skills"),
+    ("achievements", "Achievements"),
+    ("certifications", "Certifications"),
+    ("referees", "References"),
+]
+
+# Fields rendered into the document for each section
+SECTION_FIELDS = {
+    "education": ["degree", "fieldOfStudy", "institution", "startDate", "endDate", "description"],
+    "workExperience": ["jobTitle", "company", "location", "startDate", "endDate", "description"],
+    "projects": ["name", "startDate", "endDate", "description"],
+    "skills": ["category"],
+    "achievements": ["title", "date", "description"],
+    "certifications": ["title", "issuer", "date"],
+    "referees": ["name", "position", "company", "email", "phone"],
+}
+
+PERSONAL_FIELDS = ["fullName", "phone", "address", "email", "portfolio"]
+
+
+def _section(form_data: Any, key: str) -> Any:
+    """Read a section from either a FormData model or a plain dict"""
+    if isinstance(form_data, dict):
+        return form_data.get(key)
+    return getattr(form_data, key, None)
+
+
+def form_data_to_text(overview: str, form_data: Any) -> str:
+    """Build the plain text a rendered CV would contain, without compiling it"""
+    lines: list[str] = []
+
+    personal_details = _section(form_data, "personalDetails") or {}
+    lines.extend(str(personal_details[field]) for field in PERSONAL_FIELDS if personal_details.get(field))
+    if personal_details.get("gitHub"):
+        lines.append("GitHub")
+    if personal_details.get("linkedIn"):
+        lines.append("LinkedIn")
+
+    if overview and overview.strip():
+        lines.append("Overview")
+        lines.append(overview.strip())
+
+    for key, heading in SECTION_HEADINGS:
+        items = _section(form_data, key)
+        if not items:
+            continue
+
+        lines.append(heading)
+        for item in items:
+            lines.extend(str(item[field]) for field in SECTION_FIELDS[key] if item.get(field))
+
+            if key == "projects" and item.get("skills"):
+                lines.append("Skills: " + ", ".join(skill for skill in item["skills"] if skill))
+            elif key == "skills" and item.get("technologies"):
+                lines.append(", ".join(tech for tech in item["technologies"] if tech))
+
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+import re
+
+from core.metrics import register_cache
+
+# Dates are handled as month ordinals: year * 12 + (month - 1). They compare, sort and
+# subtract as plain ints, and a month difference is just `end - start`.
+
+MONTH_ABBREVIATIONS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June", "July", "August",
+               "September", "October", "November", "December")
+
+# Lowercased month names, abbreviations and the 4-letter "Sept" -> month number
+_MONTH_LOOKUP = {
+    **{name.lower(): i + 1 for i, name in enumerate(MONTH_NAMES)},
+    **{name.lower(): i + 1 for i, name in enumerate(MONTH_ABBREVIATIONS)},
+    "sept": 9,
+}
+
+# "YYYY" alone: the month is unknown, so parse_month's January is a placeholder
+_YEAR_PATTERN = re.compile(r"^\d{4}$")
+# "YYYY", "YYYY-MM", "YYYY-MM-DD"
+_NUMERIC_DATE_PATTERN = re.compile(r"^(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?$")
+# "Mon YYYY", "Month YYYY", "Mon. YYYY"
+_NAMED_DATE_PATTERN = re.compile(r"^([A-Za-z]+)\.?\s+(\d{4})$")
+
+
+def month_ordinal(year: int, month: int) -> int:
+    """Return the month ordinal of a year and 1-based month"""
+    return year * 12 + month - 1
+
+
+@lru_cache(maxsize=4096)
+def parse_month(value: str) -> Optional[int]:
+    """Parse 'YYYY-MM', 'YYYY-MM-DD', 'YYYY' or 'Mon YYYY' into a month ordinal, None if unparseable"""
+    if not value:
+        return None
+    value = value.strip()
+
+    match = _NUMERIC_DATE_PATTERN.match(value)
+    if match:
+        year, month, day = match.groups()
+        month = int(month) if month else 1
+        if not 1 <= month <= 12 or (day and not 1 <= int(day) <= 31):
+            return None
+        return month_ordinal(int(year), month)
+
+    match = _NAMED_DATE_PATTERN.match(value)
+    if match:
+        month = _MONTH_LOOKUP.get(match.group(1).lower())
+        return month_ordinal(int(match.group(2)), month) if month else None
+
+    return None
+
+
+def is_year_only(value: str) -> bool:
+    """Whether a date gives only the year, so it should be shown without a month"""
+    return bool(value) and _YEAR_PATTERN.match(value.strip()) is not None
+
+
+register_cache("month_parse", lambda: parse_month.cache_info()._asdict())
+
+
+def current_month() -> int:
+    """Return the month ordinal of today"""
+    today = date.today()
+    return month_ordinal(today.year, today.month)
+
+
+def month_year(ordinal: int) -> int:
+    """Return the calendar year of a month ordinal"""
+    return ordinal // 12
+
+
+def format_month(ordinal: int, year_only: bool = False) -> str:
+    """Format a month ordinal as 'Mon YYYY', or 'YYYY' for a date that only gave the year"""
+    if year_only:
+        return str(ordinal // 12)
+    return f"{MONTH_ABBREVIATIONS[ordinal % 12]} {ordinal // 12}"
@@ -0,0 +1,87 @@
+import re
+from typing import Any, Optional
+
+import orjson
+
+from core.metrics import LLM_JSON_PARSES
+
+# Only these characters change the scanner's state, so the scan jumps between them in C
+# instead of stepping through the model output one character at a time
+_STRUCTURAL = re.compile(r'["\\{}\[\]]')
+_VALUE_START = re.compile(r'[{\[]')
+
+
+def find_json_span(text: str, start: Optional[int] = None) -> Optional[tuple[int, int, bool]]:
+    """Locate the first JSON object or array in text in one scan: (start, end, balanced)"""
+    if start is None:
+        first = _VALUE_START.search(text)
+        if first is None:
+            return None
+        start = first.start()
+
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _STRUCTURAL.finditer(text, start):
+        i = match.start()
+        char = text[i]
+        if in_string:
+            if i == escaped_at:
+                continue
+            if char == "\\":
+                escaped_at = i + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return start, i + 1, True
+
+    # Truncated output: hand everything from the opening bracket to the repair pass
+    return start, len(text), False
+
+
+def extract_json(text: str) -> Any:
+    """Parse the first JSON value in LLM output, repairing common defects only when a strict parse fails"""
+    first = _VALUE_START.search(text)
+    if first is None:
+        raise ValueError("No JSON object or array found in model output")
+
+    # JSON-mode answers are the bare value: parse them without scanning
+    bare = first.start() == 0 or text[:first.start()].isspace()
+    if bare:
+        try:
+            value = orjson.loads(text)
+            LLM_JSON_PARSES.inc(outcome="strict")
+            return value
+        except orjson.JSONDecodeError:
+            pass
+
+    start, end, balanced = find_json_span(text, first.start())
+    candidate = text if start == 0 and end == len(text) else text[start:end]
+    if balanced and not (bare and end == len(text.rstrip())):
+        try:
+            value = orjson.loads(candidate)
+            LLM_JSON_PARSES.inc(outcome="strict")
+            return value
+        except orjson.JSONDecodeError:
+            pass
+
+    # Single quotes, trailing commas, comments, unterminated strings and brackets
+    from json_repair import repair_json
+
+    try:
+        value = repair_json(candidate, return_objects=True, skip_json_loads=True)
+    except Exception as e:
+        LLM_JSON_PARSES.inc(outcome="failed")
+        raise ValueError(f"Failed to repair JSON from model output: {str(e)}")
+    if not isinstance(value, (dict, list)) or (not value and len(candidate) > 2):
+        LLM_JSON_PARSES.inc(outcome="failed")
+        raise ValueError("Failed to repair JSON from model output")
+
+    LLM_JSON_PARSES.inc(outcome="repaired")
+    return value
@@ -5,6 +5,8 @@ Defines all specialized agents for the CV automation workflow
 
 from crewai import Agent, LLM
 
+from core.logging_config import CREW_VERBOSE
+
 from .tools import ContentAnalyzer, ContentReorderer, DateSorter, CVGenerator, ATSScorer
 
 
@@ -28,7 +30,7 @@ class CVAutomationAgents:
             and HR. You excel at understanding job requirements and identifying how candidate profiles 
             can be best positioned to match those requirements. You have a keen eye for detail and 
             understand what recruiters and ATS systems look for in resumes.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm,
             tools=[self.content_analyzer]
@@ -43,7 +45,7 @@ class CVAutomationAgents:
             personal statements and overview sections. You know how to distill a candidate's experience 
             and skills into a powerful narrative that captures attention and demonstrates value. You 
             understand the psychology of hiring managers and how to make candidates stand out.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm
         )
@@ -57,7 +59,7 @@ class CVAutomationAgents:
             a deep understanding of how to prioritize and arrange information to maximize impact. You 
             know that the order of information can make or break a resume's effectiveness, and you're 
             skilled at identifying which experiences and skills are most relevant for specific roles.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm,
             tools=[self.content_reorderer]
@@ -72,7 +74,7 @@ class CVAutomationAgents:
             of professional and educational history. You understand the importance of presenting career 
             progression in a clear, logical manner that tells a coherent story. You're detail-oriented 
             and ensure that dates are properly formatted and sequenced.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm,
             tools=[self.date_sorter]
@@ -87,7 +89,7 @@ class CVAutomationAgents:
             appealing and professional documents. You understand the importance of clean, readable 
             formatting and know how to present information in a way that's both attractive and 
             ATS-friendly. You're skilled with various document generation tools and ensure high-quality output.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm,
             tools=[self.cv_generator]
@@ -102,7 +104,7 @@ class CVAutomationAgents:
             System) optimization. You have deep knowledge of how ATS systems parse and score resumes, 
             and you understand what makes a resume both human-readable and machine-friendly. You're 
             analytical and provide actionable feedback for improvement.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm,
             tools=[self.ats_scorer]
@@ -117,7 +119,7 @@ class CVAutomationAgents:
             data and developing improvement strategies. You understand how to interpret ATS scores and 
             feedback to make targeted improvements. You're systematic in your approach and focus on 
             high-impact changes that will significantly boost resume performance.""",
-            verbose=True,
+            verbose=CREW_VERBOSE,
             allow_delegation=False,
             llm=self.llm
         )
\ No newline at end of file
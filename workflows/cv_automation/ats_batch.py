@@ -0,0 +1,127 @@
+"""
+Batch ATS Scoring
+Scores many CVs against many job descriptions with one vectorised pass over the cross product
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+
+from .ats_features import TECH_KEYWORDS, extract_features, calculate_format_score, calculate_content_score
+from .jd_analysis import get_job_analysis
+
+# Extract features in a process pool once one side of the batch has at least this many documents
+PROCESS_POOL_THRESHOLD = 256
+ATS_FEATURE_WORKERS = int(os.getenv("ATS_FEATURE_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+
+def _cv_row(cv_text: str) -> tuple[list[bool], float, float]:
+    """Extract the keyword vector and the job-independent scores of one CV"""
+    features = extract_features(cv_text)
+    keyword_vector = [keyword in features.keywords for keyword in TECH_KEYWORDS]
+    return keyword_vector, calculate_format_score(features), calculate_content_score(features)
+
+
+def _job_row(job_description: str) -> list[bool]:
+    """Extract the keyword vector of one job description"""
+    job_keywords = set(get_job_analysis(job_description).ats_keywords)
+    return [keyword in job_keywords for keyword in TECH_KEYWORDS]
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the indices and scores of the k best rows for every column, best first"""
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1, axis=0)[:k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[0])[:, None], scores.shape)
+
+    candidate_scores = np.take_along_axis(scores, candidates, axis=0)
+    order = np.argsort(-candidate_scores, axis=0, kind='stable')
+    return np.take_along_axis(candidates, order, axis=0), np.take_along_axis(candidate_scores, order, axis=0)
+
+
+@lru_cache(maxsize=None)
+def get_feature_pool() -> ProcessPoolExecutor:
+    """Shared pool for feature extraction; workers start from a clean interpreter, since forking the
+    server from a request thread would copy its locks and event loop into the child"""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=ATS_FEATURE_WORKERS, mp_context=multiprocessing.get_context(method))
+
+
+class BatchATSScorer:
+    """Scores the cross product of CVs and job descriptions and ranks the best matches"""
+
+    def __init__(self, process_pool_threshold: int = PROCESS_POOL_THRESHOLD):
+        self.process_pool_threshold = process_pool_threshold
+
+    def _map(self, func: Callable, items: list[str]) -> list:
+        """Apply func to every item, in the shared process pool for very large batches"""
+        if len(items) < self.process_pool_threshold or ATS_FEATURE_WORKERS < 2:
+            return [func(item) for item in items]
+
+        chunksize = max(len(items) // (ATS_FEATURE_WORKERS * 4), 1)
+        return list(get_feature_pool().map(func, items, chunksize=chunksize))
+
+    def score_matrix(self, cv_texts: list[str], job_descriptions: list[str]) -> np.ndarray:
+        """Return the overall ATS score of every CV (rows) against every job description (columns)"""
+        # Each document is analysed exactly once, however many pairs it takes part in
+        cv_rows = self._map(_cv_row, cv_texts)
+        job_rows = self._map(_job_row, job_descriptions)
+
+        cv_keywords = np.array([row[0] for row in cv_rows], dtype=np.float32).reshape(len(cv_rows), len(TECH_KEYWORDS))
+        format_scores = np.array([row[1] for row in cv_rows], dtype=np.float32)
+        content_scores = np.array([row[2] for row in cv_rows], dtype=np.float32)
+        job_keywords = np.array(job_rows, dtype=np.float32).reshape(len(job_rows), len(TECH_KEYWORDS))
+
+        # Keyword score: matched keywords over the job's keywords, 50 when the job names none
+        job_keyword_counts = job_keywords.sum(axis=1)
+        matched = cv_keywords @ job_keywords.T
+        keyword_scores = np.full(matched.shape, 50.0, dtype=np.float32)
+        np.divide(matched * 100, job_keyword_counts, out=keyword_scores, where=job_keyword_counts > 0)
+        np.minimum(keyword_scores, 100.0, out=keyword_scores)
+
+        return keyword_scores * 0.5 + (format_scores * 0.3 + content_scores * 0.2)[:, None]
+
+    def rank(self, cvs: dict[str, str], jobs: dict[str, str], top_k: int = 10) -> dict[str, Any]:
+        """Score every CV against every job and return the top-k matches from both sides
+
+        Raises ValueError for an unusable request, before any scoring.
+        """
+        cv_ids, job_ids = list(cvs), list(jobs)
+        if not cv_ids or not job_ids:
+            raise ValueError("At least one CV and one job description are required")
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+
+        try:
+            scores = self.score_matrix(list(cvs.values()), list(jobs.values()))
+
+            # Best CVs for each job, and best jobs for each CV
+            cv_index, cv_scores = _top_k(scores, top_k)
+            job_index, job_scores = _top_k(scores.T, top_k)
+
+            return {
+                "by_job": {
+                    job_id: [
+                        {"cv_id": cv_ids[i], "score": round(float(score), 2)}
+                        for i, score in zip(cv_index[:, column], cv_scores[:, column])
+                    ]
+                    for column, job_id in enumerate(job_ids)
+                },
+                "by_cv": {
+                    cv_id: [
+                        {"job_id": job_ids[i], "score": round(float(score), 2)}
+                        for i, score in zip(job_index[:, column], job_scores[:, column])
+                    ]
+                    for column, cv_id in enumerate(cv_ids)
+                },
+                "pairs_scored": len(cv_ids) * len(job_ids)
+            }
+
+        except Exception as e:
+            raise Exception(f"Batch ATS scoring failed: {str(e)}")
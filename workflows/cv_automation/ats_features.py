@@ -0,0 +1,140 @@
+"""
+ATS Feature Extraction
+Scans CV text once and produces the feature record every ATS score and recommendation reads from
+"""
+
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Sequence
+
+
+# Sections the format score looks for
+SECTION_NAMES = ['experience', 'education', 'skills', 'projects']
+
+# Verbs the content score rewards
+ACTION_VERBS = ['developed', 'implemented', 'designed', 'created', 'managed', 'led', 'improved']
+
+# Words that signal a quantified achievement
+QUANTIFIER_WORDS = ['increase', 'improve', 'reduce', 'save']
+
+# Common technical keywords matched between the CV and the job description
+TECH_KEYWORDS = [
+    'python', 'java', 'javascript', 'react', 'nodejs', 'aws', 'docker',
+    'kubernetes', 'sql', 'mongodb', 'postgresql', 'git', 'jenkins',
+    'terraform', 'ansible', 'linux', 'windows', 'azure', 'gcp',
+    'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api'
+]
+
+# Contact, date and metric signals. Only their presence is scored, so each pattern is
+# searched once and stops at its first hit instead of scanning the whole text.
+_EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_PHONE_PATTERN = re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b")
+_YEAR_PATTERN = re.compile(r"\b\d{4}\b")
+_METRIC_PATTERN = re.compile(r"\d[%xX]|\$\d")
+
+
+@dataclass
+class CVFeatures:
+    """Features extracted from a CV in a single scan of its text"""
+
+    sections: frozenset[str]
+    keywords: frozenset[str]
+    verb_counts: dict[str, int]
+    quantifier_words: frozenset[str]
+    has_metrics: bool
+    has_email: bool
+    has_phone: bool
+    has_dates: bool
+    word_count: int
+
+    @property
+    def has_quantified_achievements(self) -> bool:
+        return self.has_metrics or bool(self.quantifier_words)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the feature record as plain JSON-friendly data for debug output"""
+        features = asdict(self)
+        for name in ('sections', 'keywords', 'quantifier_words'):
+            features[name] = sorted(features[name])
+        return features
+
+
+def extract_keywords(text: str) -> list[str]:
+    """Extract the technical keywords present in the text, in TECH_KEYWORDS order"""
+    text_lower = text.lower()
+    return [keyword for keyword in TECH_KEYWORDS if keyword in text_lower]
+
+
+def extract_features(cv_text: str) -> CVFeatures:
+    """Scan the CV text once and build its feature record"""
+    # Lowercase once; every vocabulary lookup below reuses this copy
+    text_lower = cv_text.lower()
+
+    return CVFeatures(
+        sections=frozenset(section for section in SECTION_NAMES if section in text_lower),
+        keywords=frozenset(keyword for keyword in TECH_KEYWORDS if keyword in text_lower),
+        verb_counts={verb: count for verb in ACTION_VERBS if (count := text_lower.count(verb))},
+        quantifier_words=frozenset(word for word in QUANTIFIER_WORDS if word in text_lower),
+        has_metrics=_METRIC_PATTERN.search(cv_text) is not None,
+        has_email=_EMAIL_PATTERN.search(cv_text) is not None,
+        has_phone=_PHONE_PATTERN.search(cv_text) is not None,
+        has_dates=_YEAR_PATTERN.search(cv_text) is not None,
+        word_count=len(cv_text.split())
+    )
+
+
+def calculate_keyword_score(features: CVFeatures, job_keywords: Sequence[str]) -> float:
+    """Calculate the keyword matching score"""
+    if not job_keywords:
+        return 50.0  # Default score if no keywords found
+
+    # Calculate match percentage
+    matched_keywords = features.keywords.intersection(job_keywords)
+    match_percentage = len(matched_keywords) / len(job_keywords) * 100
+
+    return min(match_percentage, 100.0)
+
+
+def calculate_format_score(features: CVFeatures) -> float:
+    """Calculate format and structure score"""
+    score = 0
+
+    # Check for common sections
+    score += 15 * len(features.sections)
+
+    # Check for contact information
+    if features.has_email:
+        score += 10
+
+    # Check for phone number
+    if features.has_phone:
+        score += 10
+
+    # Check for dates
+    if features.has_dates:
+        score += 10
+
+    return min(score, 100.0)
+
+
+def calculate_content_score(features: CVFeatures) -> float:
+    """Calculate content quality score"""
+    score = 0
+
+    # Check for quantifiable achievements
+    if features.has_quantified_achievements:
+        score += 30
+
+    # Check for action verbs
+    score += 5 * len(features.verb_counts)
+
+    # Check for adequate length
+    if features.word_count > 200:
+        score += 20
+
+    return min(score, 100.0)
+
+
+def calculate_overall_score(keyword_score: float, format_score: float, content_score: float) -> float:
+    """Combine the individual scores into the overall ATS score"""
+    return keyword_score * 0.5 + format_score * 0.3 + content_score * 0.2
@@ -0,0 +1,110 @@
+"""
+Batch CV Generation
+Tailors one profile to many job descriptions. The job-independent work (validation, parsing, the
+DynamoDB save, rendering every section but the overview) is done once; the overviews are written
+concurrently under the LLM gateway's limits, the PDFs compile in the Typst compile pool and the
+uploads run side by side. Results are yielded in completion order.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from core.logging_config import log_context
+from core.metrics import ATS_SCORE, CV_BATCH_SIZE, track_stage
+from core.tracing import tracer
+from models.profile import CVProfile
+from models.user import BatchJob, CVBatchQuery
+from services.s3Uploader import upload_to_s3_agent
+from services.typst_service import (
+    compile_typst_to_pdf_async, render_resume_document, resume_output_paths, save_resume_typst
+)
+from .jd_analysis import get_job_analysis
+from .overview import awrite_overview
+from .prompt_builder import build_overview_context
+from .tools import ATSScorer
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCVWorkflow:
+    """Generates one CV per job description from a shared profile"""
+
+    def __init__(self, payload: CVBatchQuery):
+        self.batch_id = uuid.uuid4().hex
+        self.jobs = payload.jobs
+        self.form_data = payload.formData
+        self.template = payload.template
+        self.ats_scorer = ATSScorer()
+
+        # Shared by every job; raises ValueError on records the résumé cannot be rendered from
+        self.profile = CVProfile.from_form_data(payload.formData)
+        self.document = render_resume_document(self.profile, self.template)
+
+    def _prepare(self, job: BatchJob) -> tuple[str, str]:
+        """Analyse the job description and select the profile context for its overview"""
+        analysis = get_job_analysis(job.jobDescription)
+        return analysis.summary(), build_overview_context(self.profile, analysis).text
+
+    def _save(self, index: int, overview: str) -> tuple[str, str]:
+        """Write the template data of one job's CV, returning its data and PDF paths"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        data_path, pdf_path = resume_output_paths(f"cv_{timestamp}_{self.batch_id[:8]}_{index}")
+        save_resume_typst(self.document, overview, data_path)
+        return data_path, pdf_path
+
+    async def _generate(self, index: int, job: BatchJob) -> dict[str, Any]:
+        """Write, score, compile and upload the CV for one job description"""
+        start = time.perf_counter()
+        # The CPU and file work runs in threads so the other jobs' LLM calls keep streaming meanwhile
+        requirements, candidate_context = await asyncio.to_thread(self._prepare, job)
+        overview = await awrite_overview(job.jobDescription, requirements, candidate_context)
+
+        ats_result = await asyncio.to_thread(
+            self.ats_scorer.score_structured, overview.text, self.form_data, job.jobDescription
+        )
+        ATS_SCORE.observe(ats_result["overall_score"])
+
+        data_path, pdf_path = await asyncio.to_thread(self._save, index, overview.text)
+        await compile_typst_to_pdf_async(data_path, pdf_path, self.template)
+
+        upload = await asyncio.to_thread(upload_to_s3_agent, pdf_path)
+        if "error" in upload:
+            raise RuntimeError(upload["error"])
+
+        return {
+            "id": job.id,
+            "success": True,
+            "pdf path": pdf_path,
+            "cv_url": upload["s3_url"],
+            "ats_score": ats_result["overall_score"],
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+    async def _run_job(self, index: int, job: BatchJob) -> dict[str, Any]:
+        """Run one job, turning its failure into a result so the other jobs carry on"""
+        with log_context(workflow_id=f"{self.batch_id}:{job.id}"), \
+                tracer.start_as_current_span("cv_batch.job", attributes={"batch.job_id": job.id}):
+            try:
+                return await self._generate(index, job)
+            except Exception as e:
+                logger.error(f"Batch CV generation failed for job {job.id}: {str(e)}")
+                return {"id": job.id, "success": False, "error": f"Error: {e}"}
+
+    async def results(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield each job's result as soon as it is ready"""
+        CV_BATCH_SIZE.observe(len(self.jobs))
+        logger.info("Starting batch CV generation", extra={"batch_id": self.batch_id, "jobs": len(self.jobs)})
+
+        tasks = [asyncio.create_task(self._run_job(index, job)) for index, job in enumerate(self.jobs)]
+        try:
+            with track_stage("batch_workflow"):
+                for finished in asyncio.as_completed(tasks):
+                    yield await finished
+        finally:
+            # The client went away: stop the jobs that are still running
+            for task in tasks:
+                task.cancel()
@@ -2,27 +2,48 @@
 CV Automation Workflow - Main Orchestrator
 Handles the complete CV generation and optimization process using Crew AI
 """
+import itertools
 import json
+import logging
 import os
+import uuid
 from dotenv import load_dotenv
-from typing import Any
+from typing import Any, Optional
 from datetime import datetime
 
 from crewai import Crew, Process, LLM
 
+from core.deadline import Deadline, RequestCancelled, use_deadline
+from core.logging_config import CREW_VERBOSE, log_context, log_payload
+from core.metrics import record_llm_usage, track_stage
+from core.tracing import tracer
 from models.user import UserQuery
+from models.profile import CVProfile
 from .agents import CVAutomationAgents
 from .tasks import CVAutomationTasks
 from .tools import ATSScorer, S3Uploader
-from .utils import PayloadValidator
+from .utils import PayloadValidator, MetricsCollector
+from .jd_analysis import get_job_analysis
+from .llm import GatewayLLM
+from .prompt_builder import build_overview_context
+from .overview import OVERVIEW_ENGINE, clean_overview, write_overview
 
 from services.typst_service import generate_resume
 from services.s3Uploader import upload_to_s3_agent
 
+logger = logging.getLogger(__name__)
+
+# Score one in every N compiled PDFs to check the structured ATS score against the real document
+PDF_FIDELITY_CHECK_INTERVAL = 20
+
+
 class CVAutomationWorkflow:
     """Main workflow orchestrator for CV automation using Crew AI"""
 
-    def __init__(self):
+    _pdf_check_counter = itertools.count(1)
+
+    def __init__(self, overview_engine: str = OVERVIEW_ENGINE):
+        self.overview_engine = overview_engine
         self.llm = self._setup_llm()
         self.agents = CVAutomationAgents(self.llm)
         self.tasks = CVAutomationTasks()
@@ -32,8 +53,8 @@ class CVAutomationWorkflow:
 
 
     @staticmethod
-    def _setup_llm() -> LLM:
-        """Setup Gemini LLM"""
+    def _setup_llm() -> GatewayLLM:
+        """Setup Gemini LLM behind the shared LLM gateway"""
         token_label = "GEMINI_API_KEY"
         load_dotenv()
         token = os.getenv(token_label)
@@ -43,33 +64,61 @@ class CVAutomationWorkflow:
 
         os.environ[token_label] = token
 
-        return LLM(
+        return GatewayLLM(LLM(
             model="gemini/gemini-2.0-flash",
             temperature=0.7,
-        )
+        ))
 
 
-    def run(self, payload: UserQuery, s3_bucket_name: str) -> dict[str, Any]:
+    def run(self, payload: UserQuery, s3_bucket_name: str, deadline: Optional[Deadline] = None,
+            validated: bool = False) -> dict[str, Any]:
         """
         Main workflow execution
 
         Args:
             payload: Input data containing job description and form data
             s3_bucket_name: S3 bucket name for final CV upload
+            deadline: Request deadline, checked before each stage; stages that would start after it
+                has passed or been cancelled are skipped with RequestCancelled
+            validated: The caller already checked payload with validate_user_query, so skip it here
 
         Returns:
             Dict containing final CV URL and processing details
         """
-        # print(payload)
+        # Every record logged during this run carries the workflow id
+        workflow_id = uuid.uuid4().hex
+        deadline = deadline or Deadline()
+        with log_context(workflow_id=workflow_id), use_deadline(deadline), track_stage("workflow"), \
+                tracer.start_as_current_span("cv_workflow", attributes={"workflow.id": workflow_id}) as span:
+            result = self._execute(payload, s3_bucket_name, deadline, validated)
+            span.set_attribute("cv.ats_score", result["ats_score"])
+            span.set_attribute("cv.iterations", result["iterations_used"])
+            return result
+
+    def _execute(self, payload: UserQuery, s3_bucket_name: str, deadline: Deadline,
+                 validated: bool) -> dict[str, Any]:
+        """Run the workflow stages"""
+        metrics = MetricsCollector()
+        metrics.start_workflow()
         try:
-            # Validate payload
-            self.payload_validator.validate(payload)
+            # Validate payload, unless the API edge already did
+            if not validated:
+                self.payload_validator.validate(payload)
 
-            print("Starting CV Automation Workflow...")
+            # Parse the form data once into typed records shared by every later stage
+            profile = CVProfile.from_form_data(payload.formData)
+
+            logger.info("Starting CV Automation Workflow")
+
+            # Only the relevant, compacted parts of the profile go into the overview prompt
+            job_analysis = get_job_analysis(payload.jobDescription)
+            candidate_context = build_overview_context(profile, job_analysis)
 
             # Initialize workflow context
             workflow_context = {
                 "job_description": payload.jobDescription,
+                "job_requirements": job_analysis.summary(),
+                "candidate_context": candidate_context.text,
                 "form_data": dict(payload.formData),
                 "s3_bucket_name": s3_bucket_name,
                 "iteration": 0,
@@ -82,40 +131,41 @@ class CVAutomationWorkflow:
                 "final_cv_url": ""
             }
 
-            # Run the optimization loop
-            # while (workflow_context["iteration"] < workflow_context["max_iterations"] and
-            #        workflow_context["current_ats_score"] < workflow_context["target_ats_score"]):
-            for i in range(1):
+            # Run the optimization loop. Each iteration is scored from the structured
+            # form data, so iterating does not cost a Typst compile or a PDF parse.
+            while (workflow_context["iteration"] < workflow_context["max_iterations"] and
+                   workflow_context["current_ats_score"] < workflow_context["target_ats_score"]):
                 workflow_context["iteration"] += 1
-                print(f"\nIteration {workflow_context['iteration']}/{workflow_context['max_iterations']}")
-
-                # Create and run the crew for this iteration
-                crew = self._create_crew(workflow_context)
-                result = crew.kickoff(inputs=workflow_context)
-
-                # Update context with results
-                workflow_context.update(result)
-
-                print(f"Result: {result}")
+                logger.info(f"Iteration {workflow_context['iteration']}/{workflow_context['max_iterations']}")
 
-                workflow_context['overview'] = str(result)
+                deadline.check("llm")
+                workflow_context['overview'] = self._write_overview(workflow_context)
 
-                # print(f"Overview: {workflow_context['overview']}")
+                ats_result = self.ats_scorer.score_structured(
+                    workflow_context["overview"],
+                    workflow_context["optimized_form_data"],
+                    workflow_context["job_description"]
+                )
+                workflow_context["current_ats_score"] = ats_result["overall_score"]
+                metrics.record_iteration(workflow_context["iteration"], ats_result["overall_score"])
 
-                # print(f"ATS Score: {workflow_context['current_ats_score']}/100")
+                logger.info(f"ATS Score: {workflow_context['current_ats_score']}/100")
 
                 if workflow_context["current_ats_score"] >= workflow_context["target_ats_score"]:
-                    print("Target ATS score achieved!")
+                    logger.info("Target ATS score achieved")
                     break
                 elif workflow_context["iteration"] < workflow_context["max_iterations"]:
-                    print("Optimizing for next iteration...")
+                    logger.info("Optimizing for next iteration")
 
-            print("Generating CV from optimized form data...")
-            pdf_path=generate_resume(workflow_context,workflow_context["overview"], payload.formData)
-            print("pdf path from crew is ",pdf_path)
-            print("pdf path from workflow{cv path}",workflow_context["cv_path"])
+            logger.info("Generating CV from optimized form data")
+            pdf_path=generate_resume(workflow_context,workflow_context["overview"], profile, deadline,
+                                     template=payload.template)
+            logger.info("CV generated", extra={"path": pdf_path})
 
-            workflow_context["final_cv_url"] = upload_to_s3_agent(workflow_context["cv_path"])
+            workflow_context["final_cv_url"] = upload_to_s3_agent(workflow_context["cv_path"], deadline)
+
+            if next(self._pdf_check_counter) % PDF_FIDELITY_CHECK_INTERVAL == 0:
+                self._check_pdf_fidelity(workflow_context)
 
 
 
@@ -143,12 +193,64 @@ class CVAutomationWorkflow:
             return {
                 "success": True,
                 "pdf path": workflow_context["cv_path"],
-                "cv_url": workflow_context["final_cv_url"]
+                "cv_url": workflow_context["final_cv_url"],
+                "ats_score": workflow_context["current_ats_score"],
+                "iterations_used": workflow_context["iteration"]
             }
 
+        except RequestCancelled as e:
+            # Not a failure of the workflow: the caller stopped waiting for it
+            logger.info(f"Workflow stopped: {str(e)}")
+            raise
         except Exception as e:
-            print(f"Workflow failed: {str(e)}")
+            metrics.record_error()
+            logger.exception(f"Workflow failed: {str(e)}")
             raise Exception(f"CV Automation Workflow failed: {str(e)}")
+        finally:
+            metrics.end_workflow()
+
+    @staticmethod
+    def _record_token_usage(result: Any) -> None:
+        """Count the LLM tokens a crew run reports"""
+        usage = getattr(result, "token_usage", None)
+        if usage is not None:
+            record_llm_usage(
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cached_prompt_tokens=usage.cached_prompt_tokens,
+                requests=usage.successful_requests
+            )
+
+
+    def _check_pdf_fidelity(self, context: dict[str, Any]) -> None:
+        """Score the compiled PDF and report drift from the structured ATS score"""
+        try:
+            pdf_result = self.ats_scorer._run(context["cv_path"], context["job_description"])
+            drift = pdf_result["overall_score"] - context["current_ats_score"]
+            logger.info(f"ATS fidelity check: pdf={pdf_result['overall_score']} "
+                        f"structured={context['current_ats_score']} drift={round(drift, 2)}")
+        except Exception as e:
+            logger.warning(f"ATS fidelity check failed: {str(e)}")
+
+    def _write_overview(self, context: dict[str, Any]) -> str:
+        """Write the overview for this iteration with the configured engine"""
+        if self.overview_engine == "crew":
+            # Create and run the crew for this iteration; its LLM calls are timed as "llm" by the gateway
+            crew = self._create_crew(context)
+            with track_stage("crew_kickoff"), tracer.start_as_current_span(
+                    "crew.kickoff", attributes={"cv.iteration": context["iteration"]}):
+                result = crew.kickoff(inputs=context)
+            self._record_token_usage(result)
+
+            # Update context with results
+            context.update(result)
+
+            log_payload(logger, "Crew result", result)
+            return clean_overview(str(result))
+
+        result = write_overview(context["job_description"], context["job_requirements"], context["candidate_context"])
+        log_payload(logger, "Overview result", {"overview": result.text})
+        return result.text
 
 
     def _create_crew(self, context: dict[str, Any]) -> Crew:
@@ -185,7 +287,7 @@ class CVAutomationWorkflow:
             ],
             tasks=tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=CREW_VERBOSE
         )
 
         return crew
\ No newline at end of file
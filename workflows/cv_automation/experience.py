@@ -0,0 +1,162 @@
+"""
+Experience Calculation
+Interval arithmetic over month ordinals: total, per-skill and recent experience with overlaps counted once
+"""
+
+import re
+from functools import lru_cache
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Any, Iterable, Optional
+
+from models.profile import ProjectItem, WorkItem
+from util.date_util import current_month
+
+# Window used for "recent experience"
+RECENT_EXPERIENCE_YEARS = 5
+
+# Words when matching skill names in free text: dots only inside a word or leading it (node.js, .net),
+# so sentence punctuation does not stick to the word before it ("python." is python)
+_SKILL_TOKEN_PATTERN = re.compile(r"\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+@dataclass
+class ExperienceSummary:
+    """Months of experience derived from dated work and project entries"""
+
+    total_months: int = 0
+    recent_months: int = 0
+    recent_window_years: int = RECENT_EXPERIENCE_YEARS
+    skill_months: dict[str, int] = field(default_factory=dict)
+    undated_entries: int = 0
+
+    @property
+    def total_years(self) -> float:
+        return round(self.total_months / 12, 1)
+
+    @property
+    def recent_years(self) -> float:
+        return round(self.recent_months / 12, 1)
+
+    def skill_years(self) -> dict[str, float]:
+        """Return years of experience per skill, most experienced first"""
+        return {
+            skill: round(months / 12, 1)
+            for skill, months in sorted(self.skill_months.items(), key=itemgetter(1), reverse=True)
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total_experience_years": self.total_years,
+            "recent_experience_years": self.recent_years,
+            "recent_window_years": self.recent_window_years,
+            "skill_experience_years": self.skill_years(),
+            "undated_entries": self.undated_entries
+        }
+
+
+class _Sweep:
+    """Running merge of intervals fed in start order; months are banked as each run closes"""
+
+    __slots__ = ("start", "end", "months")
+
+    def __init__(self):
+        self.start = self.end = None
+        self.months = 0
+
+    def add(self, start: int, end: int) -> None:
+        if self.end is not None and start <= self.end:
+            if end > self.end:
+                self.end = end
+            return
+        if self.end is not None:
+            self.months += self.end - self.start
+        self.start, self.end = start, end
+
+    def total(self) -> int:
+        return self.months + (self.end - self.start if self.end is not None else 0)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_skill(skill: str) -> str:
+    return " ".join(_SKILL_TOKEN_PATTERN.findall(skill.lower()))
+
+
+def _interval(start: Optional[int], end: Optional[int], ongoing: bool, this_month: int) -> Optional[tuple[int, int]]:
+    """Return the [start, end) months of an entry, clamped to the current month, or None if undated"""
+    if start is None:
+        return None
+    end = this_month if ongoing else end
+    if end is None:
+        return None
+    end = min(end, this_month)
+    return (start, end) if end > start else None
+
+
+def _mentioned_skills(text: str, vocabulary: list[tuple[str, str]]) -> set[str]:
+    """Return the vocabulary skills mentioned as whole words in the text"""
+    if not text or not vocabulary:
+        return set()
+    padded = f" {' '.join(_SKILL_TOKEN_PATTERN.findall(text.lower()))} "
+    return {skill for padded_skill, skill in vocabulary if padded_skill in padded}
+
+
+def calculate_experience(work_experience: list[WorkItem], projects: Iterable[ProjectItem] = (),
+                         skills: Iterable[str] = (), recent_years: int = RECENT_EXPERIENCE_YEARS,
+                         this_month: Optional[int] = None) -> ExperienceSummary:
+    """Compute total, per-skill and recent experience, counting overlapping entries once
+
+    Total and recent experience come from work entries. Per-skill experience also counts
+    projects tagged with a skill, and work entries whose title or description mention it.
+    Entries without a usable start and end month are skipped and counted as undated.
+    """
+    this_month = current_month() if this_month is None else this_month
+    window_start = this_month - recent_years * 12
+    # Skills padded with spaces once, so a mention check is a single substring test
+    vocabulary = [
+        (f" {normalized} ", normalized)
+        for normalized in {_normalize_skill(skill) for skill in skills}
+        if normalized
+    ]
+
+    # (start, end, counts towards total, skills)
+    entries: list[tuple[int, int, bool, set[str]]] = []
+    undated = 0
+
+    for job in work_experience:
+        interval = _interval(job.start, job.end, job.currently_working, this_month)
+        if interval is None:
+            undated += 1
+            continue
+        entries.append((*interval, True, _mentioned_skills(f"{job.job_title} {job.description}", vocabulary)))
+
+    for project in projects:
+        interval = _interval(project.start, project.end, project.currently_working, this_month)
+        if interval is None:
+            continue
+        project_skills = {normalized for skill in project.skills if (normalized := _normalize_skill(skill))}
+        entries.append((*interval, False, project_skills | _mentioned_skills(project.description, vocabulary)))
+
+    # Sort once; every sweep below then merges in a single linear pass
+    entries.sort(key=itemgetter(0, 1))
+
+    total, recent = _Sweep(), _Sweep()
+    skill_sweeps: dict[str, _Sweep] = {}
+    for start, end, is_work, entry_skills in entries:
+        if is_work:
+            total.add(start, end)
+            if end > window_start:
+                recent.add(max(start, window_start), end)
+        for skill in entry_skills:
+            sweep = skill_sweeps.get(skill)
+            if sweep is None:
+                sweep = skill_sweeps[skill] = _Sweep()
+            sweep.add(start, end)
+
+    return ExperienceSummary(
+        total_months=total.total(),
+        recent_months=recent.total(),
+        recent_window_years=recent_years,
+        skill_months={skill: sweep.total() for skill, sweep in skill_sweeps.items()},
+        undated_entries=undated
+    )
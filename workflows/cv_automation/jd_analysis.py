@@ -0,0 +1,158 @@
+"""
+Job Description Analysis
+Derives the requirements of a job posting once and caches them by a hash of the normalised text
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from core.metrics import register_cache
+from .ats_features import extract_keywords
+
+# Technologies the content analyzer looks for in job descriptions
+REQUIREMENT_TECH_KEYWORDS = [
+    'python', 'java', 'javascript', 'react', 'nodejs', 'aws', 'docker',
+    'kubernetes', 'sql', 'mongodb', 'postgresql', 'git', 'jenkins',
+    'terraform', 'ansible', 'linux', 'windows', 'azure', 'gcp'
+]
+
+INDUSTRY_KEYWORDS = ['agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql']
+
+SENIOR_LEVEL_WORDS = ['senior', 'lead', 'principal']
+JUNIOR_LEVEL_WORDS = ['junior', 'entry', 'graduate']
+
+_EXPERIENCE_PATTERN = re.compile(r'(\d+)[\+\-\s]*years?\s+(?:of\s+)?experience')
+
+
+@dataclass(frozen=True)
+class JobAnalysis:
+    """Requirements derived from one job description; shared by every request for it, so immutable"""
+
+    jd_hash: str
+    required_technologies: tuple[str, ...]
+    required_experience_years: int
+    job_level: str
+    industry_keywords: tuple[str, ...]
+    ats_keywords: tuple[str, ...]
+
+    def as_requirements(self) -> dict[str, Any]:
+        """Return the requirements in the shape ContentAnalyzer and ContentReorderer expect"""
+        return {
+            "required_technologies": list(self.required_technologies),
+            "required_experience_years": self.required_experience_years,
+            "job_level": self.job_level,
+            "industry_keywords": list(self.industry_keywords)
+        }
+
+    def summary(self) -> str:
+        """Return a one-line summary of the requirements for LLM prompts"""
+        parts = [f"level: {self.job_level}"]
+        if self.required_experience_years:
+            parts.append(f"experience: {self.required_experience_years}+ years")
+        if self.required_technologies:
+            parts.append(f"technologies: {', '.join(self.required_technologies)}")
+        if self.industry_keywords:
+            parts.append(f"practices: {', '.join(self.industry_keywords)}")
+        return "; ".join(parts)
+
+
+def normalize_job_description(job_description: str) -> str:
+    """Normalise whitespace and case; the analysis is case-insensitive"""
+    return " ".join(job_description.split()).lower()
+
+
+def job_description_hash(job_description: str) -> str:
+    """Return the cache key of a job description"""
+    return hashlib.sha256(normalize_job_description(job_description).encode("utf-8")).hexdigest()
+
+
+def determine_job_level(job_description_lower: str) -> str:
+    """Determine job level from the lowercased description"""
+    if any(word in job_description_lower for word in SENIOR_LEVEL_WORDS):
+        return 'senior'
+    elif any(word in job_description_lower for word in JUNIOR_LEVEL_WORDS):
+        return 'junior'
+    return 'mid'
+
+
+def analyze_job_description(job_description: str, jd_hash: Optional[str] = None) -> JobAnalysis:
+    """Analyse a job description from scratch"""
+    text_lower = job_description.lower()
+
+    experience_match = _EXPERIENCE_PATTERN.search(text_lower)
+
+    return JobAnalysis(
+        jd_hash=jd_hash or job_description_hash(job_description),
+        required_technologies=tuple(tech for tech in REQUIREMENT_TECH_KEYWORDS if tech in text_lower),
+        required_experience_years=int(experience_match.group(1)) if experience_match else 0,
+        job_level=determine_job_level(text_lower),
+        industry_keywords=tuple(keyword for keyword in INDUSTRY_KEYWORDS if keyword in text_lower),
+        ats_keywords=tuple(extract_keywords(job_description))
+    )
+
+
+class JDAnalysisCache:
+    """Bounded in-process LRU of job description analyses; a miss costs a few regex scans, so it is not persisted"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, JobAnalysis] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, job_description: str) -> JobAnalysis:
+        """Return the analysis for a job description, analysing it only on a cache miss"""
+        jd_hash = job_description_hash(job_description)
+
+        with self._lock:
+            analysis = self._entries.get(jd_hash)
+            if analysis is not None:
+                self._entries.move_to_end(jd_hash)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+
+        analysis = analyze_job_description(job_description, jd_hash)
+        self._store(analysis)
+        return analysis
+
+    def clear(self) -> None:
+        """Drop all cached analyses"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def _store(self, analysis: JobAnalysis) -> None:
+        with self._lock:
+            self._entries[analysis.jd_hash] = analysis
+            self._entries.move_to_end(analysis.jd_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+jd_analysis_cache = JDAnalysisCache(max_entries=int(os.getenv("JD_ANALYSIS_CACHE_SIZE", "1024")))
+register_cache("jd_analysis", jd_analysis_cache.stats)
+
+
+def get_job_analysis(job_description: str) -> JobAnalysis:
+    """Return the cached analysis for a job description"""
+    return jd_analysis_cache.get(job_description)
@@ -0,0 +1,40 @@
+"""
+Gateway LLM
+CrewAI LLM whose provider calls go through the shared LLM gateway, so crew agents share its rate limit
+"""
+
+from typing import Any, Optional
+
+from crewai import BaseLLM, LLM
+
+from core.deadline import current_deadline
+from core.llm_gateway import LLMGateway, get_gateway
+
+
+class GatewayLLM(BaseLLM):
+    """Wraps a CrewAI LLM and routes every call through the LLM gateway"""
+
+    def __init__(self, llm: LLM, gateway: Optional[LLMGateway] = None):
+        super().__init__(model=llm.model, temperature=llm.temperature)
+        self.llm = llm
+        self.gateway = gateway or get_gateway()
+        self._timeout = llm.timeout
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None) -> Any:
+        # The agent executor sets stop words on the LLM it was given
+        self.llm.stop = self.stop
+        # The provider request gives up when the request being served runs out of time
+        deadline = current_deadline()
+        self.llm.timeout = deadline.bound(self._timeout) if deadline is not None else self._timeout
+        # Tool calls can have side effects, so only plain completions are coalesced
+        key = None if tools else self.gateway.request_key(self.model, self.temperature, self.stop, messages)
+        return self.gateway.call(lambda: self.llm.call(messages, tools, callbacks, available_functions), key)
+
+    def supports_function_calling(self) -> bool:
+        return self.llm.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
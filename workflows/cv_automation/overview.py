@@ -0,0 +1,124 @@
+"""
+Overview Writer
+Writes the résumé overview with one direct, streaming LLM call, without CrewAI's agent scaffolding
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from core.llm_gateway import LLMGateway, LLMResponse, get_gateway
+from core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# "direct" makes one streaming completion; "crew" runs the single-agent CrewAI crew
+OVERVIEW_ENGINE = os.getenv("OVERVIEW_ENGINE", "direct").lower()
+
+OVERVIEW_PROMPT = """Write the overview paragraph of a résumé for the job below.
+
+Rules:
+- 3-4 sentences, at least 100 words, first person, professional and engaging
+- Highlight the most relevant experience and the skills that match the requirements; use action words and quantifiable results
+- Discuss the skills used in projects, but do not name projects or certifications
+- Use the job's keywords naturally so the text is ATS-friendly
+- Answer with the paragraph only
+
+Job description:
+{job_description}
+
+Key requirements: {job_requirements}
+
+Candidate (most relevant entries first):
+{candidate_context}
+"""
+
+# Wrappers models sometimes put around an answer despite being asked for the paragraph only
+_ANSWER_PREFIX = re.compile(r'^\s*(?:final answer|overview|summary)\s*:\s*', re.IGNORECASE)
+
+
+@dataclass
+class OverviewResult:
+    """Overview text with the usage and timing of the call that wrote it"""
+
+    text: str
+    prompt_tokens: int
+    completion_tokens: int
+    seconds: float
+    first_chunk_seconds: Optional[float]
+
+
+def clean_overview(text: str) -> str:
+    """Strip answer labels, surrounding quotes and extra whitespace from a generated overview"""
+    text = _ANSWER_PREFIX.sub("", text.strip())
+    if len(text) > 1 and text[0] == text[-1] and text[0] in "\"'":
+        text = text[1:-1]
+    return " ".join(text.split())
+
+
+def build_overview_prompt(job_description: str, job_requirements: str, candidate_context: str) -> str:
+    return OVERVIEW_PROMPT.format(
+        job_description=job_description.strip(),
+        job_requirements=job_requirements,
+        candidate_context=candidate_context
+    )
+
+
+class _ChunkTimer:
+    """Forwards streamed chunks and remembers when the first one arrived"""
+
+    def __init__(self, on_chunk: Optional[Callable[[str], None]]):
+        self.on_chunk = on_chunk
+        self.start = time.perf_counter()
+        self.first_chunk: Optional[float] = None
+
+    def __call__(self, text: str) -> None:
+        if self.first_chunk is None:
+            self.first_chunk = time.perf_counter() - self.start
+        if self.on_chunk is not None:
+            self.on_chunk(text)
+
+    def result(self, response: LLMResponse) -> OverviewResult:
+        result = OverviewResult(
+            text=clean_overview(response.text),
+            prompt_tokens=response.prompt_tokens,
+            completion_tokens=response.completion_tokens,
+            seconds=time.perf_counter() - self.start,
+            first_chunk_seconds=self.first_chunk
+        )
+        logger.info("Overview generated", extra={
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "seconds": round(result.seconds, 3),
+            "first_chunk_seconds": round(self.first_chunk, 3) if self.first_chunk is not None else None
+        })
+        return result
+
+
+def write_overview(job_description: str, job_requirements: str, candidate_context: str,
+                   on_chunk: Optional[Callable[[str], None]] = None,
+                   gateway: Optional[LLMGateway] = None) -> OverviewResult:
+    """Stream the overview from the LLM, forwarding chunks to on_chunk as they arrive"""
+    gateway = gateway or get_gateway()
+    prompt = build_overview_prompt(job_description, job_requirements, candidate_context)
+
+    timer = _ChunkTimer(on_chunk)
+    with tracer.start_as_current_span("overview.generate"):
+        response = gateway.generate_stream(prompt, timer)
+    return timer.result(response)
+
+
+async def awrite_overview(job_description: str, job_requirements: str, candidate_context: str,
+                          on_chunk: Optional[Callable[[str], None]] = None,
+                          gateway: Optional[LLMGateway] = None) -> OverviewResult:
+    """Async counterpart of write_overview(), for writing many overviews concurrently"""
+    gateway = gateway or get_gateway()
+    prompt = build_overview_prompt(job_description, job_requirements, candidate_context)
+
+    timer = _ChunkTimer(on_chunk)
+    with tracer.start_as_current_span("overview.generate"):
+        response = await gateway.agenerate_stream(prompt, timer)
+    return timer.result(response)
@@ -0,0 +1,190 @@
+"""
+Prompt Builder
+Builds the candidate context for the overview prompt: only the fields the overview needs, ranked
+against the job description, truncated and packed into a token budget as compact text
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.metrics import PROMPT_TOKENS
+from models.profile import CVProfile
+from util.date_util import format_month
+from .jd_analysis import JobAnalysis
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_PROMPT_TOKEN_BUDGET = int(os.getenv("OVERVIEW_PROMPT_TOKEN_BUDGET", "600"))
+OVERVIEW_ITEM_TOKEN_LIMIT = int(os.getenv("OVERVIEW_ITEM_TOKEN_LIMIT", "80"))
+
+# Output order of the sections; referees, contact details and links never reach the prompt
+SECTION_TITLES = {
+    "experience": "EXPERIENCE",
+    "projects": "PROJECTS",
+    "skills": "SKILLS",
+    "education": "EDUCATION",
+    "achievements": "ACHIEVEMENTS",
+    "certifications": "CERTIFICATIONS",
+}
+
+# Relevance bonus for entries that are still ongoing
+_ONGOING_BONUS = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Gemini token count (about four characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, limit: int) -> str:
+    """Cut text to roughly limit tokens, at a sentence end if one is close, otherwise at a word"""
+    text = " ".join(text.split())
+    max_chars = limit * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    sentence_end = cut.rfind(". ")
+    if sentence_end >= max_chars // 2:
+        return cut[:sentence_end + 1]
+    return cut.rsplit(" ", 1)[0] + "…"
+
+
+@dataclass
+class _Line:
+    section: str
+    rank: int
+    score: int
+    text: str
+    tokens: int
+
+
+@dataclass
+class OverviewContext:
+    """Compact candidate context for the overview prompt and what went into it"""
+
+    text: str
+    tokens: int
+    budget: int
+    included: dict[str, int] = field(default_factory=dict)
+    dropped: dict[str, int] = field(default_factory=dict)
+    truncated: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "included": self.included,
+            "dropped": self.dropped,
+            "truncated": self.truncated
+        }
+
+
+def _dates(item: Any, ongoing: bool) -> str:
+    if item.start is None:
+        return ""
+    start = format_month(item.start, item.start_year_only)
+    end = 'present' if ongoing else format_month(item.end, item.end_year_only) if item.end is not None else '?'
+    return f"{start}–{end}"
+
+
+def _relevance(text: str, keywords: tuple[str, ...]) -> int:
+    text_lower = text.lower()
+    return sum(1 for keyword in keywords if keyword in text_lower)
+
+
+class _Collector:
+    """Turns profile entries into ranked, truncated lines"""
+
+    def __init__(self, keywords: tuple[str, ...], item_token_limit: int):
+        self.keywords = keywords
+        self.item_token_limit = item_token_limit
+        self.lines: list[_Line] = []
+        self.truncated = 0
+
+    def add(self, section: str, entries: list[tuple[str, str, int]]) -> None:
+        """Add (head, body, bonus) entries of a section, ranked by relevance to the job"""
+        scored = []
+        for position, (head, body, bonus) in enumerate(entries):
+            score = _relevance(f"{head} {body}", self.keywords) + bonus
+            short_body = truncate_to_tokens(body, self.item_token_limit) if body else ""
+            if short_body != " ".join(body.split()):
+                self.truncated += 1
+            text = f"- {head}: {short_body}" if short_body else f"- {head}"
+            scored.append((score, position, text))
+
+        # Most relevant first; ties keep the candidate's own order
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        for rank, (score, _, text) in enumerate(scored):
+            self.lines.append(_Line(section, rank, score, text, estimate_tokens(text) + 1))
+
+
+def build_overview_context(profile: CVProfile, job_analysis: JobAnalysis,
+                           budget: int = OVERVIEW_PROMPT_TOKEN_BUDGET,
+                           item_token_limit: int = OVERVIEW_ITEM_TOKEN_LIMIT) -> OverviewContext:
+    """Select, rank and pack the profile into at most budget tokens of overview context"""
+    keywords = tuple(dict.fromkeys(
+        [*job_analysis.required_technologies, *job_analysis.ats_keywords, *job_analysis.industry_keywords]
+    ))
+    collector = _Collector(keywords, item_token_limit)
+
+    collector.add("experience", [
+        (f"{job.job_title} at {job.company} ({_dates(job, job.currently_working)})".replace(" ()", ""),
+         job.description, _ONGOING_BONUS if job.currently_working else 0)
+        for job in profile.work_experience if job.job_title or job.company
+    ])
+    collector.add("projects", [
+        (f"[{', '.join(project.skills)}]" if project.skills else "project", project.description,
+         _ONGOING_BONUS if project.currently_working else 0)
+        for project in profile.projects if project.description or project.skills
+    ])
+    collector.add("skills", [
+        (skill.category or "Skills", ", ".join(skill.technologies), 0)
+        for skill in profile.skills if skill.technologies
+    ])
+    collector.add("education", [
+        (" in ".join(part for part in (education.degree, education.field_of_study) if part), "",
+         _ONGOING_BONUS if education.currently_studying else 0)
+        for education in profile.education if education.degree or education.field_of_study
+    ])
+    collector.add("achievements", [
+        (achievement.title, achievement.description, 0) for achievement in profile.achievements if achievement.title
+    ])
+    collector.add("certifications", [
+        (certification.title, "", 0) for certification in profile.certifications if certification.title
+    ])
+
+    # Every non-empty section keeps its best line, then the rest fill the budget by relevance
+    header_tokens = {section: estimate_tokens(title) + 1 for section, title in SECTION_TITLES.items()}
+    chosen: set[int] = set()
+    used = 0
+    sections_used: set[str] = set()
+    first_lines = [i for i, line in enumerate(collector.lines) if line.rank == 0]
+    rest = sorted((i for i, line in enumerate(collector.lines) if line.rank > 0),
+                  key=lambda i: (-collector.lines[i].score, collector.lines[i].rank))
+    for i in first_lines + rest:
+        line = collector.lines[i]
+        cost = line.tokens + (0 if line.section in sections_used else header_tokens[line.section])
+        if used + cost > budget:
+            continue
+        chosen.add(i)
+        used += cost
+        sections_used.add(line.section)
+
+    blocks, included, dropped = [], {}, {}
+    for section, title in SECTION_TITLES.items():
+        lines = sorted((line for i, line in enumerate(collector.lines) if line.section == section and i in chosen),
+                       key=lambda line: line.rank)
+        total = sum(1 for line in collector.lines if line.section == section)
+        if lines:
+            blocks.append("\n".join([title, *(line.text for line in lines)]))
+            included[section] = len(lines)
+        if total > len(lines):
+            dropped[section] = total - len(lines)
+
+    text = "\n".join(blocks)
+    context = OverviewContext(text, estimate_tokens(text), budget, included, dropped, collector.truncated)
+    PROMPT_TOKENS.observe(context.tokens, prompt="overview_context")
+    logger.info("Overview prompt context built", extra=context.as_dict())
+    return context
@@ -72,8 +72,10 @@ class CVAutomationTasks:
                - ATS-friendly with relevant keywords
                - Concise but impactful
 
-            Context: {form_data}
+            Candidate (most relevant entries first):
+            {candidate_context}
             Job Description: {job_description}
+            Key Requirements: {job_requirements}
             Analysis Report: Available from previous task
 
             Expected Output: A professional overview paragraph (3-4 sentences) that will serve as the resume summary
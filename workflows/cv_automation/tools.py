@@ -5,16 +5,30 @@ Custom tools for the CV automation workflow
 
 import os
 import json
-import boto3
-import PyPDF2
 from datetime import datetime
-from typing import Any
+from typing import Any, Sequence
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 import re
 from collections import Counter
 import math
 
+from models.profile import (
+    CVProfile, WorkItem, EducationItem, ProjectItem, SkillItem, CertificationItem, AchievementItem
+)
+from core.metrics import timed_stage
+from util.cv_text import form_data_to_text
+from util.chronology import chronology_key, reverse_chronological_order
+from util.date_util import current_month, month_year
+from .jd_analysis import get_job_analysis
+from .experience import calculate_experience
+from .ats_features import (
+    CVFeatures, extract_features, extract_keywords, calculate_keyword_score,
+    calculate_format_score, calculate_content_score, calculate_overall_score
+)
+
+_QUANTIFIABLE_RESULT_PATTERN = re.compile(r'\d+%|\$\d+|\d+x|increase|improve|reduce|save')
+
 
 class ContentAnalyzer(BaseTool):
     """Tool for analyzing job descriptions and candidate profiles"""
@@ -24,12 +38,21 @@ class ContentAnalyzer(BaseTool):
 
     def _run(self, job_description: str, candidate_data: dict[str, Any]) -> dict[str, Any]:
         """Analyze content and return structured insights"""
+        try:
+            profile = CVProfile.from_form_data(candidate_data)
+        except Exception as e:
+            raise Exception(f"Content analysis failed: {str(e)}")
+
+        return self.analyze(job_description, profile)
+
+    def analyze(self, job_description: str, profile: CVProfile) -> dict[str, Any]:
+        """Analyze content for a profile the workflow already parsed"""
         try:
             # Extract job requirements
             job_requirements = self._extract_job_requirements(job_description)
 
             # Analyze candidate profile
-            candidate_profile = self._analyze_candidate_profile(candidate_data)
+            candidate_profile = self._analyze_candidate_profile(profile)
 
             # Calculate match scores
             match_analysis = self._calculate_matches(job_requirements, candidate_profile)
@@ -43,47 +66,24 @@ class ContentAnalyzer(BaseTool):
         except Exception as e:
             raise Exception(f"Content analysis failed: {str(e)}")
 
-    def _extract_job_requirements(self, job_description: str) -> dict[str, Any]:
-        """Extract key requirements from the job description"""
-        # Common tech skills patterns
-        tech_keywords = [
-            'python', 'java', 'javascript', 'react', 'nodejs', 'aws', 'docker',
-            'kubernetes', 'sql', 'mongodb', 'postgresql', 'git', 'jenkins',
-            'terraform', 'ansible', 'linux', 'windows', 'azure', 'gcp'
-        ]
-
-        # Extract mentioned technologies
-        found_tech = []
-        for tech in tech_keywords:
-            if tech.lower() in job_description.lower():
-                found_tech.append(tech)
-
-        # Extract experience requirements
-        experience_match = re.search(r'(\d+)[\+\-\s]*years?\s+(?:of\s+)?experience', job_description.lower())
-        required_experience = int(experience_match.group(1)) if experience_match else 0
-
-        return {
-            "required_technologies": found_tech,
-            "required_experience_years": required_experience,
-            "job_level": self._determine_job_level(job_description),
-            "industry_keywords": self._extract_industry_keywords(job_description)
-        }
+    @staticmethod
+    def _extract_job_requirements(job_description: str) -> dict[str, Any]:
+        """Extract key requirements from the job description (cached per posting)"""
+        return get_job_analysis(job_description).as_requirements()
 
-    def _analyze_candidate_profile(self, candidate_data: dict[str, Any]) -> dict[str, Any]:
+    def _analyze_candidate_profile(self, profile: CVProfile) -> dict[str, Any]:
         """Analyze candidate's profile and experience"""
-        skills = []
-        for skill_cat in candidate_data.get('skills', []):
-            skills.extend(skill_cat.get('technologies', []))
+        skills = [tech for skill_cat in profile.skills for tech in skill_cat.technologies]
 
-        # Calculate total experience
-        total_experience = self._calculate_total_experience(candidate_data.get('workExperience', []))
+        # Total, recent and per-skill experience with overlapping roles counted once
+        experience = calculate_experience(profile.work_experience, profile.projects, skills)
 
         return {
             "skills": skills,
-            "total_experience_years": total_experience,
-            "project_count": len(candidate_data.get('projects', [])),
-            "education_level": self._determine_education_level(candidate_data.get('education', [])),
-            "certifications_count": len(candidate_data.get('certifications', []))
+            **experience.as_dict(),
+            "project_count": len(profile.projects),
+            "education_level": self._determine_education_level(profile.education),
+            "certifications_count": len(profile.certifications)
         }
 
     @staticmethod
@@ -123,50 +123,20 @@ class ContentAnalyzer(BaseTool):
     @staticmethod
     def _determine_job_level(job_description: str) -> str:
         """Determine job level from description"""
-        if any(word in job_description.lower() for word in ['senior', 'lead', 'principal']):
-            return 'senior'
-        elif any(word in job_description.lower() for word in ['junior', 'entry', 'graduate']):
-            return 'junior'
-        return 'mid'
+        return get_job_analysis(job_description).job_level
 
     @staticmethod
     def _extract_industry_keywords(job_description: str) -> list[str]:
         """Extract industry-specific keywords"""
-        # This is a simplified implementation
-        common_keywords = ['agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql']
-        found_keywords = []
-        for keyword in common_keywords:
-            if keyword.lower() in job_description.lower():
-                found_keywords.append(keyword)
-        return found_keywords
-
-    @staticmethod
-    def _calculate_total_experience(work_experience: list[dict]) -> float:
-        """Calculate total years of experience"""
-        total_months = 0
-        for job in work_experience:
-            start_date = job.get('startDate', '')
-            end_date = job.get('endDate', '') if not job.get('currentlyWorking', False) else datetime.now().strftime('%Y-%m')
-
-            if start_date and end_date:
-                try:
-                    start = datetime.strptime(start_date, '%Y-%m')
-                    end = datetime.strptime(end_date, '%Y-%m')
-                    months = (end.year - start.year) * 12 + (end.month - start.month)
-                    total_months += months
-                except:
-                    # Fallback: assume 2 years per job if date parsing fails
-                    total_months += 24
-
-        return round(total_months / 12, 1)
+        return list(get_job_analysis(job_description).industry_keywords)
 
     @staticmethod
-    def _determine_education_level(education: list[dict]) -> str:
+    def _determine_education_level(education: list[EducationItem]) -> str:
         """Determine the highest education level"""
         if not education:
             return 'none'
 
-        degrees = [edu.get('degree', '').lower() for edu in education]
+        degrees = [edu.degree.lower() for edu in education]
 
         if any('phd' in degree or 'doctorate' in degree for degree in degrees):
             return 'doctorate'
@@ -186,36 +156,53 @@ class ContentReorderer(BaseTool):
 
     def _run(self, payload: dict[str, Any], job_requirements: dict[str, Any]) -> dict[str, Any]:
         """Reorder content arrays based on relevance"""
+        try:
+            profile = CVProfile.from_form_data(payload['formData'])
+        except Exception as e:
+            raise Exception(f"Content reordering failed: {str(e)}")
+
+        return self.reorder(payload, job_requirements, profile)
+
+    def reorder(self, payload: dict[str, Any], job_requirements: dict[str, Any],
+                profile: CVProfile) -> dict[str, Any]:
+        """Reorder content arrays using the typed records of a profile already parsed from payload"""
         try:
             optimized_payload = payload.copy()
             form_data = optimized_payload['formData']
 
+            # Score the typed records, then reorder the original entries
+            required_tech = [tech.lower() for tech in job_requirements.get('required_technologies', [])]
+
             # Reorder projects
             if 'projects' in form_data:
                 form_data['projects'] = self._reorder_projects(
                     form_data['projects'],
-                    job_requirements
+                    profile.projects,
+                    required_tech
                 )
 
             # Reorder skills
             if 'skills' in form_data:
                 form_data['skills'] = self._reorder_skills(
                     form_data['skills'],
-                    job_requirements
+                    profile.skills,
+                    required_tech
                 )
 
             # Reorder certifications
             if 'certifications' in form_data:
                 form_data['certifications'] = self._reorder_certifications(
                     form_data['certifications'],
-                    job_requirements
+                    profile.certifications,
+                    required_tech
                 )
 
             # Reorder achievements
             if 'achievements' in form_data:
                 form_data['achievements'] = self._reorder_achievements(
                     form_data['achievements'],
-                    job_requirements
+                    profile.achievements,
+                    required_tech
                 )
 
             return optimized_payload
@@ -224,118 +211,116 @@ class ContentReorderer(BaseTool):
             raise Exception(f"Content reordering failed: {str(e)}")
 
     @staticmethod
-    def _reorder_projects(projects: list[dict], job_req: dict) -> list[dict]:
+    def _reorder_by_score(items: list[dict], scores: list[int]) -> list[dict]:
+        """Return items ordered by descending score, keeping ties in their original order"""
+        order = sorted(range(len(items)), key=scores.__getitem__, reverse=True)
+        return [items[i] for i in order]
+
+    @staticmethod
+    def _reorder_projects(projects: list[dict], records: list[ProjectItem], required_tech: list[str]) -> list[dict]:
         """Reorder projects based on relevance to job requirements"""
-        def project_relevance_score(project):
+        required = set(required_tech)
+
+        def project_relevance_score(project: ProjectItem) -> int:
             score = 0
-            project_skills = project.get('skills', [])
-            required_tech = job_req.get('required_technologies', [])
 
             # Technology match
-            for skill in project_skills:
-                if skill.lower() in [tech.lower() for tech in required_tech]:
+            for skill in project.skills:
+                if skill.lower() in required:
                     score += 10
 
             # Recent projects get higher scores
-            if project.get('currentlyWorking', False):
+            if project.currently_working:
                 score += 5
 
             # Projects with links/demos get bonus
-            if project.get('link', ''):
+            if project.link:
                 score += 3
 
             return score
 
-        return sorted(projects, key=project_relevance_score, reverse=True)
+        return ContentReorderer._reorder_by_score(projects, [project_relevance_score(p) for p in records])
 
     @staticmethod
-    def _reorder_skills(skills: list[dict], job_req: dict) -> list[dict]:
+    def _reorder_skills(skills: list[dict], records: list[SkillItem], required_tech: list[str]) -> list[dict]:
         """Reorder skills based on job requirements"""
-        def skill_category_relevance(skill_cat):
+        required = set(required_tech)
+
+        def skill_category_relevance(skill_cat: SkillItem) -> int:
             score = 0
-            technologies = skill_cat.get('technologies', [])
-            required_tech = job_req.get('required_technologies', [])
 
             # Count matching technologies
-            for tech in technologies:
-                if tech.lower() in [req_tech.lower() for req_tech in required_tech]:
+            for tech in skill_cat.technologies:
+                if tech.lower() in required:
                     score += 10
 
             # Prioritize programming languages and frameworks
-            category = skill_cat.get('category', '').lower()
+            category = skill_cat.category.lower()
             if any(keyword in category for keyword in ['programming', 'framework', 'language']):
                 score += 5
 
             return score
 
-        return sorted(skills, key=skill_category_relevance, reverse=True)
+        return ContentReorderer._reorder_by_score(skills, [skill_category_relevance(s) for s in records])
 
     @staticmethod
-    def _reorder_certifications(certifications: list[dict], job_req: dict) -> list[dict]:
+    def _reorder_certifications(certifications: list[dict], records: list[CertificationItem],
+                                required_tech: list[str]) -> list[dict]:
         """Reorder certifications based on relevance and recency"""
-        def certification_relevance(cert):
+        current_year = month_year(current_month())
+
+        def certification_relevance(cert: CertificationItem) -> int:
             score = 0
-            title = cert.get('title', '').lower()
-            required_tech = job_req.get('required_technologies', [])
+            title = cert.title.lower()
 
             # Check if certification matches required technologies
             for tech in required_tech:
-                if tech.lower() in title:
+                if tech in title:
                     score += 15
 
             # Recent certifications get higher scores
-            cert_date = cert.get('date', '')
-            if cert_date:
-                try:
-                    cert_year = int(cert_date.split('-')[0])
-                    current_year = datetime.now().year
-                    if current_year - cert_year <= 2:
-                        score += 10
-                    elif current_year - cert_year <= 5:
-                        score += 5
-                except:
-                    pass
+            if cert.issued is not None:
+                age = current_year - month_year(cert.issued)
+                if age <= 2:
+                    score += 10
+                elif age <= 5:
+                    score += 5
 
             # Certifications with links get a bonus
-            if cert.get('link', ''):
+            if cert.link:
                 score += 3
 
             return score
 
-        return sorted(certifications, key=certification_relevance, reverse=True)
+        return ContentReorderer._reorder_by_score(certifications, [certification_relevance(c) for c in records])
 
     @staticmethod
-    def _reorder_achievements(achievements: list[dict], job_req: dict) -> list[dict]:
+    def _reorder_achievements(achievements: list[dict], records: list[AchievementItem],
+                              required_tech: list[str]) -> list[dict]:
         """Reorder achievements based on relevance and impact"""
-        def achievement_relevance(achievement):
+        current_year = month_year(current_month())
+
+        def achievement_relevance(achievement: AchievementItem) -> int:
             score = 0
-            description = achievement.get('description', '').lower()
-            title = achievement.get('title', '').lower()
-            required_tech = job_req.get('required_technologies', [])
+            description = achievement.description.lower()
+            title = achievement.title.lower()
 
             # Check for technology mentions
             for tech in required_tech:
-                if tech.lower() in description or tech.lower() in title:
+                if tech in description or tech in title:
                     score += 10
 
             # Look for quantifiable results
-            if re.search(r'\d+%|\$\d+|\d+x|increase|improve|reduce|save', description):
+            if _QUANTIFIABLE_RESULT_PATTERN.search(description):
                 score += 8
 
             # Recent achievements get higher scores
-            ach_date = achievement.get('date', '')
-            if ach_date:
-                try:
-                    ach_year = int(ach_date.split('-')[0])
-                    current_year = datetime.now().year
-                    if current_year - ach_year <= 2:
-                        score += 5
-                except:
-                    pass
+            if achievement.achieved is not None and current_year - month_year(achievement.achieved) <= 2:
+                score += 5
 
             return score
 
-        return sorted(achievements, key=achievement_relevance, reverse=True)
+        return ContentReorderer._reorder_by_score(achievements, [achievement_relevance(a) for a in records])
 
 
 class DateSorter(BaseTool):
@@ -347,93 +332,58 @@ class DateSorter(BaseTool):
     def _run(self, payload: dict[str, Any]) -> dict[str, Any]:
         """Sort chronological data"""
         try:
-            sorted_payload = payload.copy()
-            form_data = sorted_payload['formData']
-
-            # Sort work experience
-            if 'workExperience' in form_data:
-                form_data['workExperience'] = self._sort_work_experience(
-                    form_data['workExperience']
-                )
+            profile = CVProfile.from_form_data(payload['formData'])
+        except Exception as e:
+            raise Exception(f"Date sorting failed: {str(e)}")
 
-            # Sort education
-            if 'education' in form_data:
-                form_data['education'] = self._sort_education(
-                    form_data['education']
-                )
+        return self.sort(payload, profile)
 
+    def sort(self, payload: dict[str, Any], profile: CVProfile) -> dict[str, Any]:
+        """Sort chronological data using a profile already parsed from payload"""
+        try:
+            form_data = payload['formData']
+            orders = self.chronological_order(form_data, profile)
+
+            # Build new section lists from the permutations; the caller's payload, lists
+            # and item dicts are never modified, so shared payloads can be sorted concurrently
+            sorted_form_data = dict(form_data)
+            for key, order in orders.items():
+                items = form_data[key]
+                sorted_form_data[key] = [items[i] for i in order]
+
+            sorted_payload = dict(payload)
+            sorted_payload['formData'] = sorted_form_data
             return sorted_payload
 
         except Exception as e:
             raise Exception(f"Date sorting failed: {str(e)}")
 
     @staticmethod
-    def _sort_work_experience(work_exp: list[dict]) -> list[dict]:
-        """Sort work experience in reverse chronological order"""
-        def work_sort_key(job):
-            # Currently working jobs go first
-            if job.get('currentlyWorking', False):
-                return (1, datetime.now())
-
-            # Parse end date
-            end_date = job.get('endDate', '')
-            if end_date:
-                try:
-                    return (0, datetime.strptime(end_date, '%Y-%m'))
-                except:
-                    try:
-                        return (0, datetime.strptime(end_date, '%Y'))
-                    except:
-                        return (0, datetime.min)
-
-            # Fallback to start date
-            start_date = job.get('startDate', '')
-            if start_date:
-                try:
-                    return (0, datetime.strptime(start_date, '%Y-%m'))
-                except:
-                    try:
-                        return (0, datetime.strptime(start_date, '%Y'))
-                    except:
-                        return (0, datetime.min)
-
-            return (0, datetime.min)
-
-        return sorted(work_exp, key=work_sort_key, reverse=True)
+    def chronological_order(form_data: Any, profile: CVProfile) -> dict[str, list[int]]:
+        """Return the reverse chronological index permutation of each dated section present in form data"""
+        # Sort keys come from the dates already parsed into the profile's typed records
+        read = form_data.get if isinstance(form_data, dict) else lambda key: getattr(form_data, key, None)
+
+        orders = {}
+        if read('workExperience') is not None:
+            orders['workExperience'] = DateSorter._order_work_experience(profile.work_experience)
+        if read('education') is not None:
+            orders['education'] = DateSorter._order_education(profile.education)
+        return orders
 
     @staticmethod
-    def _sort_education(education: list[dict]) -> list[dict]:
-        """Sort education in reverse chronological order"""
-        def education_sort_key(edu):
-            # Currently studying goes first
-            if edu.get('currentlyStudying', False):
-                return (1, datetime.now())
-
-            # Parse end date
-            end_date = edu.get('endDate', '')
-            if end_date:
-                try:
-                    return (0, datetime.strptime(end_date, '%Y-%m'))
-                except:
-                    try:
-                        return (0, datetime.strptime(end_date, '%Y'))
-                    except:
-                        return (0, datetime.min)
-
-            # Fallback to start date
-            start_date = edu.get('startDate', '')
-            if start_date:
-                try:
-                    return (0, datetime.strptime(start_date, '%Y-%m'))
-                except:
-                    try:
-                        return (0, datetime.strptime(start_date, '%Y'))
-                    except:
-                        return (0, datetime.min)
-
-            return (0, datetime.min)
-
-        return sorted(education, key=education_sort_key, reverse=True)
+    def _order_work_experience(records: list[WorkItem]) -> list[int]:
+        """Order work experience most recent first"""
+        return reverse_chronological_order([
+            chronology_key(job.currently_working, job.end, job.start) for job in records
+        ])
+
+    @staticmethod
+    def _order_education(records: list[EducationItem]) -> list[int]:
+        """Order education most recent first"""
+        return reverse_chronological_order([
+            chronology_key(edu.currently_studying, edu.end, edu.start) for edu in records
+        ])
 
 
 class CVGenerator(BaseTool):
@@ -476,18 +426,38 @@ class ATSScorer(BaseTool):
     description: str = "Calculates ATS scores for generated CVs"
 
     def _run(self, cv_path: str, job_description: str) -> dict[str, Any]:
-        """Calculate ATS score for the CV"""
+        """Calculate ATS score for the compiled CV PDF (used as a fidelity check)"""
         try:
             # Extract text from PDF
             cv_text = self._extract_pdf_text(cv_path)
+        except Exception as e:
+            raise Exception(f"ATS scoring failed: {str(e)}")
+
+        return self.score_text(cv_text, job_description)
+
+    def score_structured(self, overview: str, form_data: Any, job_description: str) -> dict[str, Any]:
+        """Calculate ATS score straight from the form data and overview, skipping the PDF round-trip"""
+        try:
+            cv_text = form_data_to_text(overview, form_data)
+        except Exception as e:
+            raise Exception(f"ATS scoring failed: {str(e)}")
+
+        return self.score_text(cv_text, job_description)
+
+    def score_text(self, cv_text: str, job_description: str) -> dict[str, Any]:
+        """Calculate ATS score for the CV text"""
+        try:
+            # Scan each text once; every score and recommendation reads from these
+            features = extract_features(cv_text)
+            job_keywords = get_job_analysis(job_description).ats_keywords
 
             # Calculate various scoring metrics
-            keyword_score = self._calculate_keyword_score(cv_text, job_description)
-            format_score = self._calculate_format_score(cv_text)
-            content_score = self._calculate_content_score(cv_text)
+            keyword_score = self._calculate_keyword_score(features, job_keywords)
+            format_score = self._calculate_format_score(features)
+            content_score = self._calculate_content_score(features)
 
             # Calculate overall ATS score
-            overall_score = (keyword_score * 0.5 + format_score * 0.3 + content_score * 0.2)
+            overall_score = calculate_overall_score(keyword_score, format_score, content_score)
 
             return {
                 "overall_score": round(overall_score, 2),
@@ -495,15 +465,19 @@ class ATSScorer(BaseTool):
                 "format_score": round(format_score, 2),
                 "content_score": round(content_score, 2),
                 "feedback": self._generate_feedback(overall_score, keyword_score, format_score, content_score),
-                "recommendations": self._generate_recommendations(overall_score, cv_text, job_description)
+                "recommendations": self._generate_recommendations(overall_score, features, job_keywords),
+                "features": features.as_dict()
             }
 
         except Exception as e:
             raise Exception(f"ATS scoring failed: {str(e)}")
 
     @staticmethod
+    @timed_stage("pdf_extract")
     def _extract_pdf_text(pdf_path: str) -> str:
         """Extract text from a PDF file"""
+        import PyPDF2
+
         try:
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
@@ -514,87 +488,25 @@ class ATSScorer(BaseTool):
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
-    def _calculate_keyword_score(self, cv_text: str, job_description: str) -> float:
+    @staticmethod
+    def _calculate_keyword_score(features: CVFeatures, job_keywords: Sequence[str]) -> float:
         """Calculate the keyword matching score"""
-        # Extract keywords from job description
-        job_keywords = self._extract_keywords(job_description)
-        cv_keywords = self._extract_keywords(cv_text)
-
-        if not job_keywords:
-            return 50.0  # Default score if no keywords found
-
-        # Calculate match percentage
-        matched_keywords = set(job_keywords).intersection(set(cv_keywords))
-        match_percentage = len(matched_keywords) / len(job_keywords) * 100
-
-        return min(match_percentage, 100.0)
+        return calculate_keyword_score(features, job_keywords)
 
     @staticmethod
-    def _calculate_format_score(cv_text: str) -> float:
+    def _calculate_format_score(features: CVFeatures) -> float:
         """Calculate format and structure score"""
-        score = 0
-
-        # Check for common sections
-        sections = ['experience', 'education', 'skills', 'projects']
-        for section in sections:
-            if section.lower() in cv_text.lower():
-                score += 15
-
-        # Check for contact information
-        if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', cv_text):
-            score += 10
-
-        # Check for phone number
-        if re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', cv_text):
-            score += 10
-
-        # Check for dates
-        if re.search(r'\b\d{4}\b', cv_text):
-            score += 10
-
-        return min(score, 100.0)
+        return calculate_format_score(features)
 
     @staticmethod
-    def _calculate_content_score(cv_text: str) -> float:
+    def _calculate_content_score(features: CVFeatures) -> float:
         """Calculate content quality score"""
-        score = 0
-
-        # Check for quantifiable achievements
-        if re.search(r'\d+%|\$\d+|\d+x|increase|improve|reduce|save', cv_text.lower()):
-            score += 30
-
-        # Check for action verbs
-        action_verbs = ['developed', 'implemented', 'designed', 'created', 'managed', 'led', 'improved']
-        for verb in action_verbs:
-            if verb.lower() in cv_text.lower():
-                score += 5
-
-        # Check for adequate length
-        word_count = len(cv_text.split())
-        if word_count > 200:
-            score += 20
-
-        return min(score, 100.0)
+        return calculate_content_score(features)
 
     @staticmethod
     def _extract_keywords(text: str) -> list[str]:
         """Extract relevant keywords from text"""
-        # Common technical keywords
-        tech_keywords = [
-            'python', 'java', 'javascript', 'react', 'nodejs', 'aws', 'docker',
-            'kubernetes', 'sql', 'mongodb', 'postgresql', 'git', 'jenkins',
-            'terraform', 'ansible', 'linux', 'windows', 'azure', 'gcp',
-            'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api'
-        ]
-
-        found_keywords = []
-        text_lower = text.lower()
-
-        for keyword in tech_keywords:
-            if keyword in text_lower:
-                found_keywords.append(keyword)
-
-        return found_keywords
+        return extract_keywords(text)
 
     @staticmethod
     def _generate_feedback(overall: float, keyword: float, format_score: float, content: float) -> str:
@@ -606,28 +518,27 @@ class ATSScorer(BaseTool):
         else:
             return "CV needs significant improvements to pass ATS screening."
 
-    def _generate_recommendations(self, score: float, cv_text: str, job_desc: str) -> list[str]:
+    @staticmethod
+    def _generate_recommendations(score: float, features: CVFeatures, job_keywords: list[str]) -> list[str]:
         """Generate specific recommendations for improvement"""
         recommendations = []
 
         if score < 85:
             # Keyword recommendations
-            job_keywords = self._extract_keywords(job_desc)
-            cv_keywords = self._extract_keywords(cv_text)
-            missing_keywords = set(job_keywords) - set(cv_keywords)
+            missing_keywords = [keyword for keyword in job_keywords if keyword not in features.keywords]
 
             if missing_keywords:
-                recommendations.append(f"Add these keywords: {', '.join(list(missing_keywords)[:5])}")
+                recommendations.append(f"Add these keywords: {', '.join(missing_keywords[:5])}")
 
             # Content recommendations
-            if not re.search(r'\d+%|\$\d+|\d+x', cv_text):
+            if not features.has_metrics:
                 recommendations.append("Add quantifiable achievements with numbers and percentages")
 
             # Format recommendations
-            if 'skills' not in cv_text.lower():
+            if 'skills' not in features.sections:
                 recommendations.append("Add a dedicated skills section")
 
-            if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', cv_text):
+            if not features.has_email:
                 recommendations.append("Ensure contact information is clearly visible")
 
         return recommendations
@@ -643,6 +554,8 @@ class S3Uploader(BaseTool):
     @staticmethod
     def _run(file_path: str, bucket_name: str) -> str:
         """Upload the file to S3 and return URL"""
+        import boto3
+
         try:
             # Initialize S3 client
             s3_client = boto3.client(
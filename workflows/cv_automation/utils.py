@@ -4,191 +4,31 @@ Helper functions and validators for the CV automation workflow
 """
 
 import json
+import logging
 import os
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, Optional
 from datetime import datetime
-import re
 
-from models.user import UserQuery, FormData
+from models.user import UserQuery
+from models.validation import validate_user_query
+from core.metrics import ATS_SCORE, WORKFLOW_ITERATIONS
+
+logger = logging.getLogger(__name__)
 
 
 class PayloadValidator:
     """Validates payload structure and content"""
 
     def validate(self, payload: UserQuery) -> bool:
-        """Validate payload structure and content"""
-        try:
-            # Check top-level structure
-            if not isinstance(payload, UserQuery):
-                raise ValueError("Payload must be a UserQuery object")
-
-            # Check required fields
-            required_fields = ['jobDescription', 'formData']
-            for field in required_fields:
-                if not hasattr(payload, field):
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate job description
-            if not isinstance(payload.jobDescription, str) or not payload.jobDescription.strip():
-                raise ValueError("jobDescription must be a non-empty string")
-
-            # Validate form data structure
-            self._validate_form_data(payload.formData)
-
-            return True
-
-        except Exception as e:
-            raise ValueError(f"Payload validation failed: {str(e)}")
-
-    def _validate_form_data(self, form_data: FormData) -> bool:
-        """Validate form data structure"""
-        if not isinstance(form_data, FormData):
-            raise ValueError("formData must be a FormData object")
-
-        # Validate personal details
-        if hasattr(form_data, 'personalDetails'):
-            self._validate_personal_details(form_data.personalDetails)
-
-        # Validate arrays
-        array_fields = ['workExperience', 'education', 'projects', 'skills', 'achievements', 'certifications',
-                        'referees']
-        for field in array_fields:
-            if hasattr(form_data, field):
-                if not isinstance(getattr(form_data, field), list):
-                    raise ValueError(f"{field} must be a list")
-
-                # Validate array items based on type
-                if field == 'workExperience':
-                    self._validate_work_experience(form_data.workExperience)
-                elif field == 'education':
-                    self._validate_education(form_data.education)
-                elif field == 'projects':
-                    self._validate_projects(form_data.projects)
-                elif field == 'skills':
-                    self._validate_skills(form_data.skills)
-                elif field == 'achievements':
-                    self._validate_achievements(form_data.achievements)
-                elif field == 'certifications':
-                    self._validate_certifications(form_data.certifications)
-                elif field == 'referees':
-                    self._validate_referees(form_data.referees)
-
-        return True
-
-    @staticmethod
-    def _validate_personal_details(personal_details: Dict[str, Any]) -> bool:
-        """Validate personal details structure"""
-        if not isinstance(personal_details, dict):
-            raise ValueError("personalDetails must be a dictionary")
-
-        # Check for essential fields
-        essential_fields = ['fullName', 'email']
-        for field in essential_fields:
-            if field not in personal_details or not personal_details[field]:
-                raise ValueError(f"Missing essential personal detail: {field}")
-
-        # Validate email format
-        email = personal_details.get('email', '')
-        if email and not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-            raise ValueError("Invalid email format")
-
-        return True
-
-    @staticmethod
-    def _validate_work_experience(work_exp: List[Dict]) -> bool:
-        """Validate work experience entries"""
-        for job in work_exp:
-            if not isinstance(job, dict):
-                raise ValueError("Work experience entry must be a dictionary")
-
-            required_fields = ['jobTitle', 'company']
-            for field in required_fields:
-                if field not in job or not job[field]:
-                    raise ValueError(f"Missing required work experience field: {field}")
-
-        return True
-
-    @staticmethod
-    def _validate_education(education: List[Dict]) -> bool:
-        """Validate education entries"""
-        for edu in education:
-            if not isinstance(edu, dict):
-                raise ValueError("Education entry must be a dictionary")
-
-            required_fields = ['degree', 'institution']
-            for field in required_fields:
-                if field not in edu or not edu[field]:
-                    raise ValueError(f"Missing required education field: {field}")
-
-        return True
+        """Validate payload structure and content against the compiled request schema"""
+        if not isinstance(payload, UserQuery):
+            raise ValueError("Payload validation failed: Payload must be a UserQuery object")
 
-    @staticmethod
-    def _validate_projects(projects: List[Dict]) -> bool:
-        """Validate project entries"""
-        for project in projects:
-            if not isinstance(project, dict):
-                raise ValueError("Project entry must be a dictionary")
-
-            if 'name' not in project or not project['name']:
-                raise ValueError("Project must have a name")
-
-            if 'skills' in project and not isinstance(project['skills'], list):
-                raise ValueError("Project skills must be a list")
-
-        return True
-
-    @staticmethod
-    def _validate_skills(skills: List[Dict]) -> bool:
-        """Validate skills entries"""
-        for skill in skills:
-            if not isinstance(skill, dict):
-                raise ValueError("Skill entry must be a dictionary")
-
-            if 'category' not in skill or not skill['category']:
-                raise ValueError("Skill must have a category")
-
-            if 'technologies' in skill and not isinstance(skill['technologies'], list):
-                raise ValueError("Skill technologies must be a list")
-
-        return True
-
-    @staticmethod
-    def _validate_achievements(achievements: List[Dict]) -> bool:
-        """Validate achievement entries"""
-        for achievement in achievements:
-            if not isinstance(achievement, dict):
-                raise ValueError("Achievement entry must be a dictionary")
-
-            if 'title' not in achievement or not achievement['title']:
-                raise ValueError("Achievement must have a title")
-
-        return True
-
-    @staticmethod
-    def _validate_certifications(certifications: List[Dict]) -> bool:
-        """Validate certification entries"""
-        for cert in certifications:
-            if not isinstance(cert, dict):
-                raise ValueError("Certification entry must be a dictionary")
-
-            required_fields = ['title', 'issuer']
-            for field in required_fields:
-                if field not in cert or not cert[field]:
-                    raise ValueError(f"Missing required certification field: {field}")
-
-        return True
-
-    @staticmethod
-    def _validate_referees(referees: List[Dict]) -> bool:
-        """Validate referee entries"""
-        for referee in referees:
-            if not isinstance(referee, dict):
-                raise ValueError("Referee entry must be a dictionary")
-
-            required_fields = ['name', 'position']
-            for field in required_fields:
-                if field not in referee or not referee[field]:
-                    raise ValueError(f"Missing required referee field: {field}")
+        errors = validate_user_query(payload)
+        if errors:
+            details = "; ".join(f"{error['loc']}: {error['msg']}" for error in errors)
+            raise ValueError(f"Payload validation failed: {details}")
 
         return True
 
@@ -253,11 +93,11 @@ class FileManager:
 
                     if age_hours > max_age_hours:
                         os.remove(file_path)
-                        print(f"Removed old file: {filename}")
+                        logger.info(f"Removed old file: {filename}")
 
             return True
         except Exception as e:
-            print(f"Warning: Failed to clean old files: {str(e)}")
+            logger.warning(f"Failed to clean old files: {str(e)}")
             return False
 
     @staticmethod
@@ -276,16 +116,16 @@ class FileManager:
 
             return file_path
         except Exception as e:
-            print(f"Warning: Failed to save payload backup: {str(e)}")
+            logger.warning(f"Failed to save payload backup: {str(e)}")
             return ""
 
 
 class LogManager:
-    """Manages logging for the workflow"""
+    """Workflow logger that also keeps the most recent entries for save_logs"""
 
-    def __init__(self, workflow_id: str):
+    def __init__(self, workflow_id: str, max_entries: int = 500):
         self.workflow_id = workflow_id
-        self.logs = []
+        self.logs: deque[Dict[str, Any]] = deque(maxlen=max_entries)
 
     def log(self, level: str, message: str, extra_data: Optional[Dict] = None):
         """Add log entry"""
@@ -299,9 +139,9 @@ class LogManager:
 
         self.logs.append(log_entry)
 
-        # Print to console
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] [{level}] {message}")
+        # Written by the background log writer, not on this thread
+        logger.log(logging.getLevelName(level), message,
+                   extra={'workflow_id': self.workflow_id, 'extra_data': extra_data or {}})
 
     def info(self, message: str, extra_data: Optional[Dict] = None):
         """Log info message"""
@@ -326,11 +166,11 @@ class LogManager:
             file_path = os.path.join(log_dir, filename)
 
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.logs, f, indent=2, ensure_ascii=False)
+                json.dump(list(self.logs), f, indent=2, ensure_ascii=False)
 
             return file_path
         except Exception as e:
-            print(f"Warning: Failed to save logs: {str(e)}")
+            logger.warning(f"Failed to save logs: {str(e)}")
             return ""
 
 
@@ -355,12 +195,16 @@ class MetricsCollector:
         self.metrics['start_time'] = datetime.now()
 
     def end_workflow(self):
-        """Mark workflow end and calculate duration"""
+        """Mark workflow end, calculate duration and publish the run's results to /metrics"""
         self.metrics['end_time'] = datetime.now()
         if self.metrics['start_time']:
             duration = self.metrics['end_time'] - self.metrics['start_time']
             self.metrics['total_duration'] = duration.total_seconds()
 
+        if self.metrics['iterations_used']:
+            WORKFLOW_ITERATIONS.observe(self.metrics['iterations_used'])
+            ATS_SCORE.observe(self.metrics['final_ats_score'])
+
     def record_iteration(self, iteration: int, ats_score: float):
         """Record iteration metrics"""
         self.metrics['iterations_used'] = iteration